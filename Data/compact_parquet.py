@@ -0,0 +1,410 @@
+"""
+Data/compact_parquet.py
+
+Rewrite downloaded day files into a read-friendly encoding.
+
+Incremental downloads merge new symbols into a day's parquet by concatenation, so after a few rounds a file has
+unsorted symbols, row groups of whatever size each merge produced and the writer's default (snappy) compression.
+Compaction rewrites each file of a day with:
+- rows sorted by (symbol, timestamp), stable, so same-timestamp events keep their order; the timestamp is `ts_recv`
+  when present (the order Databento delivers records in), else `ts_event` / `ts`
+- zstd compression (tunable level) and dictionary-encoded `symbol` pages
+- row groups sized from the table's bytes per row (--row-group-mb), min/max statistics and a page index, so
+  symbol-filtered reads skip most of the file
+- an optional bloom filter on `symbol`
+
+Files are rewritten a group of whole symbols at a time (about --sort-mb of rows, or one larger symbol alone): each
+group is read out of the inputs one row group at a time (skipping row groups whose `symbol` statistics exclude it),
+sorted and written as the next row groups, so memory is bounded by the group rather than the day file.
+
+Each file is written to `<name>.tmp`, checked (rows and schema) and renamed over the original. Hive layouts
+(`schema=…/day=…/symbol=…/part-*.parquet`, see download_day_databento.py --layout hive) are compacted per symbol
+directory: its parts become a single part-00000.parquet (renamed into place before the other parts are removed).
+
+The settings used are stored in the file's key-value metadata; files already compacted with the same settings are
+skipped unless --force. Prints before/after size and read time (full read, and one symbol through row-group
+statistics) per file.
+
+Examples:
+  python Data/compact_parquet.py --data-dir databento_out --day 2026-01-05
+  python Data/compact_parquet.py --data-dir databento_out --all --bloom-symbol
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data_manifest import load_manifest, update_manifest  # Data/data_manifest.py (sibling script)
+
+
+DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+META_KEY = b"compact"
+TS_COLUMNS = ("ts_recv", "ts_event", "ts")  # Databento record order first (trades' ts_event is not monotonic)
+
+
+@dataclass(frozen=True)
+class CompactOptions:
+    zstd_level: int = 9
+    row_group_mb: int = 64  # uncompressed (Arrow) bytes per row group
+    sort_mb: int = 512  # uncompressed (Arrow) bytes read and sorted at once
+    bloom_symbol: bool = False
+    bloom_fpp: float = 0.01
+
+
+@dataclass(frozen=True)
+class CompactResult:
+    path: str
+    inputs: int
+    rows: int
+    row_groups_before: int
+    row_groups_after: int
+    bytes_before: int
+    bytes_after: int
+    read_s_before: float
+    read_s_after: float
+    symbol_read_s_before: float
+    symbol_read_s_after: float
+    skipped: bool = False
+
+
+def _day_files(data_dir: Path, day: str) -> List[Path]:
+    # Flat layout: EQUS.MINI.<DAY>.*.parquet / XNAS.ITCH.<DAY>.mbp-10.parquet
+    return sorted(p for p in data_dir.glob(f"*.{day}.*.parquet") if p.name.split(".")[2:3] == [day])
+
+
+def _hive_symbol_dirs(data_dir: Path, day: str) -> List[Path]:
+    return sorted(p for p in data_dir.glob(f"schema=*/day={day}/symbol=*") if any(p.glob("part-*.parquet")))
+
+
+def _discover_days(data_dir: Path) -> List[str]:
+    days = {p.name.split(".")[2] for p in data_dir.glob("*.*.*.parquet") if DAY_RE.match(p.name.split(".")[2])}
+    days.update(p.name[len("day="):] for p in data_dir.glob("schema=*/day=*") if DAY_RE.match(p.name[len("day="):]))
+    return sorted(days)
+
+
+def _settings(opts: CompactOptions) -> bytes:
+    return json.dumps(asdict(opts), sort_keys=True).encode()
+
+
+def _already_compacted(paths: Sequence[Path], opts: CompactOptions) -> bool:
+    if len(paths) != 1:
+        return False
+    meta = pq.ParquetFile(paths[0]).schema_arrow.metadata or {}
+    return meta.get(META_KEY) == _settings(opts)
+
+
+def _ts_column(names: Sequence[str]) -> Optional[str]:
+    return next((c for c in TS_COLUMNS if c in names), None)
+
+
+def _bench(paths: Sequence[Path], symbol: Optional[str], repeat: int) -> tuple[float, float]:
+    """
+    Best-of-`repeat` seconds for a full read of `paths` (row group by row group, so a day file need not fit in
+    memory) and for reading one symbol's rows (row-group pruned).
+    """
+    full = sym = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for p in paths:
+            pf = pq.ParquetFile(p)
+            for i in range(pf.num_row_groups):
+                pf.read_row_group(i)
+        full = min(full, time.perf_counter() - t0)
+        if symbol is not None:
+            t0 = time.perf_counter()
+            for p in paths:
+                pq.read_table(p, filters=[("symbol", "=", symbol)])
+            sym = min(sym, time.perf_counter() - t0)
+    return full, (sym if symbol is not None else 0.0)
+
+
+def _bytes_per_row(pfs: Sequence[pq.ParquetFile]) -> int:
+    # Arrow (in-memory) size of a sample batch, like table.nbytes / num_rows without reading the file.
+    for pf in pfs:
+        batch = next(pf.iter_batches(batch_size=1 << 16), None)
+        if batch is not None and batch.num_rows:
+            return max(1, batch.nbytes // batch.num_rows)
+    return 1
+
+
+def _row_group_rows(bytes_per_row: int, row_group_mb: int) -> int:
+    return max(10_000, (row_group_mb << 20) // bytes_per_row)
+
+
+def _symbol_counts(pfs: Sequence[pq.ParquetFile]) -> Dict[Optional[str], int]:
+    counts: Dict[Optional[str], int] = {}
+    for pf in pfs:
+        for batch in pf.iter_batches(batch_size=1 << 16, columns=["symbol"]):
+            for vc in pc.value_counts(batch.column(0).cast(pa.string())).to_pylist():
+                counts[vc["values"]] = counts.get(vc["values"], 0) + vc["counts"]
+    return counts
+
+
+def _symbol_groups(counts: Dict[Optional[str], int], rows_per_group: int) -> List[List[Optional[str]]]:
+    """
+    Symbols in sort order, packed into groups of about `rows_per_group` rows; rows without a symbol come last.
+    """
+    groups: List[List[Optional[str]]] = []
+    group: List[Optional[str]] = []
+    n = 0
+    for sym in sorted(s for s in counts if s is not None):
+        if group and n + counts[sym] > rows_per_group:
+            groups.append(group)
+            group, n = [], 0
+        group.append(sym)
+        n += counts[sym]
+    if group:
+        groups.append(group)
+    if None in counts:
+        groups.append([None])
+    return groups
+
+
+def _may_contain(pf: pq.ParquetFile, i: int, symbols: List[Optional[str]]) -> bool:
+    """
+    False when row group `i`'s `symbol` statistics rule out every symbol of the (sorted, contiguous) group.
+    """
+    md = pf.metadata.row_group(i)
+    col = next((md.column(j) for j in range(md.num_columns) if md.column(j).path_in_schema == "symbol"), None)
+    st = col.statistics if col is not None else None
+    if st is None or not st.has_min_max:
+        return True
+    names = [s for s in symbols if s is not None]
+    if None in symbols and st.null_count != 0:
+        return True
+    return bool(names) and not (str(st.max) < names[0] or str(st.min) > names[-1])
+
+
+def _read_group(pfs: Sequence[pq.ParquetFile], symbols: Optional[List[Optional[str]]]) -> pa.Table:
+    """
+    Rows of `symbols` (all rows when None) from every input, in file order, read one row group at a time
+    (row groups whose statistics exclude the group are skipped). Every input contributes its (empty) schema
+    first, so the result's schema is the same for every group.
+    """
+    value_set = pa.array([s for s in symbols or [] if s is not None], pa.string())
+    pieces: List[pa.Table] = []
+    for pf in pfs:
+        pieces.append(pf.schema_arrow.empty_table())
+        for i in range(pf.num_row_groups):
+            if symbols is not None and not _may_contain(pf, i, symbols):
+                continue
+            tbl = pf.read_row_group(i)
+            if symbols is not None:
+                sym = tbl["symbol"].cast(pa.string())
+                keep = pc.is_in(sym, value_set=value_set)
+                if None in symbols:
+                    keep = pc.or_(keep, pc.is_null(sym))
+                tbl = tbl.filter(keep)
+            if tbl.num_rows:
+                pieces.append(tbl)
+    return pa.concat_tables(pieces, promote_options="default")
+
+
+def _write_compacted(pfs: Sequence[pq.ParquetFile], out: Path, opts: CompactOptions) -> tuple[int, pa.Schema]:
+    """
+    Write the inputs' rows to `out` sorted by (symbol, timestamp), one symbol group at a time.
+    Returns (rows written, schema without metadata) for the caller's check.
+    """
+    schema = pa.concat_tables([pf.schema_arrow.empty_table() for pf in pfs], promote_options="default").schema
+    names = schema.names
+    ts_col = _ts_column(names)
+    sort_keys = [(c, "ascending") for c in ("symbol", ts_col) if c is not None and c in names]
+    bytes_per_row = _bytes_per_row(pfs)
+    rg_rows = _row_group_rows(bytes_per_row, opts.row_group_mb)
+    counts: Dict[Optional[str], int] = {}
+    groups: List[Optional[List[Optional[str]]]] = [None]
+    if "symbol" in names:
+        counts = _symbol_counts(pfs)
+        groups = list(_symbol_groups(counts, max(1, (opts.sort_mb << 20) // bytes_per_row)))
+    out_schema = schema.with_metadata({**(schema.metadata or {}), META_KEY: _settings(opts)})
+
+    kw = {}
+    if opts.bloom_symbol and "symbol" in names:
+        ndv = max(1, len([s for s in counts if s is not None]))
+        kw["bloom_filter_options"] = {"symbol": {"ndv": ndv, "fpp": opts.bloom_fpp}}
+    if sort_keys:
+        kw["sorting_columns"] = pq.SortingColumn.from_ordering(out_schema, sort_keys)
+    written = 0
+    with pq.ParquetWriter(
+        out,
+        out_schema,
+        compression="zstd",
+        compression_level=opts.zstd_level,
+        use_dictionary=[c for c in ("symbol",) if c in names],
+        write_statistics=True,
+        write_page_index=True,
+        **kw,
+    ) as w:
+        for symbols in groups:
+            table = _read_group(pfs, symbols)
+            if sort_keys:
+                table = table.take(pc.sort_indices(table, sort_keys=sort_keys))  # stable
+            if table.num_rows:
+                w.write_table(table.replace_schema_metadata(out_schema.metadata), row_group_size=rg_rows)
+            written += table.num_rows
+    return written, schema.remove_metadata()
+
+
+def compact_files(
+    inputs: Sequence[Path], out: Path, opts: CompactOptions, *, force: bool = False, bench_repeat: int = 3
+) -> CompactResult:
+    """
+    Compact `inputs` (one flat file, or a hive symbol directory's parts) into `out`; `inputs` other than `out`
+    are removed afterwards. The new file replaces `out` only once it has been written and checked.
+    """
+    inputs = list(inputs)
+    pfs = [pq.ParquetFile(p) for p in inputs]
+    rows = sum(pf.metadata.num_rows for pf in pfs)
+    rg_before = sum(pf.metadata.num_row_groups for pf in pfs)
+    bytes_before = sum(p.stat().st_size for p in inputs)
+    symbol = None  # benchmark symbol: the first one in the file
+    if "symbol" in pfs[0].schema_arrow.names:
+        head = next(pfs[0].iter_batches(batch_size=1, columns=["symbol"]), None)
+        symbol = head.column(0)[0].as_py() if head is not None and head.num_rows else None
+
+    if not force and _already_compacted(inputs, opts) and inputs[0] == out:
+        return CompactResult(
+            str(out), 1, rows, rg_before, rg_before, bytes_before, bytes_before, 0.0, 0.0, 0.0, 0.0, skipped=True
+        )
+
+    read_before, sym_before = _bench(inputs, symbol, bench_repeat)
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        written, schema = _write_compacted(pfs, tmp, opts)
+        got = pq.ParquetFile(tmp)
+        if written != rows or got.metadata.num_rows != rows or got.schema_arrow.remove_metadata() != schema:
+            raise RuntimeError(f"Compacted file does not match its inputs: {tmp}")
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    # Replace first: a crash before the cleanup leaves extra parts behind, never missing rows.
+    tmp.replace(out)
+    for p in inputs:
+        if p != out:
+            p.unlink()
+
+    read_after, sym_after = _bench([out], symbol, bench_repeat)
+    return CompactResult(
+        path=str(out),
+        inputs=len(inputs),
+        rows=rows,
+        row_groups_before=rg_before,
+        row_groups_after=pq.ParquetFile(out).metadata.num_row_groups,
+        bytes_before=bytes_before,
+        bytes_after=out.stat().st_size,
+        read_s_before=read_before,
+        read_s_after=read_after,
+        symbol_read_s_before=sym_before,
+        symbol_read_s_after=sym_after,
+    )
+
+
+def compact_day(
+    data_dir: Path, day: str, opts: CompactOptions, *, force: bool = False, bench_repeat: int = 3
+) -> List[CompactResult]:
+    data_dir = Path(data_dir)
+    known = load_manifest(data_dir, validate=False)
+    out: List[CompactResult] = []
+
+    def record(r: CompactResult, inputs: Sequence[Path]) -> None:
+        if r.skipped:
+            return
+        # Merged hive parts keep the union of their inputs' datasets.
+        datasets = [known.get(p.relative_to(data_dir).as_posix(), {}).get("dataset") for p in inputs]
+        dataset = "+".join(dict.fromkeys(d for ds in datasets if ds for d in ds.split("+"))) or None
+        update_manifest(data_dir, [Path(r.path)], dataset=dataset, append=True, writer="compact_parquet")
+
+    for p in _day_files(data_dir, day):
+        out.append(compact_files([p], p, opts, force=force, bench_repeat=bench_repeat))
+        record(out[-1], [p])
+    for d in _hive_symbol_dirs(data_dir, day):
+        parts = sorted(d.glob("part-*.parquet"))
+        out.append(compact_files(parts, d / "part-00000.parquet", opts, force=force, bench_repeat=bench_repeat))
+        record(out[-1], parts)
+    return out
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:9.2f}"
+
+
+def _print_report(results: Sequence[CompactResult], data_dir: Path) -> None:
+    print(f"{'file':60s} {'rows':>10s} {'rg':>9s} {'MB before':>9s} {'MB after':>9s} {'read s':>15s} {'1-symbol s':>15s}")
+    for r in results:
+        name = str(Path(r.path).relative_to(data_dir)) if Path(r.path).is_relative_to(data_dir) else r.path
+        if r.skipped:
+            print(f"{name:60s} {r.rows:10d} {r.row_groups_after:9d} {_mb(r.bytes_after)} {'':9s} (already compacted)")
+            continue
+        print(
+            f"{name:60s} {r.rows:10d} {r.row_groups_before:4d}>{r.row_groups_after:<4d} {_mb(r.bytes_before)} "
+            f"{_mb(r.bytes_after)} {r.read_s_before:7.3f}>{r.read_s_after:<7.3f} "
+            f"{r.symbol_read_s_before:7.3f}>{r.symbol_read_s_after:<7.3f}"
+        )
+    done = [r for r in results if not r.skipped]
+    if done:
+        b0 = sum(r.bytes_before for r in done)
+        b1 = sum(r.bytes_after for r in done)
+        t0 = sum(r.read_s_before for r in done)
+        t1 = sum(r.read_s_after for r in done)
+        print(f"total: {_mb(b0).strip()} MB -> {_mb(b1).strip()} MB ({b1 / max(1, b0):.0%}), full read {t0:.3f}s -> {t1:.3f}s")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Compact downloaded day parquets (sort, zstd, row groups, statistics).")
+    p.add_argument("--data-dir", default="./databento_out", help="Path to databento output directory")
+    g = p.add_mutually_exclusive_group(required=True)
+    g.add_argument("--day", nargs="+", help="Day(s) to compact (YYYY-MM-DD)")
+    g.add_argument("--all", action="store_true", help="Compact every day found in --data-dir")
+    p.add_argument("--zstd-level", type=int, default=CompactOptions.zstd_level, help="zstd compression level (1-22)")
+    p.add_argument(
+        "--row-group-mb",
+        type=int,
+        default=CompactOptions.row_group_mb,
+        help="Target uncompressed row-group size in MB (rows per group are derived from the table's bytes per row)",
+    )
+    p.add_argument(
+        "--sort-mb",
+        type=int,
+        default=CompactOptions.sort_mb,
+        help="Uncompressed MB of rows sorted at a time (whole symbols; a larger symbol is sorted on its own)",
+    )
+    p.add_argument("--bloom-symbol", action="store_true", help="Also write a bloom filter on the symbol column")
+    p.add_argument("--bloom-fpp", type=float, default=CompactOptions.bloom_fpp, help="Bloom filter false-positive rate")
+    p.add_argument("--bench-repeat", type=int, default=3, help="Read benchmark repetitions (best is reported)")
+    p.add_argument("--force", action="store_true", help="Rewrite files already compacted with the same settings")
+    args = p.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    opts = CompactOptions(
+        zstd_level=args.zstd_level,
+        row_group_mb=args.row_group_mb,
+        sort_mb=args.sort_mb,
+        bloom_symbol=args.bloom_symbol,
+        bloom_fpp=args.bloom_fpp,
+    )
+    days = _discover_days(data_dir) if args.all else args.day
+    for day in days:
+        if not DAY_RE.match(day):
+            raise ValueError(f"Bad day {day!r} (expected YYYY-MM-DD)")
+    results: List[CompactResult] = []
+    for day in days:
+        results.extend(compact_day(data_dir, day, opts, force=args.force, bench_repeat=args.bench_repeat))
+    if not results:
+        print(f"No day files found in {data_dir} for: {', '.join(days) or '-'}")
+        return 0
+    _print_report(results, data_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+"""
+Data/data_manifest.py
+
+Per-directory manifest of the downloaded parquet files, kept current by the Data/ writers
+(download_day_databento.py, download_many_databento.py, compact_parquet.py) so inventory and catalog scans
+read one small JSON file instead of opening every parquet.
+
+`<data_dir>/_manifest.json`:
+    {"version": 1, "files": {"<path relative to data_dir>": {
+        "schema", "day", "dataset", "derived_from", "rows", "start_ts_ns", "end_ts_ns",
+        "size", "mtime_ns", "sha256", "writer", "writer_version", "created_by", "updated",
+        "symbols": {"<SYM>": {"rows", "start_ts_ns", "end_ts_ns"[, "volume", "high", "low"]}}}}}
+
+Prices (`high` / `low`) are stored as written in the file (float, or legacy fixed-int). An entry is only trusted
+while the file's (size, mtime_ns) still match it; readers fall back to opening the parquet otherwise.
+
+Updates are read-modify-write under a lock file and land with tmp + rename, so readers never see a partial
+manifest. Entries of files that no longer exist are dropped on every update.
+
+Rebuild for an existing directory (e.g. data downloaded before the manifest existed):
+  python Data/data_manifest.py --data-dir databento_out
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+try:
+    import fcntl  # POSIX only; elsewhere the lock is per process
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+WRITER_VERSION = 1  # bump when entry contents change
+
+_LOCK = threading.Lock()
+
+
+def manifest_path(data_dir: Path) -> Path:
+    return Path(data_dir) / MANIFEST_NAME
+
+
+@contextmanager
+def _locked(data_dir: Path) -> Iterator[None]:
+    with _LOCK, open(Path(data_dir) / f"{MANIFEST_NAME}.lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_raw(data_dir: Path) -> Dict[str, Any]:
+    p = manifest_path(data_dir)
+    try:
+        m = json.loads(p.read_text())
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "files": {}}
+    if not isinstance(m, dict) or m.get("version") != MANIFEST_VERSION or not isinstance(m.get("files"), dict):
+        return {"version": MANIFEST_VERSION, "files": {}}
+    return m
+
+
+def _schema_day(rel: Path) -> Tuple[Optional[str], Optional[str]]:
+    parts = rel.parts
+    # schema=<schema>/day=<day>/symbol=<SYM>/part-*.parquet
+    if len(parts) >= 3 and parts[0].startswith("schema=") and parts[1].startswith("day="):
+        return parts[0][len("schema="):], parts[1][len("day="):]
+    # EQUS.MINI.<day>.<schema>.parquet / XNAS.ITCH.<day>.mbp-10.parquet
+    name = rel.name.split(".")
+    if len(parts) == 1 and len(name) >= 5 and name[-1] == "parquet" and DAY_RE.match(name[2]):
+        return ".".join(name[3:-1]), name[2]
+    return None, None
+
+
+def _ts_ns(arr: pa.ChunkedArray) -> pa.ChunkedArray:
+    if pa.types.is_timestamp(arr.type):
+        return arr.cast(pa.timestamp("ns", tz=arr.type.tz)).cast(pa.int64())
+    return arr.cast(pa.int64())
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def describe_file(data_dir: Path, path: Path, *, dataset: Optional[str] = None, writer: str = "") -> Dict[str, Any]:
+    """
+    Manifest entry for one parquet: row count, per-symbol rows / time range (plus volume / high / low for OHLCV),
+    file size, mtime and checksum. Reads only the timestamp, symbol and OHLCV summary columns.
+    """
+    st = path.stat()
+    pf = pq.ParquetFile(path)
+    names = pf.schema_arrow.names
+    schema, day = _schema_day(path.relative_to(data_dir))
+    entry: Dict[str, Any] = {
+        "schema": schema,
+        "day": day,
+        "dataset": dataset,
+        "rows": pf.metadata.num_rows,
+        "start_ts_ns": None,
+        "end_ts_ns": None,
+        "symbols": {},
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": _sha256(path),
+        "writer": writer,
+        "writer_version": WRITER_VERSION,
+        "created_by": pf.metadata.created_by,
+        "updated": time.time(),
+    }
+    ts_col = "ts_event" if "ts_event" in names else ("ts" if "ts" in names else None)
+    if ts_col is None or "symbol" not in names:
+        return entry
+    extra = [c for c in ("volume", "high", "low") if c in names]
+    tab = pf.read(columns=[ts_col, "symbol", *extra])
+    tab = pa.table(
+        {"ts": _ts_ns(tab[ts_col]), "symbol": pc.cast(tab["symbol"], pa.string()), **{c: tab[c] for c in extra}}
+    )
+    tab = tab.filter(pc.and_(pc.is_valid(tab["ts"]), pc.is_valid(tab["symbol"])))
+    aggs = [("ts", "min"), ("ts", "max"), ("ts", "count")]
+    aggs += [(c, {"volume": "sum", "high": "max", "low": "min"}[c]) for c in extra]
+    symbols: Dict[str, Dict[str, Any]] = {}
+    for r in tab.group_by("symbol").aggregate(aggs).to_pylist():
+        s = {"rows": r["ts_count"], "start_ts_ns": r["ts_min"], "end_ts_ns": r["ts_max"]}
+        if "volume" in extra:
+            s["volume"] = r["volume_sum"]
+        if "high" in extra:
+            s["high"] = r["high_max"]
+        if "low" in extra:
+            s["low"] = r["low_min"]
+        symbols[r["symbol"]] = s
+    entry["symbols"] = dict(sorted(symbols.items()))
+    if symbols:
+        entry["start_ts_ns"] = min(s["start_ts_ns"] for s in symbols.values())
+        entry["end_ts_ns"] = max(s["end_ts_ns"] for s in symbols.values())
+    return entry
+
+
+def update_manifest(
+    data_dir: Path,
+    written: Iterable[Path],
+    *,
+    dataset: Optional[str] = None,
+    derived_from: Optional[str] = None,
+    append: bool = False,
+    writer: str = "download_day_databento",
+) -> None:
+    """
+    Record freshly written files (under `data_dir`) in its manifest and drop entries of files that are gone.
+
+    `dataset` is where the new rows came from; with `append=True` (rows merged into an existing file) it is added
+    to the file's recorded datasets. Without a dataset (e.g. a rewrite by compaction) the recorded one is kept.
+    """
+    data_dir = Path(data_dir)
+    paths = [Path(p) for p in written if Path(p).exists()]
+    entries = {p.relative_to(data_dir).as_posix(): describe_file(data_dir, p, dataset=dataset, writer=writer) for p in paths}
+    with _locked(data_dir):
+        m = _read_raw(data_dir)
+        files = m["files"]
+        for key, entry in entries.items():
+            old = files.get(key) or {}
+            if dataset is None or append:
+                known = [d for d in str(old.get("dataset") or "").split("+") if d]
+                if dataset is not None:
+                    known += [d for d in dataset.split("+") if d not in known]
+                entry["dataset"] = "+".join(known) or None
+            entry["derived_from"] = derived_from or old.get("derived_from")
+            files[key] = entry
+        for key in [k for k in files if not (data_dir / k).exists()]:
+            del files[key]
+        p = manifest_path(data_dir)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(m, indent=1, sort_keys=True))
+        tmp.replace(p)
+
+
+def load_manifest(data_dir: Path, *, validate: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    {relative path: entry}; with `validate`, only entries whose file still has the recorded size and mtime.
+    """
+    data_dir = Path(data_dir)
+    files: Dict[str, Dict[str, Any]] = _read_raw(data_dir)["files"]
+    if not validate:
+        return files
+    out: Dict[str, Dict[str, Any]] = {}
+    for key, entry in files.items():
+        try:
+            st = (data_dir / key).stat()
+        except OSError:
+            continue
+        if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+            out[key] = entry
+    return out
+
+
+def data_files(data_dir: Path) -> List[Path]:
+    """
+    Parquet files a manifest covers: flat day files and hive part files (no staging / chunk / tmp files).
+    """
+    data_dir = Path(data_dir)
+    flat = [p for p in data_dir.glob("*.parquet") if _schema_day(p.relative_to(data_dir))[1] is not None]
+    hive = list(data_dir.glob("schema=*/day=*/symbol=*/part-*.parquet"))
+    return sorted(flat + hive)
+
+
+def rebuild_manifest(data_dir: Path, *, force: bool = False) -> Tuple[int, int]:
+    """
+    Describe every data file whose entry is missing or stale (all of them with `force`). Returns (described, kept).
+    """
+    data_dir = Path(data_dir)
+    valid = {} if force else load_manifest(data_dir)
+    todo = [p for p in data_files(data_dir) if p.relative_to(data_dir).as_posix() not in valid]
+    update_manifest(data_dir, todo, writer="data_manifest")
+    return len(todo), len(valid)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Build/refresh the _manifest.json of a databento output directory.")
+    p.add_argument("--data-dir", default="./databento_out", help="Path to databento output directory")
+    p.add_argument("--force", action="store_true", help="Re-describe every file, not just new or changed ones")
+    args = p.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    described, kept = rebuild_manifest(data_dir, force=args.force)
+    print(f"{manifest_path(data_dir)}: {described} file(s) described, {kept} unchanged")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
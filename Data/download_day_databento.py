@@ -4,12 +4,14 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 from pathlib import Path
 import shutil
 import tempfile
-from typing import Sequence
+from typing import Callable, Sequence
 
 import databento as db
 import os
@@ -19,6 +21,8 @@ import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
+from data_manifest import update_manifest  # Data/data_manifest.py (sibling script)
+
 
 @dataclass(frozen=True)
 class SessionWindow:
@@ -192,7 +196,7 @@ def fetch_to_parquet_incremental(
     """
     desired = list(dict.fromkeys(symbols))  # stable unique
     if overwrite or not out_path.exists():
-        return fetch_to_parquet(
+        fetch_to_parquet(
             client,
             dataset=dataset,
             schema=schema,
@@ -201,6 +205,8 @@ def fetch_to_parquet_incremental(
             end=end,
             out_path=out_path,
         )
+        update_manifest(out_path.parent, [out_path], dataset=dataset)
+        return out_path
 
     existing = _existing_symbols_in_parquet(out_path)
     missing = [s for s in desired if s not in existing]
@@ -224,6 +230,7 @@ def fetch_to_parquet_incremental(
         )
         # Merge existing + new into the original out_path.
         _merge_parquets_concat([out_path, tmp_new], out_path)
+    update_manifest(out_path.parent, [out_path], dataset=dataset, append=True)
 
     return out_path
 
@@ -312,6 +319,7 @@ def fetch_trades_with_dataset_fallback(
                     )
                     if _parquet_has_rows(tmp):
                         tmp.replace(out_path)
+                        update_manifest(out_path.parent, [out_path], dataset=dataset)
                         print(f"Trades dataset selected: {dataset} -> {out_path.name}")
                         return out_path
                     errors.append((dataset, "download succeeded but returned 0 rows"))
@@ -350,6 +358,7 @@ def fetch_trades_with_dataset_fallback(
                 )
                 if _parquet_has_rows(tmp_new):
                     _merge_parquets_concat([out_path, tmp_new], out_path)
+                    update_manifest(out_path.parent, [out_path], dataset=dataset, append=True)
                     print(f"Trades dataset selected (incremental): {dataset} -> {out_path.name}")
                     return out_path
                 errors.append((dataset, "download succeeded but returned 0 rows"))
@@ -401,6 +410,7 @@ def fetch_with_dataset_fallback(
                     )
                     if _parquet_has_rows(tmp):
                         tmp.replace(out_path)
+                        update_manifest(out_path.parent, [out_path], dataset=dataset)
                         print(f"{schema} dataset selected: {dataset} -> {out_path.name}")
                         return out_path
                     errors.append((dataset, "download succeeded but returned 0 rows"))
@@ -439,6 +449,7 @@ def fetch_with_dataset_fallback(
                 )
                 if _parquet_has_rows(tmp_new):
                     _merge_parquets_concat([out_path, tmp_new], out_path)
+                    update_manifest(out_path.parent, [out_path], dataset=dataset, append=True)
                     print(f"{schema} dataset selected (incremental): {dataset} -> {out_path.name}")
                     return out_path
                 errors.append((dataset, "download succeeded but returned 0 rows"))
@@ -451,6 +462,128 @@ def fetch_with_dataset_fallback(
     )
 
 
+# ---------------- Checkpointed (chunked) downloads ----------------
+
+CHUNK_MANIFEST = "manifest.json"
+
+
+def _write_json_atomic(path: Path, obj: object) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+
+def _time_chunks(start: datetime, end: datetime, chunk_minutes: int | None) -> list[tuple[datetime, datetime]]:
+    if not chunk_minutes:
+        return [(start, end)]
+    step = timedelta(minutes=chunk_minutes)
+    out: list[tuple[datetime, datetime]] = []
+    t = start
+    while t < end:
+        out.append((t, min(t + step, end)))
+        t += step
+    return out
+
+
+def fetch_chunked_checkpointed(
+    client: db.Historical,
+    *,
+    datasets: Sequence[str],
+    schema: str,
+    symbols: Sequence[str],
+    start: datetime,
+    end: datetime,
+    chunk_dir: Path,
+    symbols_per_chunk: int | None = None,
+    chunk_minutes: int | None = None,
+) -> list[Path]:
+    """
+    Download `symbols` over [start, end) from each of `datasets` in chunks (time ranges x symbol groups) into
+    `chunk_dir`, recording each finished chunk in `chunk_dir/manifest.json`.
+
+    Chunks recorded by an earlier, interrupted call for the same request are not downloaded again; a different
+    request discards them. Returns the chunk files in merge order (dataset, then time, then symbols), so each
+    symbol's rows stay in time order. The caller removes `chunk_dir` once it has merged them.
+    """
+    desired = list(dict.fromkeys(symbols))  # stable unique
+    request = {
+        "schema": schema,
+        "datasets": list(datasets),
+        "symbols": desired,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "symbols_per_chunk": symbols_per_chunk,
+        "chunk_minutes": chunk_minutes,
+    }
+    manifest_path = chunk_dir / CHUNK_MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+    if manifest is None or manifest.get("request") != request:
+        if chunk_dir.exists():
+            shutil.rmtree(chunk_dir)  # chunks of a different request
+        _ensure_dir(chunk_dir)
+        manifest = {"request": request, "chunks": {}}
+        _write_json_atomic(manifest_path, manifest)
+
+    per = symbols_per_chunk or len(desired)
+    sym_chunks = [desired[i : i + per] for i in range(0, len(desired), per)]
+    out: list[Path] = []
+    reused = 0
+    for ds in datasets:
+        for ti, (t0, t1) in enumerate(_time_chunks(start, end, chunk_minutes)):
+            for si, syms in enumerate(sym_chunks):
+                key = f"{ds}.t{ti:04d}.s{si:04d}"
+                path = chunk_dir / f"{key}.parquet"
+                done = manifest["chunks"].get(key)
+                if done is not None and (done["rows"] == 0 or path.exists()):
+                    reused += 1
+                else:
+                    tmp = path.with_name(path.name + ".tmp")
+                    fetch_to_parquet(client, dataset=ds, schema=schema, symbols=syms, start=t0, end=t1, out_path=tmp)
+                    rows = 0
+                    if tmp.exists():  # no file when the range has no data
+                        tmp.replace(path)
+                        rows = pq.ParquetFile(path).metadata.num_rows
+                    manifest["chunks"][key] = {
+                        "dataset": ds,
+                        "symbols": syms,
+                        "start": t0.isoformat(),
+                        "end": t1.isoformat(),
+                        "rows": rows,
+                    }
+                    _write_json_atomic(manifest_path, manifest)
+                if path.exists():
+                    out.append(path)
+    total = len(manifest["chunks"])
+    print(f"Chunks ({schema}): {total - reused} downloaded, {reused} reused from {chunk_dir}")
+    return out
+
+
+def _drop_chunks(chunk_dir: Path) -> None:
+    # After a successful merge: remove the chunks, and `_chunks/` itself once nothing else is in flight there.
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    try:
+        chunk_dir.parent.rmdir()
+    except OSError:
+        pass
+
+
+# Datasets download_day reads each schema from (no fallback); mbp-10 venues are combined into one file.
+DAY_SOURCES: dict[str, tuple[str, ...]] = {
+    "trades": ("XNAS.BASIC",),
+    "ohlcv-1s": ("BATS.PITCH",),
+    "mbp-10": ("XNAS.ITCH", "EDGX.PITCH", "BATS.PITCH"),
+}
+
+# Simulator only reads these columns for MBP-10:
+MBP10_COLUMNS = (
+    ["ts_event", "symbol"]
+    + [f"bid_px_{i:02d}" for i in range(10)]
+    + [f"bid_sz_{i:02d}" for i in range(10)]
+    + [f"ask_px_{i:02d}" for i in range(10)]
+    + [f"ask_sz_{i:02d}" for i in range(10)]
+)
+
+
 def fetch_mbp10_multi_venue_combined(
     client: db.Historical,
     *,
@@ -461,50 +594,46 @@ def fetch_mbp10_multi_venue_combined(
     day: str,
     overwrite: bool = False,
     datasets: Sequence[str] = ("XNAS.ITCH", "EDGX.PITCH", "BATS.PITCH"),
+    symbols_per_chunk: int | None = None,
+    chunk_minutes: int | None = None,
 ) -> Path:
     """
     Download MBP-10 from multiple venues and combine into a single simulator-compatible file.
 
     The simulator expects the filename pattern `XNAS.ITCH.<DAY>.mbp-10.parquet` regardless of
-    where the depth was sourced from. We therefore download each venue into temporary parquet
-    files, then concatenate into the compatibility filename.
+    where the depth was sourced from. We therefore download each venue (in chunks, see
+    `fetch_chunked_checkpointed`) into `<out_dir>/_chunks/`, then concatenate into the compatibility
+    filename. If the download fails midway, rerunning the same command only fetches the chunks
+    that had not finished.
     """
     out_dir = Path(out_dir)
     _ensure_dir(out_dir)
 
     combined = out_dir / f"XNAS.ITCH.{day}.mbp-10.parquet"
-
-    # Simulator only reads these columns for MBP-10:
-    mbp_cols = (
-        ["ts_event", "symbol"]
-        + [f"bid_px_{i:02d}" for i in range(10)]
-        + [f"bid_sz_{i:02d}" for i in range(10)]
-        + [f"ask_px_{i:02d}" for i in range(10)]
-        + [f"ask_sz_{i:02d}" for i in range(10)]
-    )
+    chunk_dir = out_dir / "_chunks" / combined.stem
 
     desired = list(dict.fromkeys(symbols))  # stable unique
     if not desired:
         raise ValueError("No symbols provided.")
 
+    def fetch(syms: list[str]) -> list[Path]:
+        return fetch_chunked_checkpointed(
+            client,
+            datasets=datasets,
+            schema="mbp-10",
+            symbols=syms,
+            start=start,
+            end=end,
+            chunk_dir=chunk_dir,
+            symbols_per_chunk=symbols_per_chunk,
+            chunk_minutes=chunk_minutes,
+        )
+
     # Fresh build: download all requested symbols from each venue, then merge into the combined file.
     if overwrite or not combined.exists():
-        with tempfile.TemporaryDirectory() as td:
-            td_path = Path(td)
-            per_venue_tmp: list[Path] = []
-            for ds in datasets:
-                p = td_path / f"{ds}.{day}.mbp-10.parquet"
-                fetch_to_parquet(
-                    client,
-                    dataset=ds,
-                    schema="mbp-10",
-                    symbols=desired,
-                    start=start,
-                    end=end,
-                    out_path=p,
-                )
-                per_venue_tmp.append(p)
-            _merge_parquets_concat_columns(per_venue_tmp, combined, columns=mbp_cols)
+        _merge_parquets_concat_columns(fetch(desired), combined, columns=MBP10_COLUMNS)
+        update_manifest(out_dir, [combined], dataset="+".join(datasets))
+        _drop_chunks(chunk_dir)
         return combined
 
     # Incremental build: only download missing symbols, merge them, then merge with the existing combined file.
@@ -515,27 +644,223 @@ def fetch_mbp10_multi_venue_combined(
         return combined
 
     print(f"Incremental download (mbp-10 combined): missing symbols {missing} -> {combined.name}")
+    chunks = fetch(missing)
+    merged_missing = chunk_dir / f"XNAS.ITCH.{day}.mbp-10.missing.parquet"
+    _merge_parquets_concat_columns(chunks, merged_missing, columns=MBP10_COLUMNS)
+    _merge_parquets_concat_columns([combined, merged_missing], combined, columns=MBP10_COLUMNS)
+    update_manifest(out_dir, [combined], dataset="+".join(datasets), append=True)
+    _drop_chunks(chunk_dir)
+
+    return combined
+
+
+# ---------------- Partitioned (hive) layout ----------------
+#
+#   <out_dir>/schema=<schema>/day=<YYYY-MM-DD>/symbol=<SYM>/part-<n>.parquet
+#
+# Parts keep the flat files' columns (symbol included). Adding a symbol writes new files only; nothing existing
+# is re-copied. The simulator and catalog read it through pyarrow.dataset (see Simulator/DataCatalog.py day_source).
+
+LAYOUTS = ("flat", "hive")
+_HIVE_DERIVED_SCHEMA = {"10s": "ohlcv-10s", "1min": "ohlcv-1m", "5min": "ohlcv-5m"}
+
+
+def _hive_day_dir(root: Path, schema: str, day: str) -> Path:
+    return root / f"schema={schema}" / f"day={day}"
+
+
+def _hive_symbols(root: Path, schema: str, day: str) -> set[str]:
+    d = _hive_day_dir(root, schema, day)
+    return {p.name[len("symbol="):] for p in d.glob("symbol=*") if any(p.glob("part-*.parquet"))}
+
+
+def _write_hive_parts(
+    parquet_path: Path,
+    root: Path,
+    schema: str,
+    day: str,
+    *,
+    symbols: Sequence[str] | None = None,
+    replace: bool = False,
+    batch_size: int = 250_000,
+    dataset: str | None = None,
+    derived_from: str | None = None,
+) -> list[str]:
+    """
+    Split a multi-symbol parquet into the hive layout: each symbol's rows (only `symbols`, when given) become
+    one new part file in its own directory, streamed batch by batch. Parts are written as `.tmp` and renamed
+    at the end; with replace=True a symbol's older parts are removed first. The new parts are recorded in
+    the root's manifest. Returns the symbols written.
+    """
+    pf = pq.ParquetFile(parquet_path)
+    out_schema = pf.schema_arrow
+    wanted = pa.array(sorted(set(symbols)), pa.string()) if symbols is not None else None
+    writers: dict[str, tuple[pq.ParquetWriter, Path]] = {}
+    try:
+        for batch in pf.iter_batches(batch_size=batch_size):
+            tbl = pa.Table.from_batches([batch])
+            sym = pc.cast(tbl["symbol"], pa.string())
+            if wanted is not None:
+                keep = pc.is_in(sym, value_set=wanted)
+                tbl, sym = tbl.filter(keep), sym.filter(keep)
+            for s in pc.unique(sym).to_pylist():
+                if s is None:
+                    continue
+                if s not in writers:
+                    d = _hive_day_dir(root, schema, day) / f"symbol={s}"
+                    _ensure_dir(d)
+                    tmp = d / f"part-{len(list(d.glob('part-*.parquet'))):05d}.parquet.tmp"
+                    writers[s] = (pq.ParquetWriter(tmp, schema=out_schema), tmp)
+                writers[s][0].write_table(tbl.filter(pc.equal(sym, s)))
+    except BaseException:
+        for w, tmp in writers.values():
+            w.close()
+            tmp.unlink(missing_ok=True)
+        raise
+    written: list[Path] = []
+    for s, (w, tmp) in writers.items():
+        w.close()
+        if replace:
+            for old in tmp.parent.glob("part-*.parquet"):
+                old.unlink()
+            written.append(tmp.replace(tmp.parent / "part-00000.parquet"))
+        else:
+            written.append(tmp.replace(tmp.with_suffix("")))
+    update_manifest(root, written, dataset=dataset, derived_from=derived_from)
+    return sorted(writers)
+
+
+def _hive_incremental(
+    root: Path,
+    schema: str,
+    day: str,
+    symbols: Sequence[str],
+    *,
+    overwrite: bool,
+    download: Callable[[list[str], Path], None],
+    dataset: str | None = None,
+) -> Path:
+    """
+    Ensure the hive day directory has `symbols`: `download(symbols, tmp_parquet)` fetches only the missing
+    ones (all of them with overwrite=True), which are then split into new per-symbol parts.
+    """
+    desired = list(dict.fromkeys(symbols))  # stable unique
+    if not desired:
+        raise ValueError("No symbols provided.")
+    day_dir = _hive_day_dir(root, schema, day)
+    existing = set() if overwrite else _hive_symbols(root, schema, day)
+    missing = [s for s in desired if s not in existing]
+    if not missing:
+        print(f"Already present ({schema}) in {day_dir}: {sorted(existing & set(desired))}")
+        return day_dir
+
+    print(f"Partitioned download ({schema}): symbols {missing} -> {day_dir}")
     with tempfile.TemporaryDirectory() as td:
-        td_path = Path(td)
-        per_venue_tmp: list[Path] = []
-        for ds in datasets:
-            p = td_path / f"{ds}.{day}.mbp-10.parquet"
-            fetch_to_parquet(
-                client,
-                dataset=ds,
-                schema="mbp-10",
-                symbols=missing,
-                start=start,
-                end=end,
-                out_path=p,
-            )
-            per_venue_tmp.append(p)
+        tmp = Path(td) / f"{schema}.{day}.parquet"
+        download(missing, tmp)
+        _write_hive_parts(tmp, root, schema, day, replace=overwrite, dataset=dataset)
+    return day_dir
 
-        merged_missing = td_path / f"XNAS.ITCH.{day}.mbp-10.missing.parquet"
-        _merge_parquets_concat_columns(per_venue_tmp, merged_missing, columns=mbp_cols)
-        _merge_parquets_concat_columns([combined, merged_missing], combined, columns=mbp_cols)
 
-    return combined
+def fetch_to_hive_incremental(
+    client: db.Historical,
+    *,
+    dataset: str,
+    schema: str,
+    symbols: Sequence[str],
+    start: datetime,
+    end: datetime,
+    root: Path,
+    day: str,
+    overwrite: bool = False,
+) -> Path:
+    """
+    Hive-layout counterpart of `fetch_to_parquet_incremental`: missing symbols land as new part files.
+    """
+
+    def download(syms: list[str], out_path: Path) -> None:
+        fetch_to_parquet(client, dataset=dataset, schema=schema, symbols=syms, start=start, end=end, out_path=out_path)
+
+    return _hive_incremental(root, schema, day, symbols, overwrite=overwrite, download=download, dataset=dataset)
+
+
+def fetch_mbp10_multi_venue_hive(
+    client: db.Historical,
+    *,
+    symbols: Sequence[str],
+    start: datetime,
+    end: datetime,
+    root: Path,
+    day: str,
+    overwrite: bool = False,
+    datasets: Sequence[str] = ("XNAS.ITCH", "EDGX.PITCH", "BATS.PITCH"),
+    symbols_per_chunk: int | None = None,
+    chunk_minutes: int | None = None,
+) -> Path:
+    """
+    Hive-layout counterpart of `fetch_mbp10_multi_venue_combined` (same venues, simulator columns and
+    resumable chunks).
+    """
+    chunk_dir = root / "_chunks" / f"mbp-10.{day}"
+
+    def download(syms: list[str], out_path: Path) -> None:
+        chunks = fetch_chunked_checkpointed(
+            client,
+            datasets=datasets,
+            schema="mbp-10",
+            symbols=syms,
+            start=start,
+            end=end,
+            chunk_dir=chunk_dir,
+            symbols_per_chunk=symbols_per_chunk,
+            chunk_minutes=chunk_minutes,
+        )
+        _merge_parquets_concat_columns(chunks, out_path, columns=MBP10_COLUMNS)
+
+    day_dir = _hive_incremental(
+        root, "mbp-10", day, symbols, overwrite=overwrite, download=download, dataset="+".join(datasets)
+    )
+    _drop_chunks(chunk_dir)
+    return day_dir
+
+
+def _ensure_derived_bars_hive(
+    root: Path,
+    day: str,
+    *,
+    symbols: Sequence[str],
+    overwrite: bool,
+    tz: str = "America/New_York",
+) -> None:
+    """
+    Hive-layout counterpart of `_ensure_derived_bars`: builds 10s/1m/5m parts for the symbols that have
+    ohlcv-1s parts but no derived parts yet (all of them with overwrite), reading only those symbols' 1s parts.
+    """
+    have_1s = _hive_symbols(root, "ohlcv-1s", day)
+    todo: dict[str, list[str]] = {}
+    for freq, schema in _HIVE_DERIVED_SCHEMA.items():
+        present = set() if overwrite else _hive_symbols(root, schema, day)
+        missing = [s for s in dict.fromkeys(symbols) if s in have_1s and s not in present]
+        if missing:
+            todo[freq] = missing
+    if not todo:
+        return
+    wanted = sorted({s for miss in todo.values() for s in miss})
+    parts = [p for s in wanted for p in sorted((_hive_day_dir(root, "ohlcv-1s", day) / f"symbol={s}").glob("part-*.parquet"))]
+    with tempfile.TemporaryDirectory() as td:
+        td_path = Path(td)
+        src = _merge_parquets_concat(parts, td_path / "ohlcv-1s.parquet")
+        outs = build_bars_multi_from_ohlcv_1s(src, {freq: td_path / f"{freq}.parquet" for freq in todo}, tz=tz)
+        for freq, out_path in outs.items():
+            _write_hive_parts(
+                out_path,
+                root,
+                _HIVE_DERIVED_SCHEMA[freq],
+                day,
+                symbols=todo[freq],
+                replace=overwrite,
+                derived_from="ohlcv-1s",
+            )
 
 
 def build_bars_from_ohlcv_1s(
@@ -563,94 +888,319 @@ def build_bars_from_ohlcv_1s(
     - Databento `ohlcv-1s` can be sparse (not every second trades). We therefore **do not**
       require a "full" bucket to emit a bar; any bucket with at least one 1s row is kept.
     - Output parquet has columns: symbol, ts, open, high, low, close, volume
+    - The file is streamed in bounded memory (see `build_bars_multi_from_ohlcv_1s`).
+    """
+    if freq not in _DERIVED_FREQ_SEC:
+        raise ValueError(f"Unsupported freq={freq!r}. Supported: {sorted(_DERIVED_FREQ_SEC)}")
+    return build_bars_multi_from_ohlcv_1s(ohlcv_1s_parquet, {freq: out_path}, tz=tz, symbols=symbols)[freq]
+
+
+_DERIVED_FREQ_SEC = {"10s": 10, "1min": 60, "5min": 300}
+
+
+_OHLCV_1S_COLS = ["symbol", "ts_event", "open", "high", "low", "close", "volume"]
+
+
+def _open_ohlcv_1s(ohlcv_1s_parquet: Path, symbols: Sequence[str] | None) -> pq.ParquetFile:
+    """
+    Open ohlcv-1s for the bar builders. With a symbol filter the symbol column is read dictionary-encoded,
+    so `_filter_symbols` only tests the dictionary.
+    """
+    pf = pq.ParquetFile(ohlcv_1s_parquet, read_dictionary=["symbol"] if symbols is not None else None)
+    schema = pf.schema_arrow
+    if "ts_event" not in schema.names:
+        raise ValueError(f"Expected 'ts_event' column in {ohlcv_1s_parquet.name}. Columns: {schema.names}")
+    if not pa.types.is_timestamp(schema.field("ts_event").type):
+        raise ValueError(f"Expected ts_event to be timestamp, got {schema.field('ts_event').type}")
+    if "symbol" not in schema.names:
+        raise ValueError(f"Expected a 'symbol' column (map_symbols=True). Columns: {schema.names}")
+    return pf
+
+
+def _symbol_row_groups(pf: pq.ParquetFile, symbols: Sequence[str] | None) -> list[int]:
+    """
+    Row groups that can hold any of `symbols`, by the symbol column's min/max statistics (predicate
+    pushdown). Pays off on files laid out by symbol, e.g. ones grown by per-symbol incremental merges.
+    """
+    md = pf.metadata
+    if symbols is None:
+        return list(range(md.num_row_groups))
+    wanted = sorted(set(symbols))
+    col = next(i for i in range(md.num_columns) if md.schema.column(i).path == "symbol")
+    keep: list[int] = []
+    for rg in range(md.num_row_groups):
+        st = md.row_group(rg).column(col).statistics
+        if st is None or not st.has_min_max:
+            keep.append(rg)
+            continue
+        lo, hi = st.min, st.max
+        if isinstance(lo, bytes):
+            lo, hi = lo.decode("utf-8", "replace"), hi.decode("utf-8", "replace")
+        j = bisect.bisect_left(wanted, lo)
+        if j < len(wanted) and wanted[j] <= hi:
+            keep.append(rg)
+    return keep
+
+
+def _filter_symbols(table: pa.Table, wanted: pa.Array | None) -> pa.Table:
+    """
+    Keep rows whose symbol is in `wanted` (None keeps all), then decode the symbol column to plain strings.
+    On a dictionary-encoded column only the (small) dictionary is tested and the row mask is a take.
+    """
+    col = table["symbol"]
+    if wanted is not None:
+        masks = []
+        for chunk in col.chunks:
+            if pa.types.is_dictionary(chunk.type):
+                masks.append(pc.take(pc.is_in(chunk.dictionary, value_set=wanted), chunk.indices))
+            else:
+                masks.append(pc.is_in(chunk, value_set=wanted))
+        table = table.filter(pa.chunked_array(masks, pa.bool_()))
+        col = table["symbol"]
+    if pa.types.is_dictionary(col.type):
+        table = table.set_column(table.schema.get_field_index("symbol"), "symbol", pc.cast(col, col.type.value_type))
+    return table
+
+
+def _read_sorted_ohlcv_1s(ohlcv_1s_parquet: Path, symbols: Sequence[str] | None = None) -> pa.Table:
+    """
+    Read ohlcv-1s once as (symbol, _ts_ns, open, high, low, close, volume), sorted by (symbol, ts).
+    """
+    pf = _open_ohlcv_1s(ohlcv_1s_parquet, symbols)
+    table = pf.read_row_groups(_symbol_row_groups(pf, symbols), columns=_OHLCV_1S_COLS)
+    table = _filter_symbols(table, pa.array(sorted(set(symbols)), pa.string()) if symbols is not None else None)
+
+    table = table.set_column(table.schema.get_field_index("ts_event"), "_ts_ns", pc.cast(table["ts_event"], pa.int64()))
+    sort_idx = pc.sort_indices(table, sort_keys=[("symbol", "ascending"), ("_ts_ns", "ascending")])
+    return pc.take(table, sort_idx)
+
+
+def _cascade_bars(table: pa.Table, bucket_sec: int) -> pa.Table:
+    """
+    One aggregation level over bars sorted by (symbol, _ts_ns); returns the coarser bars in the same
+    shape and order, so levels can be chained (10s -> 1min -> 5min).
+
+    open/close come from the first/last row of each bucket by sorted row position (min/max of a row
+    number), so no joins are needed.
     """
-    freq_map = {"10s": 10, "1min": 60, "5min": 300}
-    if freq not in freq_map:
-        raise ValueError(f"Unsupported freq={freq!r}. Supported: {sorted(freq_map)}")
-    bucket_sec = freq_map[freq]
-    bucket_ns = bucket_sec * 1_000_000_000
-    end_offset_ns = (bucket_sec - 1) * 1_000_000_000
-
-    cols = ["symbol", "ts_event", "open", "high", "low", "close", "volume"]
-    table = pq.read_table(ohlcv_1s_parquet, columns=cols)
-
-    # Normalize timestamp column name to ts_event, and ensure tz=UTC.
-    if "ts_event" not in table.column_names:
-        raise ValueError(f"Expected 'ts_event' column in {ohlcv_1s_parquet.name}. Columns: {table.column_names}")
-    ts = table["ts_event"]
-    if not pa.types.is_timestamp(ts.type):
-        raise ValueError(f"Expected ts_event to be timestamp, got {ts.type}")
-    if ts.type.tz != "UTC":
-        ts = pc.assume_timezone(ts, "UTC")
-        table = table.set_column(table.schema.get_field_index("ts_event"), "ts_event", ts)
-
-    if "symbol" not in table.column_names:
-        raise ValueError(f"Expected a 'symbol' column (map_symbols=True). Columns: {table.column_names}")
-
-    # Optional symbol filter
-    if symbols is not None:
-        sym_set = set(symbols)
-        sym_arr = table["symbol"]
-        mask = pa.array([s in sym_set for s in sym_arr.to_pylist()])
-        table = table.filter(mask)
-
-    # Sort by symbol, ts_event so "first/last" within bucket is deterministic.
-    sort_idx = pc.sort_indices(table, sort_keys=[("symbol", "ascending"), ("ts_event", "ascending")])
-    table = pc.take(table, sort_idx)
-
-    # Create bucket start as epoch ns integer
-    ts_ns = pc.cast(table["ts_event"], pa.int64())
-    table = table.append_column("_ts_ns", ts_ns)
-    # NOTE: pyarrow.compute does not expose floor_divide in some versions (e.g. pyarrow 21).
-    # For non-negative int64 timestamps, integer division is equivalent to floor division.
-    bucket_ns_s = pa.scalar(bucket_ns, pa.int64())
-    bucket_start_ns = pc.multiply(pc.divide(ts_ns, bucket_ns_s), bucket_ns_s)
-    table = table.append_column("_bucket_start_ns", bucket_start_ns)
-
-    # Aggregate high/low/volume + min/max ts per (symbol, bucket).
-    # We avoid ordered aggregations ("first"/"last") since they can be unsupported in some builds.
-    gb = table.group_by(["symbol", "_bucket_start_ns"])
-    agg = gb.aggregate(
-        [
-            ("high", "max"),
-            ("low", "min"),
-            ("volume", "sum"),
-            ("_ts_ns", "min"),
-            ("_ts_ns", "max"),
-        ]
-    ).rename_columns(["symbol", "_bucket_start_ns", "high", "low", "volume", "_ts_min", "_ts_max"])
-
-    # Lookup (symbol, ts_ns) -> open/close values (using the earliest and latest 1s rows in the bucket).
-    # For 1s bars, (symbol, ts_ns) is typically unique; if not, the sort above makes selection stable.
-    base = pa.table({"symbol": table["symbol"], "_ts_ns": table["_ts_ns"], "_open": table["open"], "_close": table["close"]})
-    open_keys = pa.table({"symbol": agg["symbol"], "_ts_ns": agg["_ts_min"]})
-    close_keys = pa.table({"symbol": agg["symbol"], "_ts_ns": agg["_ts_max"]})
-    open_joined = open_keys.join(base, keys=["symbol", "_ts_ns"], join_type="left outer")
-    close_joined = close_keys.join(base, keys=["symbol", "_ts_ns"], join_type="left outer")
-
-    # Drop buckets where open/close lookups failed (best-effort; should be rare).
-    has_open = pc.is_valid(open_joined["_open"])
-    has_close = pc.is_valid(close_joined["_close"])
-    keep = pc.and_(has_open, has_close)
-    agg = agg.filter(keep)
-    open_joined = open_joined.filter(keep)
-    close_joined = close_joined.filter(keep)
-
-    out = pa.table(
+    bucket_ns_s = pa.scalar(bucket_sec * 1_000_000_000, pa.int64())
+    # Non-negative int64 timestamps: integer division == floor division.
+    bucket = pc.multiply(pc.divide(table["_ts_ns"], bucket_ns_s), bucket_ns_s)
+    work = pa.table(
+        {
+            "symbol": table["symbol"],
+            "_bucket": bucket,
+            "_row": pa.array(range(table.num_rows), pa.int64()),
+            "high": table["high"],
+            "low": table["low"],
+            "volume": table["volume"],
+        }
+    )
+    agg = work.group_by(["symbol", "_bucket"]).aggregate(
+        [("_row", "min"), ("_row", "max"), ("high", "max"), ("low", "min"), ("volume", "sum")]
+    )
+    agg = agg.take(pc.sort_indices(agg, sort_keys=[("symbol", "ascending"), ("_bucket", "ascending")]))
+    return pa.table(
         {
             "symbol": agg["symbol"],
-            # output ts is bucket start as timestamp[ns, tz=UTC]
-            "ts": pc.cast(agg["_bucket_start_ns"], pa.timestamp("ns", tz="UTC")),
-            "open": open_joined["_open"],
-            "high": agg["high"],
-            "low": agg["low"],
-            "close": close_joined["_close"],
-            "volume": agg["volume"],
+            "_ts_ns": agg["_bucket"],
+            "open": pc.take(table["open"], agg["_row_min"]),
+            "high": agg["high_max"],
+            "low": agg["low_min"],
+            "close": pc.take(table["close"], agg["_row_max"]),
+            "volume": agg["volume_sum"],
         }
     )
 
-    pq.write_table(out, out_path)
-    return out_path
+
+class _UnorderedOhlcv(Exception):
+    """A symbol's 1s rows are not in time order through the file (streaming needs per-symbol time order)."""
+
+
+def _split_open_bars(bars: pa.Table) -> tuple[pa.Table, pa.Table]:
+    """
+    Split bars sorted by (symbol, _ts_ns) into (finished, open): each symbol's last bar may still grow
+    with the next batch, every earlier bar is final.
+    """
+    n = bars.num_rows
+    if n == 0:
+        return bars, bars
+    sym = bars["symbol"]
+    is_last = pa.chunked_array(pc.not_equal(sym.slice(0, n - 1), sym.slice(1)).chunks + [pa.array([True])])
+    return bars.filter(pc.invert(is_last)), bars.filter(is_last)
+
+
+def _check_symbol_order(last_seen: pa.Table | None, batch: pa.Table) -> pa.Table:
+    """
+    Raise _UnorderedOhlcv if any symbol's timestamps go backwards (within the batch or vs. the previous
+    batches); returns the new per-symbol last timestamp table.
+    """
+    keys = batch.select(["symbol", "_ts_ns"])
+    if last_seen is not None:
+        keys = pa.concat_tables([last_seen, keys])
+    # sort_indices is stable: rows of one symbol keep their file order.
+    keys = keys.take(pc.sort_indices(keys, sort_keys=[("symbol", "ascending")]))
+    n = keys.num_rows
+    if n > 1:
+        sym, ts = keys["symbol"], keys["_ts_ns"]
+        back = pc.and_(pc.equal(sym.slice(1), sym.slice(0, n - 1)), pc.less(ts.slice(1), ts.slice(0, n - 1)))
+        if pc.any(back).as_py():
+            raise _UnorderedOhlcv()
+    return _split_open_bars(keys)[1]
+
+
+def _bars_out(level: pa.Table) -> pa.Table:
+    return level.set_column(
+        level.schema.get_field_index("_ts_ns"), "ts", pc.cast(level["_ts_ns"], pa.timestamp("ns", tz="UTC"))
+    )
+
+
+def _stream_bars_multi(
+    ohlcv_1s_parquet: Path,
+    tmp_paths: dict[str, Path],
+    *,
+    symbols: Sequence[str] | None,
+    batch_size: int,
+) -> None:
+    """
+    One streaming pass over ohlcv-1s: each batch is aggregated per timeframe (cascading 10s -> 1min -> 5min
+    within the batch), merged with the still-open bar of each symbol carried over from earlier batches, and
+    every finished bar is written right away. Memory is one batch plus one open bar per symbol and timeframe.
+    """
+    pf = _open_ohlcv_1s(ohlcv_1s_parquet, symbols)
+    row_groups = _symbol_row_groups(pf, symbols)
+    freqs = sorted(tmp_paths, key=lambda f: _DERIVED_FREQ_SEC[f])
+    open_bars: dict[str, pa.Table | None] = {f: None for f in freqs}
+    writers: dict[str, pq.ParquetWriter] = {}
+    last_seen: pa.Table | None = None
+    wanted = pa.array(sorted(set(symbols)), pa.string()) if symbols is not None else None
+
+    def write(freq: str, bars: pa.Table) -> None:
+        out = _bars_out(bars)
+        if freq not in writers:
+            writers[freq] = pq.ParquetWriter(tmp_paths[freq], schema=out.schema)
+        if out.num_rows:
+            writers[freq].write_table(out)
+
+    try:
+        batches = pf.iter_batches(columns=_OHLCV_1S_COLS, batch_size=batch_size, row_groups=row_groups) if row_groups else ()
+        for batch in batches:
+            table = _filter_symbols(pa.Table.from_batches([batch]), wanted)
+            if table.num_rows == 0:
+                continue
+            table = table.set_column(
+                table.schema.get_field_index("ts_event"), "_ts_ns", pc.cast(table["ts_event"], pa.int64())
+            )
+            last_seen = _check_symbol_order(last_seen, table)
+            base = table.take(pc.sort_indices(table, sort_keys=[("symbol", "ascending"), ("_ts_ns", "ascending")]))
+            src, src_sec = base, 1
+            for freq in freqs:
+                sec = _DERIVED_FREQ_SEC[freq]
+                level = _cascade_bars(src if sec % src_sec == 0 else base, sec)
+                src, src_sec = level, sec
+                prev = open_bars[freq]
+                if prev is not None:
+                    # The carried bar sorts first within its (symbol, bucket), so it keeps the open.
+                    both = pa.concat_tables([prev, level])
+                    both = both.take(pc.sort_indices(both, sort_keys=[("symbol", "ascending"), ("_ts_ns", "ascending")]))
+                    level = _cascade_bars(both, sec)
+                done, open_bars[freq] = _split_open_bars(level)
+                write(freq, done)
+        for freq in freqs:
+            prev = open_bars[freq]
+            if prev is None:
+                # No rows at all: still produce a (schema-only) file.
+                empty = _filter_symbols(pf.schema_arrow.empty_table().select(_OHLCV_1S_COLS), None)
+                empty = empty.set_column(1, "_ts_ns", pa.array([], pa.int64()))
+                prev = _cascade_bars(empty, _DERIVED_FREQ_SEC[freq])
+            write(freq, prev)
+    finally:
+        for w in writers.values():
+            w.close()
+
+
+def build_bars_multi_from_ohlcv_1s(
+    ohlcv_1s_parquet: Path,
+    out_paths: dict[str, Path],
+    *,
+    tz: str = "America/New_York",
+    symbols: Sequence[str] | None = None,
+    batch_size: int = 250_000,
+) -> dict[str, Path]:
+    """
+    Build several derived timeframes ({"10s": path, "1min": path, "5min": path}, any subset) from one
+    pass over ohlcv-1s. Levels cascade from the previous level when its bucket divides evenly
+    (1min from 10s, 5min from 1min).
+
+    The file is streamed in batches (bounded memory, see `_stream_bars_multi`); each symbol's bars come
+    out in time order. That needs every symbol's 1s rows in time order through the file (true for
+    Databento output and for files merged per symbol); otherwise it falls back to one in-memory sort.
+    """
+    for freq in out_paths:
+        if freq not in _DERIVED_FREQ_SEC:
+            raise ValueError(f"Unsupported freq={freq!r}. Supported: {sorted(_DERIVED_FREQ_SEC)}")
+    tmps = {freq: path.with_suffix(path.suffix + ".tmp") for freq, path in out_paths.items()}
+    try:
+        _stream_bars_multi(ohlcv_1s_parquet, tmps, symbols=symbols, batch_size=batch_size)
+    except _UnorderedOhlcv:
+        print(f"{ohlcv_1s_parquet.name}: rows not in time order per symbol; building bars in memory")
+        base = _read_sorted_ohlcv_1s(ohlcv_1s_parquet, symbols)
+        src, src_sec = base, 1
+        for freq in sorted(out_paths, key=lambda f: _DERIVED_FREQ_SEC[f]):
+            sec = _DERIVED_FREQ_SEC[freq]
+            level = _cascade_bars(src if sec % src_sec == 0 else base, sec)
+            src, src_sec = level, sec
+            pq.write_table(_bars_out(level), tmps[freq])
+    except BaseException:
+        for tmp in tmps.values():
+            tmp.unlink(missing_ok=True)
+        raise
+    for freq, path in out_paths.items():
+        tmps[freq].replace(path)
+    return dict(out_paths)
+
+
+def _ensure_derived_bars(
+    ohlcv1s_path: Path,
+    out_paths: dict[str, Path],
+    *,
+    symbols: Sequence[str],
+    overwrite: bool,
+    tz: str = "America/New_York",
+) -> None:
+    """
+    Make sure each derived bar file has `symbols`: files that are missing (or overwrite) are built in full,
+    files missing only some symbols get those symbols built and merged. Each group is a single pass.
+    """
+    full: dict[str, Path] = {}
+    partial: dict[str, tuple[Path, list[str]]] = {}
+    for freq, path in out_paths.items():
+        if overwrite or not path.exists():
+            full[freq] = path
+            continue
+        existing = _existing_symbols_in_parquet(path)
+        missing = [s for s in symbols if s not in existing]
+        if missing:
+            partial[freq] = (path, missing)
+
+    if full:
+        build_bars_multi_from_ohlcv_1s(ohlcv1s_path, full, tz=tz, symbols=symbols)
+    if partial:
+        wanted = sorted({s for _, miss in partial.values() for s in miss})
+        with tempfile.TemporaryDirectory() as td:
+            td_path = Path(td)
+            tmps = {freq: td_path / f"{path.stem}.new{path.suffix}" for freq, (path, _) in partial.items()}
+            build_bars_multi_from_ohlcv_1s(ohlcv1s_path, tmps, tz=tz, symbols=wanted)
+            for freq, (path, missing) in partial.items():
+                tmp = tmps[freq]
+                if len(missing) != len(wanted):
+                    # Another timeframe needed more symbols; keep only this file's missing ones.
+                    t = pq.read_table(tmp)
+                    pq.write_table(t.filter(pc.is_in(t["symbol"], value_set=pa.array(missing))), tmp)
+                _merge_parquets_concat([path, tmp], path)
+    built = [p for p in [*full.values(), *(path for path, _ in partial.values())] if p.exists()]
+    if built:
+        update_manifest(ohlcv1s_path.parent, built, derived_from="ohlcv-1s")
 
 
 def build_10s_bars_from_ohlcv_1s(
@@ -690,7 +1240,12 @@ def download_day(
     download_ohlcv1s: bool = True,
     download_mbp10: bool = True,
     overwrite: bool = False,
+    layout: str = "flat",
+    mbp10_symbols_per_chunk: int | None = None,
+    mbp10_chunk_minutes: int | None = None,
 ) -> None:
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}")
     out = Path(out_dir)
     _ensure_dir(out)
 
@@ -698,6 +1253,24 @@ def download_day(
 
     client = db.Historical()  # uses DATABENTO_API_KEY env var
 
+    if layout == "hive":
+        _download_day_hive(
+            client,
+            day=day,
+            symbols=symbols,
+            root=out,
+            start=start,
+            end=end,
+            tz=window.tz,
+            download_trades=download_trades,
+            download_ohlcv1s=download_ohlcv1s,
+            download_mbp10=download_mbp10,
+            overwrite=overwrite,
+            mbp10_symbols_per_chunk=mbp10_symbols_per_chunk,
+            mbp10_chunk_minutes=mbp10_chunk_minutes,
+        )
+        return
+
     # 1) Near-consolidated tape + bars
     trades_path = out / f"EQUS.MINI.{day}.trades.parquet"
     ohlcv1s_path = out / f"EQUS.MINI.{day}.ohlcv-1s.parquet"
@@ -733,37 +1306,15 @@ def download_day(
             out_path=ohlcv1s_path,  # keep filename EQUS.MINI.<DAY>.ohlcv-1s.parquet for simulator compatibility
             overwrite=overwrite,
         )
-        # Build derived bars (local resampling, no extra API usage).
+        # Build derived bars (local resampling, no extra API usage) in one pass over ohlcv-1s.
         # We only build bars for symbols that are missing in each derived file, then merge locally.
-        existing_10s = _existing_symbols_in_parquet(bars10s_path) if bars10s_path.exists() else set()
-        missing_10s = [s for s in symbols if s not in existing_10s] if not overwrite else list(symbols)
-        existing_1m = _existing_symbols_in_parquet(bars1m_path) if bars1m_path.exists() else set()
-        missing_1m = [s for s in symbols if s not in existing_1m] if not overwrite else list(symbols)
-        existing_5m = _existing_symbols_in_parquet(bars5m_path) if bars5m_path.exists() else set()
-        missing_5m = [s for s in symbols if s not in existing_5m] if not overwrite else list(symbols)
-
-        with tempfile.TemporaryDirectory() as td:
-            td_path = Path(td)
-            if overwrite or not bars10s_path.exists():
-                build_10s_bars_from_ohlcv_1s(ohlcv1s_path, bars10s_path, tz=window.tz, symbols=symbols)
-            elif missing_10s:
-                tmp = td_path / f"{bars10s_path.stem}.new{bars10s_path.suffix}"
-                build_10s_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_10s)
-                _merge_parquets_concat([bars10s_path, tmp], bars10s_path)
-
-            if overwrite or not bars1m_path.exists():
-                build_1m_bars_from_ohlcv_1s(ohlcv1s_path, bars1m_path, tz=window.tz, symbols=symbols)
-            elif missing_1m:
-                tmp = td_path / f"{bars1m_path.stem}.new{bars1m_path.suffix}"
-                build_1m_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_1m)
-                _merge_parquets_concat([bars1m_path, tmp], bars1m_path)
-
-            if overwrite or not bars5m_path.exists():
-                build_5m_bars_from_ohlcv_1s(ohlcv1s_path, bars5m_path, tz=window.tz, symbols=symbols)
-            elif missing_5m:
-                tmp = td_path / f"{bars5m_path.stem}.new{bars5m_path.suffix}"
-                build_5m_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_5m)
-                _merge_parquets_concat([bars5m_path, tmp], bars5m_path)
+        _ensure_derived_bars(
+            ohlcv1s_path,
+            {"10s": bars10s_path, "1min": bars1m_path, "5min": bars5m_path},
+            symbols=symbols,
+            overwrite=overwrite,
+            tz=window.tz,
+        )
     if download_mbp10:
         # Per user requirement: download multiple venues and combine into a single
         # `XNAS.ITCH.<DAY>.mbp-10.parquet` file for simulator compatibility.
@@ -776,6 +1327,8 @@ def download_day(
             day=day,
             overwrite=overwrite,
             datasets=("XNAS.ITCH", "EDGX.PITCH", "BATS.PITCH"),
+            symbols_per_chunk=mbp10_symbols_per_chunk,
+            chunk_minutes=mbp10_chunk_minutes,
         )
 
     print("Wrote:")
@@ -790,6 +1343,52 @@ def download_day(
         print(" ", mbp10_path)
 
 
+def _download_day_hive(
+    client: db.Historical,
+    *,
+    day: str,
+    symbols: Sequence[str],
+    root: Path,
+    start: datetime,
+    end: datetime,
+    tz: str,
+    download_trades: bool,
+    download_ohlcv1s: bool,
+    download_mbp10: bool,
+    overwrite: bool,
+    mbp10_symbols_per_chunk: int | None,
+    mbp10_chunk_minutes: int | None,
+) -> None:
+    # Same datasets as the flat layout (see download_day), written as per-symbol parts.
+    wrote: list[Path] = []
+    if download_trades:
+        wrote.append(
+            fetch_to_hive_incremental(
+                client, dataset="XNAS.BASIC", schema="trades", symbols=symbols, start=start, end=end,
+                root=root, day=day, overwrite=overwrite,
+            )
+        )
+    if download_ohlcv1s:
+        wrote.append(
+            fetch_to_hive_incremental(
+                client, dataset="BATS.PITCH", schema="ohlcv-1s", symbols=symbols, start=start, end=end,
+                root=root, day=day, overwrite=overwrite,
+            )
+        )
+        _ensure_derived_bars_hive(root, day, symbols=symbols, overwrite=overwrite, tz=tz)
+        wrote.extend(_hive_day_dir(root, schema, day) for schema in _HIVE_DERIVED_SCHEMA.values())
+    if download_mbp10:
+        wrote.append(
+            fetch_mbp10_multi_venue_hive(
+                client, symbols=symbols, start=start, end=end, root=root, day=day, overwrite=overwrite,
+                symbols_per_chunk=mbp10_symbols_per_chunk, chunk_minutes=mbp10_chunk_minutes,
+            )
+        )
+    print("Wrote:")
+    for p in wrote:
+        print(" ", p)
+
+
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Download a window of Databento data to Parquet (safe for small tests).")
     p.add_argument("--day", required=True, help="YYYY-MM-DD (session date, interpreted in America/New_York by default)")
@@ -811,11 +1410,36 @@ if __name__ == "__main__":
     p.add_argument("--skip-trades", action="store_true", help="Skip EQUS.MINI trades download")
     p.add_argument("--skip-ohlcv1s", action="store_true", help="Skip EQUS.MINI ohlcv-1s download (and 10s aggregation)")
     p.add_argument("--skip-mbp10", action="store_true", help="Skip XNAS.ITCH mbp-10 download (saves credits)")
+    p.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="flat",
+        help="flat: one file per schema/day (merging rewrites it). hive: schema=/day=/symbol=/part-*.parquet "
+        "(new symbols are new files, nothing is rewritten).",
+    )
+    p.add_argument(
+        "--mbp10-chunk-minutes",
+        type=int,
+        default=None,
+        help="Download mbp-10 in time chunks of this many minutes (checkpointed in <out-dir>/_chunks; a rerun "
+        "after a failure skips finished chunks). Default: one chunk per venue.",
+    )
+    p.add_argument(
+        "--mbp10-symbols-per-chunk",
+        type=int,
+        default=None,
+        help="Download mbp-10 in symbol groups of this size (checkpointed like --mbp10-chunk-minutes).",
+    )
     args = p.parse_args()
 
     window = SessionWindow(start_time=args.start_time, end_time=args.end_time, tz=args.tz)
     out = Path(args.out_dir)
-    if args.build_derived_only:
+    if args.build_derived_only and args.layout == "hive":
+        _ensure_derived_bars_hive(out, args.day, symbols=args.symbols, overwrite=args.overwrite, tz=window.tz)
+        print("Ensured derived bars exist for:", args.symbols)
+        for schema in _HIVE_DERIVED_SCHEMA.values():
+            print(" ", _hive_day_dir(out, schema, args.day))
+    elif args.build_derived_only:
         # Build from existing files; no API key required and no network calls.
         ohlcv1s_path = out / f"EQUS.MINI.{args.day}.ohlcv-1s.parquet"
         if not ohlcv1s_path.exists():
@@ -825,35 +1449,13 @@ if __name__ == "__main__":
         bars1m_path = out / f"EQUS.MINI.{args.day}.ohlcv-1m.parquet"
         bars5m_path = out / f"EQUS.MINI.{args.day}.ohlcv-5m.parquet"
 
-        existing_10s = _existing_symbols_in_parquet(bars10s_path) if bars10s_path.exists() else set()
-        missing_10s = [s for s in args.symbols if s not in existing_10s] if not args.overwrite else list(args.symbols)
-        existing_1m = _existing_symbols_in_parquet(bars1m_path) if bars1m_path.exists() else set()
-        missing_1m = [s for s in args.symbols if s not in existing_1m] if not args.overwrite else list(args.symbols)
-        existing_5m = _existing_symbols_in_parquet(bars5m_path) if bars5m_path.exists() else set()
-        missing_5m = [s for s in args.symbols if s not in existing_5m] if not args.overwrite else list(args.symbols)
-
-        with tempfile.TemporaryDirectory() as td:
-            td_path = Path(td)
-            if args.overwrite or not bars10s_path.exists():
-                build_10s_bars_from_ohlcv_1s(ohlcv1s_path, bars10s_path, tz=window.tz, symbols=args.symbols)
-            elif missing_10s:
-                tmp = td_path / f"{bars10s_path.stem}.new{bars10s_path.suffix}"
-                build_10s_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_10s)
-                _merge_parquets_concat([bars10s_path, tmp], bars10s_path)
-
-            if args.overwrite or not bars1m_path.exists():
-                build_1m_bars_from_ohlcv_1s(ohlcv1s_path, bars1m_path, tz=window.tz, symbols=args.symbols)
-            elif missing_1m:
-                tmp = td_path / f"{bars1m_path.stem}.new{bars1m_path.suffix}"
-                build_1m_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_1m)
-                _merge_parquets_concat([bars1m_path, tmp], bars1m_path)
-
-            if args.overwrite or not bars5m_path.exists():
-                build_5m_bars_from_ohlcv_1s(ohlcv1s_path, bars5m_path, tz=window.tz, symbols=args.symbols)
-            elif missing_5m:
-                tmp = td_path / f"{bars5m_path.stem}.new{bars5m_path.suffix}"
-                build_5m_bars_from_ohlcv_1s(ohlcv1s_path, tmp, tz=window.tz, symbols=missing_5m)
-                _merge_parquets_concat([bars5m_path, tmp], bars5m_path)
+        _ensure_derived_bars(
+            ohlcv1s_path,
+            {"10s": bars10s_path, "1min": bars1m_path, "5min": bars5m_path},
+            symbols=args.symbols,
+            overwrite=args.overwrite,
+            tz=window.tz,
+        )
 
         print("Ensured derived bars exist for:", args.symbols)
         print(" ", bars10s_path)
@@ -875,4 +1477,7 @@ if __name__ == "__main__":
             download_ohlcv1s=not args.skip_ohlcv1s,
             download_mbp10=not args.skip_mbp10,
             overwrite=args.overwrite,
+            layout=args.layout,
+            mbp10_symbols_per_chunk=args.mbp10_symbols_per_chunk,
+            mbp10_chunk_minutes=args.mbp10_chunk_minutes,
         )
@@ -0,0 +1,568 @@
+"""
+Data/download_many_databento.py
+
+Download many days x symbols x schemas concurrently, into the same files `download_day_databento.py` writes.
+
+`download_day` fetches one day at a time, one request after another (trades, ohlcv-1s, then each mbp-10 venue).
+Here every (day, schema, dataset) request is a job on a bounded thread pool:
+- per-dataset limits cap the requests in flight and space out request starts
+- failed requests are retried with exponential backoff (network errors, HTTP 429 and 5xx; other errors fail fast)
+- each job writes a staged parquet under `<out_dir>/_staging/`; once every job of a (day, schema) has finished, the
+  stage is merged into the day file (or hive parts) on the main thread, as the incremental download does, so no
+  two threads ever write the same file
+- progress is kept in `<out_dir>/_staging/progress.json`; rerunning after a crash, Ctrl-C or failed jobs skips
+  what is already staged and symbols already in the day files. A run that completes removes it.
+
+`LocalHistorical` stands in for `db.Historical` and serves canned parquet/DBN files from a directory, so a whole
+run can be exercised offline (`--local-source DIR`).
+
+Examples:
+  python Data/download_many_databento.py --days 2026-01-05 2026-01-06 --symbols MNTS ALMS
+  python Data/download_many_databento.py --pairs-csv Data/downloaded_pairs.all.csv --skip-trades --workers 8 \\
+    --dataset-limit XNAS.ITCH=4:0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import databento as db
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from download_day_databento import (  # Data/download_day_databento.py (sibling script)
+    DAY_SOURCES,
+    LAYOUTS,
+    MBP10_COLUMNS,
+    SessionWindow,
+    _ensure_derived_bars,
+    _ensure_derived_bars_hive,
+    _ensure_dir,
+    _existing_symbols_in_parquet,
+    _hive_symbols,
+    _merge_parquets_concat,
+    _merge_parquets_concat_columns,
+    _write_hive_parts,
+    fetch_to_parquet,
+)
+from data_manifest import update_manifest  # Data/data_manifest.py (sibling script)
+
+
+SCHEMAS = tuple(DAY_SOURCES)  # trades, ohlcv-1s, mbp-10
+DEFAULT_LIMIT = (2, 0.25)  # per dataset: (requests in flight, seconds between request starts)
+
+
+def _flat_path(out: Path, schema: str, day: str) -> Path:
+    # Simulator naming, see download_day.
+    if schema == "mbp-10":
+        return out / f"XNAS.ITCH.{day}.mbp-10.parquet"
+    return out / f"EQUS.MINI.{day}.{schema}.parquet"
+
+
+def _flat_derived(out: Path, day: str) -> Dict[str, Path]:
+    return {
+        "10s": out / f"EQUS.MINI.{day}.ohlcv-10s.parquet",
+        "1min": out / f"EQUS.MINI.{day}.ohlcv-1m.parquet",
+        "5min": out / f"EQUS.MINI.{day}.ohlcv-5m.parquet",
+    }
+
+
+@dataclass(frozen=True)
+class FetchJob:
+    day: str
+    schema: str
+    dataset: str
+    symbols: Tuple[str, ...]
+
+    @property
+    def key(self) -> str:
+        return f"{self.day}|{self.schema}|{self.dataset}"
+
+    def staged(self, staging: Path) -> Path:
+        return staging / f"{self.dataset}.{self.day}.{self.schema}.parquet"
+
+
+class DatasetLimiter:
+    """
+    Per-dataset request limits: at most N requests in flight, and request starts at least S seconds apart.
+    Datasets without an entry in `limits` get `default`.
+    """
+
+    def __init__(self, limits: Optional[Mapping[str, Tuple[int, float]]] = None, default: Tuple[int, float] = DEFAULT_LIMIT):
+        self._limits = dict(limits or {})
+        self._default = default
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, dataset: str) -> Iterator[None]:
+        n, gap = self._limits.get(dataset, self._default)
+        with self._lock:
+            sem = self._sems.setdefault(dataset, threading.Semaphore(max(1, int(n))))
+        with sem:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(dataset, now))
+                self._next_start[dataset] = start + float(gap)
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class ProgressState:
+    """
+    Run progress as JSON ({key: entry}), rewritten with tmp + rename on every update so it is never half-written.
+    Keys are FetchJob.key (staged fetches) and "<day>|<schema>" (merged groups).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = json.loads(path.read_text()) if path.exists() else {}
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._entries.get(key, {}))
+
+    def update(self, key: str, **fields: Any) -> None:
+        with self._lock:
+            self._entries[key] = {**self._entries.get(key, {}), **fields, "updated": time.time()}
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(self._entries, indent=2, sort_keys=True))
+            tmp.replace(self.path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self.path.unlink(missing_ok=True)
+
+
+def _retryable(exc: BaseException) -> bool:
+    # Databento HTTP errors carry `http_status`: retry rate limiting and server errors only.
+    status = getattr(exc, "http_status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # Connection resets, timeouts, truncated streams (requests' errors are OSErrors too).
+    return isinstance(exc, OSError)
+
+
+def _fetch_with_retries(
+    job: FetchJob,
+    client: Any,
+    *,
+    window: SessionWindow,
+    out_path: Path,
+    limiter: DatasetLimiter,
+    retries: int,
+    backoff_s: float,
+) -> Tuple[int, int]:
+    """
+    Fetch `job` into `out_path` (via `.tmp`, so a partial download is never mistaken for a staged one).
+    Returns (attempts, rows). An empty range (holiday, halted symbol) writes no file: rows is 0, nothing is staged.
+    """
+    start, end = window.bounds(job.day)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with limiter.slot(job.dataset):
+                fetch_to_parquet(
+                    client,
+                    dataset=job.dataset,
+                    schema=job.schema,
+                    symbols=list(job.symbols),
+                    start=start,
+                    end=end,
+                    out_path=tmp,
+                )
+            if not tmp.exists():
+                out_path.unlink(missing_ok=True)
+                return attempt, 0
+            tmp.replace(out_path)
+            return attempt, pq.ParquetFile(out_path).metadata.num_rows
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            if attempt > retries or not _retryable(e):
+                raise
+            delay = backoff_s * 2 ** (attempt - 1) * random.uniform(1.0, 1.25)
+            print(f"[{job.key}] attempt {attempt} failed ({type(e).__name__}: {e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def _missing_symbols(out: Path, schema: str, day: str, symbols: Sequence[str], *, layout: str, overwrite: bool) -> List[str]:
+    desired = list(dict.fromkeys(symbols))  # stable unique
+    if overwrite:
+        return desired
+    if layout == "hive":
+        have = _hive_symbols(out, schema, day)
+    else:
+        have = _existing_symbols_in_parquet(_flat_path(out, schema, day))
+    return [s for s in desired if s not in have]
+
+
+def _ensure_derived(out: Path, day: str, symbols: Sequence[str], *, layout: str, overwrite: bool, tz: str) -> None:
+    if layout == "hive":
+        _ensure_derived_bars_hive(out, day, symbols=symbols, overwrite=overwrite, tz=tz)
+        return
+    src = _flat_path(out, "ohlcv-1s", day)
+    if src.exists():
+        _ensure_derived_bars(src, _flat_derived(out, day), symbols=symbols, overwrite=overwrite, tz=tz)
+
+
+def _merge_group(
+    out: Path,
+    staging: Path,
+    jobs: Sequence[FetchJob],
+    *,
+    day_symbols: Sequence[str],
+    layout: str,
+    overwrite: bool,
+    tz: str,
+) -> bool:
+    """
+    Land one (day, schema)'s staged fetches: combine mbp-10 venues, then merge into the day file (flat) or add
+    per-symbol parts (hive). ohlcv-1s also (re)builds the derived bars. Staged files are removed afterwards.
+    Fetches that came back empty have nothing staged and are skipped; returns False if all of them were empty.
+    """
+    day, schema = jobs[0].day, jobs[0].schema
+    staged = [p for p in (job.staged(staging) for job in jobs) if p.exists()]
+    if not staged:
+        return False
+    if schema == "mbp-10":
+        new = staging / f"combined.{day}.mbp-10.parquet"
+        _merge_parquets_concat_columns(staged, new, columns=MBP10_COLUMNS)
+    else:
+        new = staged[0]
+
+    dataset = "+".join(dict.fromkeys(job.dataset for job in jobs))
+    if layout == "hive":
+        _write_hive_parts(new, out, schema, day, replace=overwrite, dataset=dataset)
+    else:
+        final = _flat_path(out, schema, day)
+        append = not overwrite and final.exists()
+        if not append:
+            new.replace(final)
+        elif schema == "mbp-10":
+            _merge_parquets_concat_columns([final, new], final, columns=MBP10_COLUMNS)
+        else:
+            _merge_parquets_concat([final, new], final)
+        update_manifest(out, [final], dataset=dataset, append=append)
+    if schema == "ohlcv-1s":
+        _ensure_derived(out, day, day_symbols, layout=layout, overwrite=overwrite, tz=tz)
+
+    for p in [*staged, new]:
+        p.unlink(missing_ok=True)
+    return True
+
+
+def download_many(
+    plan: Mapping[str, Sequence[str]],
+    *,
+    out_dir: str | Path = "./databento_out",
+    window: SessionWindow = SessionWindow(),
+    schemas: Sequence[str] = SCHEMAS,
+    overwrite: bool = False,
+    layout: str = "flat",
+    workers: int = 6,
+    limiter: Optional[DatasetLimiter] = None,
+    retries: int = 3,
+    backoff_s: float = 2.0,
+    client_factory: Callable[[], Any] = db.Historical,
+) -> List[str]:
+    """
+    Download `plan` ({day: symbols}) for `schemas` with up to `workers` concurrent requests.
+
+    `client_factory` is called once per worker thread (default `db.Historical`, which reads DATABENTO_API_KEY;
+    pass `LocalHistorical` for offline runs). Returns the keys of jobs that failed (empty when everything landed).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}")
+    unknown = [s for s in schemas if s not in DAY_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown schema(s) {unknown}; expected some of {SCHEMAS}")
+    out = Path(out_dir)
+    staging = out / "_staging"
+    _ensure_dir(staging)
+    state = ProgressState(staging / "progress.json")
+    limiter = limiter or DatasetLimiter()
+
+    groups: Dict[Tuple[str, str], List[FetchJob]] = {}
+    derived_only: List[str] = []
+    for day, symbols in sorted(plan.items()):
+        for schema in schemas:
+            missing = _missing_symbols(out, schema, day, symbols, layout=layout, overwrite=overwrite)
+            merged = state.get(f"{day}|{schema}")
+            if overwrite and merged.get("status") == "merged" and set(missing) <= set(merged.get("symbols", [])):
+                missing = []  # re-downloaded by the interrupted run this one resumes
+            if missing:
+                groups[(day, schema)] = [FetchJob(day, schema, ds, tuple(missing)) for ds in DAY_SOURCES[schema]]
+            elif schema == "ohlcv-1s":
+                derived_only.append(day)
+
+    t0 = time.perf_counter()
+    local = threading.local()
+
+    def run(job: FetchJob) -> Tuple[int, int]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = client_factory()
+        return _fetch_with_retries(
+            job,
+            client,
+            window=window,
+            out_path=job.staged(staging),
+            limiter=limiter,
+            retries=retries,
+            backoff_s=backoff_s,
+        )
+
+    failed: List[str] = []
+
+    def land(group: Tuple[str, str]) -> None:
+        day, schema = group
+        jobs = groups[group]
+        key = f"{day}|{schema}"
+        try:
+            landed = _merge_group(out, staging, jobs, day_symbols=plan[day], layout=layout, overwrite=overwrite, tz=window.tz)
+        except Exception as e:
+            # Staged fetches stay in place; the next run merges them without downloading again.
+            failed.append(key)
+            state.update(key, status="failed", symbols=list(jobs[0].symbols), error=f"{type(e).__name__}: {e}")
+            print(f"[{key}] merge FAILED: {type(e).__name__}: {e}")
+            return
+        state.update(key, status="merged", symbols=list(jobs[0].symbols))
+        if landed:
+            print(f"[{key}] merged {len(jobs[0].symbols)} symbol(s)")
+        else:
+            print(f"[{key}] no rows in range; nothing to merge")
+
+    resumed = fetched = 0
+    pending = {g: len(jobs) for g, jobs in groups.items()}
+    print(f"Plan: {sum(pending.values())} request(s) in {len(groups)} (day, schema) group(s), {workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {}
+        for g, jobs in groups.items():
+            for job in jobs:
+                st = state.get(job.key)
+                staged = st.get("rows") == 0 or job.staged(staging).exists()
+                if st.get("status") == "fetched" and st.get("symbols") == list(job.symbols) and staged:
+                    pending[g] -= 1
+                    resumed += 1
+                    continue
+                futures[pool.submit(run, job)] = (g, job)
+        for g, n in pending.items():
+            if n == 0:
+                land(g)
+        for fut in as_completed(futures):
+            g, job = futures[fut]
+            try:
+                attempts, rows = fut.result()
+            except Exception as e:
+                failed.append(job.key)
+                state.update(job.key, status="failed", symbols=list(job.symbols), error=f"{type(e).__name__}: {e}")
+                print(f"[{job.key}] FAILED: {type(e).__name__}: {e}")
+                continue
+            fetched += 1
+            state.update(job.key, status="fetched", symbols=list(job.symbols), rows=rows, attempts=attempts)
+            print(f"[{job.key}] {rows} rows ({attempts} attempt(s))")
+            pending[g] -= 1
+            if pending[g] == 0:
+                land(g)
+
+    for day in derived_only:
+        _ensure_derived(out, day, plan[day], layout=layout, overwrite=False, tz=window.tz)
+
+    print(
+        f"Done in {time.perf_counter() - t0:.1f}s: {fetched} fetched, {resumed} resumed from staging, "
+        f"{len(failed)} failed"
+    )
+    if failed:
+        print(f"Progress kept in {state.path}; rerun the same command to retry the failed requests.")
+    else:
+        state.clear()
+        try:
+            staging.rmdir()
+        except OSError:
+            pass  # unrelated files left in _staging
+    return failed
+
+
+# ---------------- Offline stand-in for db.Historical ----------------
+
+
+class _LocalStore:
+    def __init__(self, source: Any):
+        self._source = source
+
+    def to_parquet(self, path: str, **kwargs: Any) -> None:
+        if isinstance(self._source, pa.Table):
+            pq.write_table(self._source, path)
+        else:
+            self._source.to_parquet(path, **kwargs)  # DBNStore
+
+
+class LocalHistorical:
+    """
+    Stand-in for `db.Historical` covering what `fetch_to_parquet` uses (`timeseries.get_range(...).to_parquet(...)`).
+
+    Requests are served from `source_dir`: `<dataset>.<day>.<schema>.parquet` (filtered to the requested symbols
+    and [start, end) on ts_event), `<dataset>.<day>.<schema>.dbn.zst` (served whole) or, failing both, the day files
+    `download_day` writes. `day` is the request start's date in `tz`; `latency_s` delays every request. Requests are
+    recorded in `requests`.
+    """
+
+    def __init__(self, source_dir: str | Path, *, tz: str = "America/New_York", latency_s: float = 0.0):
+        self.source_dir = Path(source_dir)
+        self.tz = tz
+        self.latency_s = latency_s
+        self.requests: List[Dict[str, Any]] = []
+        self.timeseries = self
+
+    def get_range(
+        self,
+        *,
+        dataset: str,
+        schema: str,
+        symbols: Sequence[str],
+        start: datetime,
+        end: datetime,
+        **kwargs: Any,
+    ) -> _LocalStore:
+        day = start.astimezone(ZoneInfo(self.tz)).date().isoformat()
+        self.requests.append({"dataset": dataset, "schema": schema, "symbols": list(symbols), "day": day})
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        dbn = self.source_dir / f"{dataset}.{day}.{schema}.dbn.zst"
+        if dbn.exists():
+            return _LocalStore(db.DBNStore.from_file(dbn))
+        for p in (self.source_dir / f"{dataset}.{day}.{schema}.parquet", _flat_path(self.source_dir, schema, day)):
+            if p.exists():
+                break
+        else:
+            raise LookupError(f"No canned {dataset}/{schema} data for {day} in {self.source_dir}")
+
+        t = pq.read_table(p)
+        t = t.filter(pc.is_in(pc.cast(t["symbol"], pa.string()), value_set=pa.array(list(symbols), pa.string())))
+        ts = t["ts_event"] if "ts_event" in t.column_names else None
+        if ts is not None and pa.types.is_timestamp(ts.type):
+            lo, hi = pa.scalar(start).cast(ts.type), pa.scalar(end).cast(ts.type)
+        elif ts is not None and pa.types.is_integer(ts.type):  # epoch ns (e.g. mbp-10 written without pretty_ts)
+            lo, hi = pa.scalar(_epoch_ns(start), ts.type), pa.scalar(_epoch_ns(end), ts.type)
+        else:
+            return _LocalStore(t)
+        return _LocalStore(t.filter(pc.and_(pc.greater_equal(ts, lo), pc.less(ts, hi))))
+
+
+def _epoch_ns(dt: datetime) -> int:
+    return (dt - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1) * 1000
+
+
+def _read_pairs_csv(path: Path) -> Dict[str, List[str]]:
+    # Same format as Data/list_downloaded.py --out-pairs-csv (columns: day,symbol).
+    by_day: Dict[str, set[str]] = defaultdict(set)
+    with path.open(newline="") as f:
+        r = csv.DictReader(f)
+        if not r.fieldnames or "day" not in r.fieldnames or "symbol" not in r.fieldnames:
+            raise ValueError(f"Bad CSV header in {path}. Expected columns: day,symbol")
+        for row in r:
+            day = (row.get("day") or "").strip()
+            sym = (row.get("symbol") or "").strip()
+            if day and sym:
+                by_day[day].add(sym)
+    return {day: sorted(syms) for day, syms in by_day.items()}
+
+
+def _parse_limit(spec: str) -> Tuple[str, Tuple[int, float]]:
+    # DATASET=N or DATASET=N:SECONDS
+    try:
+        dataset, rest = spec.split("=", 1)
+        n, _, gap = rest.partition(":")
+        return dataset.strip(), (int(n), float(gap) if gap else DEFAULT_LIMIT[1])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bad --dataset-limit {spec!r} (expected DATASET=N or DATASET=N:SECONDS)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Download many days/symbols of Databento data concurrently (resumable).")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--days", nargs="+", help="YYYY-MM-DD session dates (each gets all --symbols)")
+    src.add_argument("--pairs-csv", help="CSV with day,symbol columns (e.g. Data/downloaded_pairs.all.csv)")
+    p.add_argument("--symbols", nargs="+", help="Raw symbols for --days")
+    p.add_argument("--out-dir", default="./databento_out")
+    p.add_argument("--tz", default="America/New_York")
+    p.add_argument("--start-time", default="09:30:00", help="HH:MM:SS in --tz")
+    p.add_argument("--end-time", default="09:33:00", help="HH:MM:SS in --tz")
+    p.add_argument("--overwrite", action="store_true", help="Re-download the given symbols even if already present")
+    p.add_argument("--skip-trades", action="store_true")
+    p.add_argument("--skip-ohlcv1s", action="store_true")
+    p.add_argument("--skip-mbp10", action="store_true")
+    p.add_argument("--layout", choices=LAYOUTS, default="flat", help="Output layout (see download_day_databento.py)")
+    p.add_argument("--workers", type=int, default=6, help="Concurrent requests overall")
+    p.add_argument(
+        "--dataset-limit",
+        action="append",
+        default=[],
+        type=_parse_limit,
+        metavar="DATASET=N[:SECONDS]",
+        help=f"Per-dataset limit: N requests in flight, request starts SECONDS apart (default {DEFAULT_LIMIT[0]}:{DEFAULT_LIMIT[1]})",
+    )
+    p.add_argument("--retries", type=int, default=3, help="Retries per request (network errors, HTTP 429/5xx)")
+    p.add_argument("--backoff", type=float, default=2.0, help="First retry delay in seconds (doubles each retry)")
+    p.add_argument("--local-source", default="", help="Serve requests from canned files in this directory (offline)")
+    args = p.parse_args(argv)
+
+    if args.days and not args.symbols:
+        p.error("--days needs --symbols")
+    plan = {d: args.symbols for d in args.days} if args.days else _read_pairs_csv(Path(args.pairs_csv))
+    schemas = [
+        s
+        for s, skip in (("trades", args.skip_trades), ("ohlcv-1s", args.skip_ohlcv1s), ("mbp-10", args.skip_mbp10))
+        if not skip
+    ]
+    if args.local_source:
+        local_dir = Path(args.local_source)
+        client_factory: Callable[[], Any] = lambda: LocalHistorical(local_dir, tz=args.tz)
+    else:
+        if not os.environ.get("DATABENTO_API_KEY"):
+            raise RuntimeError(
+                "DATABENTO_API_KEY is not set. "
+                "Set it in your shell before running, e.g. `export DATABENTO_API_KEY=...`"
+            )
+        client_factory = db.Historical
+
+    failed = download_many(
+        plan,
+        out_dir=args.out_dir,
+        window=SessionWindow(start_time=args.start_time, end_time=args.end_time, tz=args.tz),
+        schemas=schemas,
+        overwrite=args.overwrite,
+        layout=args.layout,
+        workers=args.workers,
+        limiter=DatasetLimiter(dict(args.dataset_limit)),
+        retries=args.retries,
+        backoff_s=args.backoff,
+        client_factory=client_factory,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
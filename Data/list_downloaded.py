@@ -8,6 +8,10 @@ It scans a databento output directory (e.g. databento_out/) and produces:
 - list of symbols per day (best-effort from OHLCV parquet, fallback to trades parquet)
 - flags indicating which core files exist per day (trades / mbp-10 / ohlcv-1s / derived bars)
 
+Days come from file names and hive day directories (`schema=*/day=*`, download_day_databento.py --layout hive).
+Symbols come from the directory's `_manifest.json` (Data/data_manifest.py) for files whose entry is still valid;
+files without a valid entry are opened as before.
+
 This reuses the Simulator's parquet scanning logic but does NOT run the simulator.
 """
 
@@ -24,6 +28,8 @@ from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from data_manifest import load_manifest  # Data/data_manifest.py (sibling script)
+
 
 DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
@@ -50,7 +56,7 @@ class DayInventory:
 
 def _discover_days_from_filenames(data_dir: Path) -> List[str]:
     """
-    Collect days that appear in any of the known naming patterns.
+    Collect days that appear in any of the known naming patterns (flat files or hive day directories).
     """
     days: Set[str] = set()
 
@@ -68,6 +74,10 @@ def _discover_days_from_filenames(data_dir: Path) -> List[str]:
             day = parts[2]
             if DAY_RE.match(day):
                 days.add(day)
+    for p in data_dir.glob("schema=*/day=*"):
+        day = p.name[len("day="):]
+        if DAY_RE.match(day):
+            days.add(day)
 
     return sorted(days)
 
@@ -116,22 +126,44 @@ def _pick_best_ohlcv_file(data_dir: Path, day: str) -> Optional[Path]:
     return None
 
 
-def _symbols_for_day(data_dir: Path, day: str) -> List[str]:
+def _hive_parts(data_dir: Path, schema: str, day: str) -> List[Path]:
+    return sorted((data_dir / f"schema={schema}" / f"day={day}").glob("symbol=*/part-*.parquet"))
+
+
+def _manifest_symbols(entry: Dict) -> List[str]:
+    return sorted({s.strip() for s in entry.get("symbols", {}) if s.strip()})
+
+
+def _symbols_of(data_dir: Path, paths: Sequence[Path], manifest: Dict[str, Dict]) -> List[str]:
+    out: Set[str] = set()
+    for p in paths:
+        entry = manifest.get(p.relative_to(data_dir).as_posix())
+        out.update(_manifest_symbols(entry) if entry is not None else _symbols_from_parquet(p, symbol_col="symbol"))
+    return sorted(out)
+
+
+def _symbols_for_day(data_dir: Path, day: str, manifest: Optional[Dict[str, Dict]] = None) -> List[str]:
     """
     Prefer OHLCV for symbol list (usually smaller than trades and already used by the Simulator).
-    Fallback to trades if OHLCV is missing.
+    Fallback to trades if OHLCV is missing, then to the hive layout's parts in the same order.
+    Valid manifest entries stand in for opening the parquet.
     """
+    manifest = manifest or {}
     ohl = _pick_best_ohlcv_file(data_dir, day)
-    if ohl is not None:
-        return _symbols_from_parquet(ohl, symbol_col="symbol")
     trd = data_dir / f"EQUS.MINI.{day}.trades.parquet"
-    if trd.exists():
-        return _symbols_from_parquet(trd, symbol_col="symbol")
+    for path in (ohl, trd if trd.exists() else None):
+        if path is not None:
+            return _symbols_of(data_dir, [path], manifest)
+    for schema in ("ohlcv-1s", "ohlcv-10s", "ohlcv-1m", "ohlcv-5m", "trades"):
+        parts = _hive_parts(data_dir, schema, day)
+        if parts:
+            return _symbols_of(data_dir, parts, manifest)
     return []
 
 
 def scan_inventory(data_dir: Path) -> List[DayInventory]:
     data_dir = Path(data_dir)
+    manifest = load_manifest(data_dir)
     days = _discover_days_from_filenames(data_dir)
     out: List[DayInventory] = []
     for day in days:
@@ -142,17 +174,20 @@ def scan_inventory(data_dir: Path) -> List[DayInventory]:
         o1m = data_dir / f"EQUS.MINI.{day}.ohlcv-1m.parquet"
         o5m = data_dir / f"EQUS.MINI.{day}.ohlcv-5m.parquet"
 
-        syms = _symbols_for_day(data_dir, day)
+        def has(flat: Path, schema: str) -> bool:
+            return flat.exists() or bool(_hive_parts(data_dir, schema, day))
+
+        syms = _symbols_for_day(data_dir, day, manifest)
         out.append(
             DayInventory(
                 day=day,
                 symbols=syms,
-                has_trades=trades.exists(),
-                has_mbp10=mbp10.exists(),
-                has_ohlcv_1s=o1s.exists(),
-                has_ohlcv_10s=o10s.exists(),
-                has_ohlcv_1m=o1m.exists(),
-                has_ohlcv_5m=o5m.exists(),
+                has_trades=has(trades, "trades"),
+                has_mbp10=has(mbp10, "mbp-10"),
+                has_ohlcv_1s=has(o1s, "ohlcv-1s"),
+                has_ohlcv_10s=has(o10s, "ohlcv-10s"),
+                has_ohlcv_1m=has(o1m, "ohlcv-1m"),
+                has_ohlcv_5m=has(o5m, "ohlcv-5m"),
                 trades_path=str(trades),
                 mbp10_path=str(mbp10),
                 ohlcv_1s_path=str(o1s),
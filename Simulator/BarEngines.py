@@ -0,0 +1,163 @@
+"""
+Simulator/BarEngines.py
+
+Activity-based bars built from the trade tape instead of the clock:
+- "<N>t": N-tick bars (every N prints)
+- "<N>v": N-share volume bars (a bar closes once its volume reaches N; the crossing print is included)
+- "<N>r": N-cent range bars (a bar closes once high - low reaches N cents; the crossing print is included)
+
+Bar boundaries come from an index grid (tick), a cumulative-volume `searchsorted` per bar (volume) or running
+extrema over doubling chunks (range); OHLCV per bar is then a segment reduction (`reduceat`), as for time bars.
+
+Each bar keeps the real time of its first and last print (t0 / te). Charts need strictly increasing whole-second
+times, so every bar also gets a display slot: the second of its first print, pushed to one second after the previous
+bar's slot when several bars start within the same second. The browser applies the same rule to live bars.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+_SPEC_RE = re.compile(r"(\d+)(t|v|r)")
+_SEC = 1_000_000_000
+
+
+def parse_bar_spec(tf: str) -> Optional[Tuple[str, int]]:
+    """
+    ("t" | "v" | "r", N) for a trade-bar timeframe string, None for anything else (e.g. time bars).
+    """
+    m = _SPEC_RE.fullmatch(str(tf).strip())
+    if not m:
+        return None
+    n = int(m.group(1))
+    if n <= 0:
+        raise ValueError("bar size must be > 0")
+    return m.group(2), n
+
+
+@dataclass(frozen=True)
+class TradeBars:
+    kind: str
+    size: int
+    i0: np.ndarray  # first print index per bar
+    i1: np.ndarray  # one past the last print index
+    slot: List[int]  # display time (ns, whole seconds, strictly increasing)
+    t0: List[int]  # first print ts (ns)
+    te: List[int]  # last print ts (ns)
+    o: List[Any]
+    h: List[Any]
+    l: List[Any]
+    c: List[Any]
+    v: List[int]
+
+
+def _as_float(px: np.ndarray, price_scale: int) -> np.ndarray:
+    # Databento can emit float prices (double) or legacy fixed-int prices.
+    if np.issubdtype(px.dtype, np.integer):
+        return px.astype(np.float64) / float(price_scale)
+    return px.astype(np.float64)
+
+
+def _starts(kind: str, size: int, px_f: np.ndarray, sz: np.ndarray) -> np.ndarray:
+    n = px_f.size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if kind == "t":
+        return np.arange(0, n, size, dtype=np.int64)
+    out = [0]
+    s = 0
+    if kind == "v":
+        cum = np.cumsum(sz, dtype=np.int64)
+        while True:
+            base = int(cum[s - 1]) if s else 0
+            s = int(np.searchsorted(cum, base + size, side="left")) + 1
+            if s >= n:
+                break
+            out.append(s)
+        return np.asarray(out, dtype=np.int64)
+    # range: first print where the running high - low reaches the range, searched in doubling chunks
+    rng = size / 100.0 - 1e-9
+    w = 64
+    while s < n:
+        seg = px_f[s : s + w]
+        hit = np.flatnonzero(np.maximum.accumulate(seg) - np.minimum.accumulate(seg) >= rng)
+        if hit.size:
+            s = s + int(hit[0]) + 1
+            if s < n:
+                out.append(s)
+            w = 64
+        elif s + w >= n:
+            break
+        else:
+            w *= 2
+    return np.asarray(out, dtype=np.int64)
+
+
+def _slots(t0: List[int]) -> List[int]:
+    out: List[int] = []
+    prev = None
+    for t in t0:
+        s = (int(t) // _SEC) * _SEC
+        if prev is not None and s <= prev:
+            s = prev + _SEC
+        out.append(s)
+        prev = s
+    return out
+
+
+def build_trade_bars(
+    kind: str, size: int, trd_ts: List[int], trd_px: List[Any], trd_sz: List[int], price_scale: int
+) -> TradeBars:
+    """
+    Tick / volume / range bars over the day's prints (time order). Prices keep their raw type.
+    """
+    if kind not in ("t", "v", "r"):
+        raise ValueError("bar kind must be t (tick), v (volume) or r (range)")
+    ts = np.asarray(trd_ts, dtype=np.int64)
+    px = np.asarray(trd_px)
+    sz = np.asarray(trd_sz, dtype=np.int64)
+    starts = _starts(kind, int(size), _as_float(px, price_scale) if px.size else px, sz)
+    if starts.size == 0:
+        e = np.zeros(0, dtype=np.int64)
+        return TradeBars(kind, int(size), e, e, [], [], [], [], [], [], [], [])
+    ends = np.r_[starts[1:], ts.size]
+    t0 = ts[starts].tolist()
+    return TradeBars(
+        kind=kind,
+        size=int(size),
+        i0=starts,
+        i1=ends,
+        slot=_slots(t0),
+        t0=t0,
+        te=ts[ends - 1].tolist(),
+        o=px[starts].tolist(),
+        h=np.maximum.reduceat(px, starts).tolist(),
+        l=np.minimum.reduceat(px, starts).tolist(),
+        c=px[ends - 1].tolist(),
+        v=np.add.reduceat(sz, starts).tolist(),
+    )
+
+
+def partial_bar(bars: TradeBars, k: int, j: int, trd_ts: List[int], trd_px: List[Any], trd_sz: List[int]) -> Dict[str, Any]:
+    """
+    Bar `k` as of the first `j` prints (for a playhead inside the bar): raw prices, like TradeBars fields.
+    """
+    i0 = int(bars.i0[k])
+    j = max(i0 + 1, min(int(j), int(bars.i1[k])))
+    seg = trd_px[i0:j]
+    return {
+        "t": bars.slot[k],
+        "t0": bars.t0[k],
+        "te": int(trd_ts[j - 1]),
+        "o": seg[0],
+        "h": max(seg),
+        "l": min(seg),
+        "c": seg[-1],
+        "v": int(sum(trd_sz[i0:j])),
+        "n": j - i0,
+    }
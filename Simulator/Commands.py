@@ -236,6 +236,10 @@ READ_VARS = {
     "lo",
     "open",
     "pcl",
+    "pdh",
+    "pdl",
+    "pmh",
+    "pml",
     "l2bid",
     "l2ask",
     "buypower",
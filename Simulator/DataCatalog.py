@@ -7,16 +7,41 @@ Scan a Databento output directory (parquet) and build a list of practice "sessio
 - earliest bar timestamp for that symbol/day (from OHLCV parquet)
 
 This is used by the Simulator UI to populate a dropdown that can quickly load replay days.
+
+Scans can be backed by an on-disk index (SQLite) keyed by OHLCV file path + mtime + size: only new or
+changed files are re-read, so repeated scans of a large archive cost a directory listing and a few stats.
+
+`CatalogWatcher` keeps that index current while the downloader writes into the same directory and
+reports per-day catalog deltas (added / removed / updated sessions) to subscribers.
+
+Activity enrichment (`enrich_activity` / `query_activity`) stores per-symbol-day time buckets (trade count,
+volume, range, spread) in the same index so drill windows can be ranked without opening any parquet.
+
+`prior_day_summary` finds a symbol's previous indexed trading day and returns its reference levels (close,
+regular-session high/low, premarket range), cached per symbol-day in the index.
+
+Inputs are either flat per-day files (`EQUS.MINI.<day>.<schema>.parquet`, `XNAS.ITCH.<day>.mbp-10.parquet`) or the
+downloader's optional hive layout (`schema=<schema>/day=<day>/symbol=<SYM>/part-*.parquet`); see `day_source`.
+
+Per-symbol stats come from the downloader's `_manifest.json` (Data/data_manifest.py) when every file of a source
+has a valid entry there, so a cold scan need not open the OHLCV parquet at all.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, time as dtime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
 try:
@@ -24,8 +49,173 @@ try:
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
+try:
+    # Optional: native filesystem events (inotify/FSEvents) wake the watcher early; polling works without it.
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None  # type: ignore
+
 
 _TF_PREF: Tuple[str, ...] = ("1s", "10s", "1m", "5m")
+_FIXED_PRICE_SCALE = 1_000_000_000  # legacy Databento fixed-int prices (same as Simulator.FIXED_PRICE_SCALE)
+_MANIFEST_NAME = "_manifest.json"  # written by Data/data_manifest.py
+_MANIFEST_VERSION = 1
+
+# Parallel day scans: Arrow releases the GIL while decoding parquet, so threads scale with cores/disks.
+SCAN_WORKERS_DEFAULT = min(8, os.cpu_count() or 1)
+
+# Bump when the per-file stats change shape; older index files are rebuilt from scratch.
+_INDEX_SCHEMA_VERSION = 2
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    data_dir TEXT NOT NULL,
+    day TEXT NOT NULL,
+    tf TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_data_dir ON files(data_dir);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    start_ts_ns INTEGER NOT NULL,
+    end_ts_ns INTEGER NOT NULL,
+    bars INTEGER NOT NULL,
+    volume INTEGER,
+    high REAL,
+    low REAL,
+    PRIMARY KEY (path, symbol)
+);
+CREATE TABLE IF NOT EXISTS activity_days (
+    data_dir TEXT NOT NULL,
+    day TEXT NOT NULL,
+    bucket_s INTEGER NOT NULL,
+    sig TEXT NOT NULL,  -- (mtime, size) of the mbp-10 / trades / OHLCV inputs it was built from
+    PRIMARY KEY (data_dir, day, bucket_s)
+);
+CREATE TABLE IF NOT EXISTS activity (
+    data_dir TEXT NOT NULL,
+    day TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    bucket_s INTEGER NOT NULL,
+    start_ts_ns INTEGER NOT NULL,
+    trades INTEGER NOT NULL,
+    volume INTEGER NOT NULL,
+    high REAL,
+    low REAL,
+    range REAL,
+    range_pct REAL,
+    spread REAL,
+    spread_bps REAL,
+    PRIMARY KEY (data_dir, day, symbol, bucket_s, start_ts_ns)
+);
+CREATE INDEX IF NOT EXISTS activity_bucket_range ON activity(bucket_s, range_pct);
+CREATE INDEX IF NOT EXISTS activity_bucket_volume ON activity(bucket_s, volume);
+CREATE INDEX IF NOT EXISTS activity_bucket_trades ON activity(bucket_s, trades);
+CREATE TABLE IF NOT EXISTS day_summary (
+    path TEXT NOT NULL,  -- OHLCV parquet it was read from
+    symbol TEXT NOT NULL,
+    tz_name TEXT NOT NULL,
+    sig TEXT NOT NULL,  -- (mtime, size) of that parquet
+    close REAL,
+    close_ts_ns INTEGER,
+    high REAL,
+    low REAL,
+    pm_high REAL,
+    pm_low REAL,
+    PRIMARY KEY (path, symbol, tz_name)
+);
+"""
+
+ACTIVITY_BUCKET_S_DEFAULT = 300
+ACTIVITY_METRICS: Tuple[str, ...] = ("range_pct", "range", "volume", "trades", "spread", "spread_bps")
+
+
+# ---------------- Input layouts ----------------
+#
+# Flat: one file per (schema, day) holding every symbol. Hive (downloader `--layout hive`):
+#   <data_dir>/schema=<schema>/day=<YYYY-MM-DD>/symbol=<SYM>/part-*.parquet
+# where parts keep the flat files' columns (symbol included) and a new symbol is a new directory (nothing rewritten).
+# A "source" below is either a flat file or a `schema=<schema>/day=<day>` directory.
+
+_HIVE_SYMBOL_PARTITIONING = ds.partitioning(pa.schema([("symbol", pa.string())]), flavor="hive")
+
+
+def flat_name(schema: str, day: str) -> str:
+    return f"XNAS.ITCH.{day}.mbp-10.parquet" if schema == "mbp-10" else f"EQUS.MINI.{day}.{schema}.parquet"
+
+
+def hive_day_dir(data_dir: Path, schema: str, day: str) -> Path:
+    return Path(data_dir) / f"schema={schema}" / f"day={day}"
+
+
+def _hive_parts(day_dir: Path) -> List[Path]:
+    return sorted(day_dir.glob("symbol=*/part-*.parquet"))
+
+
+def day_source(data_dir: Path, schema: str, day: str) -> Optional[Path]:
+    """
+    Where (schema, day) lives in `data_dir`: the flat file when present, else the hive day directory when it has
+    any part, else None. Flat wins so a directory mid-migration keeps reading what it read before.
+    """
+    flat = Path(data_dir) / flat_name(schema, day)
+    if flat.exists():
+        return flat
+    hive = hive_day_dir(data_dir, schema, day)
+    if hive.is_dir() and _hive_parts(hive):
+        return hive
+    return None
+
+
+def source_files(src: Path) -> List[Path]:
+    return _hive_parts(src) if src.is_dir() else [src]
+
+
+def source_names(src: Path) -> List[str]:
+    files = source_files(src)
+    if not files:
+        raise FileNotFoundError(f"No parquet parts under {src}")
+    return pq.read_schema(files[0]).names
+
+
+def source_sig(src: Path) -> Tuple[int, int]:
+    """
+    (mtime_ns, size) of a source; for a hive directory the newest part's mtime and the total size.
+    """
+    if not src.is_dir():
+        st = src.stat()
+        return int(st.st_mtime_ns), int(st.st_size)
+    mtime = size = 0
+    for p in _hive_parts(src):
+        st = p.stat()
+        mtime, size = max(mtime, int(st.st_mtime_ns)), size + int(st.st_size)
+    return mtime, size
+
+
+def read_source(src: Path, columns: List[str], symbols: Optional[Iterable[str]] = None) -> pa.Table:
+    """
+    Read `columns` of a source (rows of `symbols` only, when given), in file order.
+
+    Hive directories go through `pyarrow.dataset`: the symbol partition prunes whole directories before any
+    parquet is opened, and parts are read in path order (part-00000, part-00001, ...).
+    """
+    wanted = sorted(set(symbols)) if symbols is not None else None
+    if not src.is_dir():
+        tab = pq.ParquetFile(src).read(columns=columns)
+        if wanted is not None:
+            tab = tab.filter(pc.is_in(tab.column("symbol").cast(pa.string()), value_set=pa.array(wanted, pa.string())))
+        return tab
+    dataset = ds.dataset(src, format="parquet", partitioning=_HIVE_SYMBOL_PARTITIONING)
+    flt = ds.field("symbol").isin(wanted) if wanted is not None else None
+    frags = sorted(dataset.get_fragments(filter=flt), key=lambda f: f.path)
+    if not frags:
+        return dataset.schema.empty_table().select(columns)
+    return pa.concat_tables([f.to_table(columns=columns, schema=dataset.schema) for f in frags])
 
 
 @dataclass(frozen=True)
@@ -35,6 +225,21 @@ class CatalogItem:
     start_ts_ns: int  # UTC epoch ns
     start_et: str  # YYYY-MM-DD HH:MM:SS (ET)
     label: str  # "SYMB YYYY-MM-DD H:MM"
+    end_ts_ns: Optional[int] = None  # last bar (UTC epoch ns)
+    bars: Optional[int] = None  # OHLCV rows for the symbol/day (at the scanned tf)
+    volume: Optional[int] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SymbolStats:
+    start_ts_ns: int
+    end_ts_ns: int
+    bars: int
+    volume: Optional[int]
+    high: Optional[float]
+    low: Optional[float]
 
 
 def _ts_array_to_ns(ts_arr: pa.Array) -> "pa.lib.Array":
@@ -73,97 +278,910 @@ def _format_et(ts_ns: int, tz_name: str) -> Tuple[str, str]:
     return full, short
 
 
-def _earliest_ts_by_symbol(
-    ohl_path: Path, ts_col: str, symbol_col: str = "symbol"
-) -> Dict[str, int]:
-    pf = pq.ParquetFile(ohl_path)
-    out: Dict[str, int] = {}
-    for batch in pf.iter_batches(columns=[ts_col, symbol_col], batch_size=1 << 16):
-        ts_arr = batch.column(0)
-        sym_arr = batch.column(1)
-        # Normalize types
-        ts_ns_arr = _ts_array_to_ns(ts_arr)
-        # Symbols: ensure strings (handles dictionary encoding)
-        syms = sym_arr.cast(pa.string()).to_pylist()
-        ts_ns = ts_ns_arr.to_pylist()
-        for sym, ns in zip(syms, ts_ns):
-            if sym is None or ns is None:
-                continue
-            sym_s = str(sym)
-            n = int(ns)
-            prev = out.get(sym_s)
-            if prev is None or n < prev:
-                out[sym_s] = n
+def _symbol_stats(ohl_path: Path, ts_col: str, symbol_col: str = "symbol") -> Dict[str, SymbolStats]:
+    """
+    Per-symbol first/last bar ts, bar count, volume and high/low of one OHLCV parquet.
+    One Arrow group_by over the needed columns; no per-row Python.
+    """
+    names = set(source_names(ohl_path))
+    cols = [ts_col, symbol_col] + [c for c in ("high", "low", "volume") if c in names]
+    tab = read_source(ohl_path, cols)
+    tab = tab.set_column(0, ts_col, _ts_array_to_ns(tab.column(ts_col).combine_chunks()))
+    tab = tab.set_column(1, symbol_col, tab.column(symbol_col).cast(pa.string()))
+    tab = tab.filter(pc.and_(pc.is_valid(tab[ts_col]), pc.is_valid(tab[symbol_col])))
+
+    aggs: List[Tuple[str, str]] = [(ts_col, "min"), (ts_col, "max"), (ts_col, "count")]
+    if "volume" in names:
+        aggs.append(("volume", "sum"))
+    if "high" in names:
+        aggs.append(("high", "max"))
+    if "low" in names:
+        aggs.append(("low", "min"))
+    g = tab.group_by(symbol_col).aggregate(aggs).to_pydict()
+
+    def px(col: str, i: int) -> Optional[float]:
+        vals = g.get(col)
+        if vals is None or vals[i] is None:
+            return None
+        v = vals[i]
+        # Databento can emit float prices (double) or legacy fixed-int prices.
+        return (float(v) / _FIXED_PRICE_SCALE) if isinstance(v, int) else float(v)
+
+    out: Dict[str, SymbolStats] = {}
+    for i, sym in enumerate(g[symbol_col]):
+        vol = g.get("volume_sum")
+        out[str(sym)] = SymbolStats(
+            start_ts_ns=int(g[f"{ts_col}_min"][i]),
+            end_ts_ns=int(g[f"{ts_col}_max"][i]),
+            bars=int(g[f"{ts_col}_count"][i]),
+            volume=(int(vol[i]) if vol is not None and vol[i] is not None else None),
+            high=px("high_max", i),
+            low=px("low_min", i),
+        )
     return out
 
 
-def _pick_best_ohlcv_file(data_dir: Path, day: str) -> Optional[Tuple[Path, str]]:
+def best_ohlcv_source(data_dir: Path, day: str) -> Optional[Tuple[Path, str]]:
+    """
+    (source, tf) of the highest-resolution downloaded OHLCV for `day` (1s, then 10s / 1m / 5m), or None.
+    """
     for tf in _TF_PREF:
-        p = data_dir / f"EQUS.MINI.{day}.ohlcv-{tf}.parquet"
-        if p.exists():
+        p = day_source(data_dir, f"ohlcv-{tf}", day)
+        if p is not None:
             return p, tf
     return None
 
 
-def scan_catalog(data_dir: Path, tz_name: str = "America/New_York") -> List[CatalogItem]:
+def _read_ohlcv_stats(ohl_path: Path) -> Optional[Dict[str, SymbolStats]]:
     """
-    Build a list of CatalogItem entries from the directory.
-    We group by day (derived from OHLCV filenames), then compute min ts per symbol for that day.
+    Per-symbol stats of one OHLCV parquet (None if the file is unreadable / has no ts column).
     """
-    data_dir = Path(data_dir)
-    if not data_dir.exists():
-        return []
+    try:
+        schema_names = set(source_names(ohl_path))
+        ts_col = "ts_event" if "ts_event" in schema_names else ("ts" if "ts" in schema_names else None)
+        if ts_col is None:
+            return None
+        return _symbol_stats(ohl_path, ts_col=ts_col, symbol_col="symbol")
+    except Exception:
+        return None
 
-    # Discover days from OHLCV filenames.
-    days: List[str] = []
-    for p in data_dir.glob("EQUS.MINI.*.ohlcv-*.parquet"):
-        name = p.name
-        # EQUS.MINI.YYYY-MM-DD.ohlcv-<tf>.parquet
-        parts = name.split(".")
-        if len(parts) < 4:
+
+def _load_manifest(data_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Entries of `data_dir`'s manifest whose file still has the recorded size and mtime (format: Data/data_manifest.py).
+    """
+    try:
+        m = json.loads((Path(data_dir) / _MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(m, dict) or m.get("version") != _MANIFEST_VERSION or not isinstance(m.get("files"), dict):
+        return {}
+    out: Dict[str, Dict[str, Any]] = {}
+    for key, entry in m["files"].items():
+        try:
+            st = (Path(data_dir) / key).stat()
+        except OSError:
             continue
-        day = parts[2]
-        if len(day) == 10 and day[4] == "-" and day[7] == "-":
-            days.append(day)
+        if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+            out[key] = entry
+    return out
 
-    days = sorted(set(days))
 
-    items: List[CatalogItem] = []
-    for day in days:
+def _manifest_root(src: Path) -> Path:
+    return src.parents[1] if src.is_dir() else src.parent
+
+
+def _manifest_stats(src: Path, entries: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, SymbolStats]]:
+    """
+    `_read_ohlcv_stats` from manifest entries; None unless every file of the source has one.
+    Hive parts of the same symbol are combined.
+    """
+    root = _manifest_root(src)
+    found = [entries.get(p.relative_to(root).as_posix()) for p in source_files(src)]
+    if not found or any(e is None or not e.get("symbols") for e in found):
+        return None
+    acc: Dict[str, Dict[str, Any]] = {}
+    for e in found:
+        for sym, s in e["symbols"].items():
+            a = acc.get(sym)
+            if a is None:
+                acc[sym] = dict(s)
+                continue
+            a["rows"] += s["rows"]
+            a["start_ts_ns"] = min(a["start_ts_ns"], s["start_ts_ns"])
+            a["end_ts_ns"] = max(a["end_ts_ns"], s["end_ts_ns"])
+            for k, f in (("volume", sum), ("high", max), ("low", min)):
+                vals = [v for v in (a.get(k), s.get(k)) if v is not None]
+                a[k] = f(vals) if vals else None
+
+    def px(v: Any) -> Optional[float]:
+        if v is None:
+            return None
+        return (float(v) / _FIXED_PRICE_SCALE) if isinstance(v, int) else float(v)
+
+    return {
+        sym: SymbolStats(
+            start_ts_ns=int(a["start_ts_ns"]),
+            end_ts_ns=int(a["end_ts_ns"]),
+            bars=int(a["rows"]),
+            volume=(int(a["volume"]) if a.get("volume") is not None else None),
+            high=px(a.get("high")),
+            low=px(a.get("low")),
+        )
+        for sym, a in acc.items()
+    }
+
+
+def _read_many_stats(paths: List[Path], max_workers: Optional[int]) -> List[Optional[Dict[str, SymbolStats]]]:
+    """
+    `_read_ohlcv_stats` for several files on a bounded thread pool. Results come back in input order,
+    so the catalog is identical whatever the concurrency. Sources covered by a valid manifest skip the parquet.
+    """
+    manifests: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+    out: List[Optional[Dict[str, SymbolStats]]] = []
+    todo: List[int] = []
+    for i, p in enumerate(paths):
+        root = _manifest_root(p)
+        if root not in manifests:
+            manifests[root] = _load_manifest(root)
+        out.append(_manifest_stats(p, manifests[root]) if manifests[root] else None)
+        if out[-1] is None:
+            todo.append(i)
+    workers = max(1, int(max_workers or SCAN_WORKERS_DEFAULT))
+    if workers == 1 or len(todo) <= 1:
+        read = [_read_ohlcv_stats(paths[i]) for i in todo]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(todo)), thread_name_prefix="catalog-scan") as ex:
+            read = list(ex.map(_read_ohlcv_stats, [paths[i] for i in todo]))
+    for i, stats in zip(todo, read):
+        out[i] = stats
+    return out
+
+
+def _open_index(index_path: Path) -> sqlite3.Connection:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_INDEX_SCHEMA)
+    row = conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+    if row is None or int(row[0]) != _INDEX_SCHEMA_VERSION:
+        with conn:
+            conn.execute("DELETE FROM symbols")
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM activity")
+            conn.execute("DELETE FROM activity_days")
+            conn.execute("DELETE FROM day_summary")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(_INDEX_SCHEMA_VERSION),),
+            )
+    return conn
+
+
+def _day_of_filename(name: str) -> Optional[str]:
+    """
+    YYYY-MM-DD of a simulator input file (XNAS.ITCH.<day>.mbp-10.parquet / EQUS.MINI.<day>.*.parquet)
+    or hive day directory key (schema=<schema>/day=<day>).
+    """
+    if name.startswith("schema="):
+        day = name.partition("/day=")[2]
+        return day if len(day) == 10 and day[4] == "-" and day[7] == "-" else None
+    if not name.endswith(".parquet"):
+        return None
+    parts = name.split(".")
+    if len(parts) < 4 or not (name.startswith("EQUS.MINI.") or name.startswith("XNAS.ITCH.")):
+        return None
+    day = parts[2]
+    if len(day) == 10 and day[4] == "-" and day[7] == "-":
+        return day
+    return None
+
+
+def _loadable_days(data_dir: Path, only_days: Optional[Iterable[str]] = None) -> List[Tuple[str, Path, str]]:
+    """
+    (day, best OHLCV path, tf) for every day that has the core simulator inputs (mbp-10 + trades + OHLCV).
+    Filename checks only; no parquet is opened. `only_days` restricts the check to those days.
+    """
+    days: List[str] = []
+    if only_days is not None:
+        days = list(only_days)
+    else:
+        # Discover days from OHLCV filenames.
+        for p in data_dir.glob("EQUS.MINI.*.ohlcv-*.parquet"):
+            name = p.name
+            # EQUS.MINI.YYYY-MM-DD.ohlcv-<tf>.parquet
+            parts = name.split(".")
+            if len(parts) < 4:
+                continue
+            day = parts[2]
+            if len(day) == 10 and day[4] == "-" and day[7] == "-":
+                days.append(day)
+        # Hive layout: schema=ohlcv-<tf>/day=<day>/
+        for p in data_dir.glob("schema=ohlcv-*/day=*"):
+            day = _day_of_filename(f"{p.parent.name}/{p.name}")
+            if day:
+                days.append(day)
+
+    out: List[Tuple[str, Path, str]] = []
+    for day in sorted(set(days)):
         # Require the core simulator inputs to exist for this day; otherwise it's not loadable.
-        mbp_path = data_dir / f"XNAS.ITCH.{day}.mbp-10.parquet"
-        trd_path = data_dir / f"EQUS.MINI.{day}.trades.parquet"
-        if not (mbp_path.exists() and trd_path.exists()):
+        if day_source(data_dir, "mbp-10", day) is None or day_source(data_dir, "trades", day) is None:
             continue
-
-        picked = _pick_best_ohlcv_file(data_dir, day)
+        picked = best_ohlcv_source(data_dir, day)
         if not picked:
             continue
-        ohl_path, _tf = picked
+        out.append((day, picked[0], picked[1]))
+    return out
+
+
+def _indexed_stats(
+    conn: sqlite3.Connection,
+    data_dir: Path,
+    days: List[Tuple[str, Path, str]],
+    max_workers: Optional[int] = None,
+    prune_days: Optional[Set[str]] = None,
+) -> Dict[str, Dict[str, SymbolStats]]:
+    """
+    Per-day symbol stats, served from the index when the OHLCV file's (mtime, size) is unchanged and
+    re-read (then upserted) otherwise. Index rows for files no longer picked in `data_dir` are dropped
+    (only rows of `prune_days` when given, for partial updates).
+    Changed files are read in parallel; index writes stay on the calling thread.
+    """
+    known: Dict[str, Tuple[int, int]] = {}
+    known_day: Dict[str, str] = {}
+    for r in conn.execute("SELECT path, mtime_ns, size, day FROM files WHERE data_dir = ?", (str(data_dir),)):
+        known[r[0]] = (int(r[1]), int(r[2]))
+        known_day[r[0]] = str(r[3])
+    out: Dict[str, Dict[str, SymbolStats]] = {}
+    fresh: List[str] = []
+    todo: List[Tuple[str, Path, str, Tuple[int, int]]] = []
+    for day, ohl_path, tf in days:
+        key = str(ohl_path)
         try:
-            pf = pq.ParquetFile(ohl_path)
-            schema_names = set(pf.schema.names)
-            ts_col = "ts_event" if "ts_event" in schema_names else ("ts" if "ts" in schema_names else None)
-            if ts_col is None:
-                continue
-            mins = _earliest_ts_by_symbol(ohl_path, ts_col=ts_col, symbol_col="symbol")
-        except Exception:
+            sig = source_sig(ohl_path)
+        except OSError:
             continue
+        if known.get(key) == sig:
+            fresh.append(key)
+        else:
+            todo.append((day, ohl_path, tf, sig))
 
-        for sym, ts_ns in mins.items():
-            full, short = _format_et(ts_ns, tz_name)
+    results = _read_many_stats([t[1] for t in todo], max_workers)
+    for (day, ohl_path, tf, sig), stats in zip(todo, results):
+        if stats is None:
+            continue
+        key = str(ohl_path)
+        with conn:
+            conn.execute("DELETE FROM symbols WHERE path = ?", (key,))
+            conn.executemany(
+                "INSERT INTO symbols(path, symbol, start_ts_ns, end_ts_ns, bars, volume, high, low) VALUES (?,?,?,?,?,?,?,?)",
+                [(key, sym, st.start_ts_ns, st.end_ts_ns, st.bars, st.volume, st.high, st.low) for sym, st in stats.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO files(path, data_dir, day, tf, mtime_ns, size) VALUES (?,?,?,?,?,?)",
+                (key, str(data_dir), day, tf, sig[0], sig[1]),
+            )
+        out[day] = stats
+        known[key] = sig
+
+    day_by_path = {str(p): day for day, p, _ in days}
+    for key in fresh:
+        stats = out.setdefault(day_by_path[key], {})
+        for r in conn.execute(
+            "SELECT symbol, start_ts_ns, end_ts_ns, bars, volume, high, low FROM symbols WHERE path = ?", (key,)
+        ):
+            stats[str(r[0])] = SymbolStats(
+                start_ts_ns=int(r[1]), end_ts_ns=int(r[2]), bars=int(r[3]), volume=r[4], high=r[5], low=r[6]
+            )
+
+    stale = [k for k in known if k not in day_by_path and (prune_days is None or known_day.get(k) in prune_days)]
+    if stale:
+        with conn:
+            conn.executemany("DELETE FROM symbols WHERE path = ?", [(k,) for k in stale])
+            conn.executemany("DELETE FROM files WHERE path = ?", [(k,) for k in stale])
+    return out
+
+
+def scan_catalog(
+    data_dir: Path,
+    tz_name: str = "America/New_York",
+    index_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> List[CatalogItem]:
+    """
+    Build a list of CatalogItem entries from the directory.
+    We group by day (derived from OHLCV filenames), then compute per-symbol stats for that day
+    (first/last bar, bar count, volume, high/low).
+
+    With `index_path`, per-file results are persisted there and reused while the OHLCV file is unchanged.
+    Files that need reading are scanned on up to `max_workers` threads (default SCAN_WORKERS_DEFAULT).
+    """
+    data_dir = Path(data_dir)
+    if not data_dir.exists():
+        return []
+
+    days = _loadable_days(data_dir)
+    if index_path is not None:
+        conn = _open_index(Path(index_path))
+        try:
+            stats_by_day = _indexed_stats(conn, data_dir, days, max_workers=max_workers)
+        finally:
+            conn.close()
+    else:
+        stats_by_day = {}
+        results = _read_many_stats([p for _, p, _ in days], max_workers)
+        for (day, _p, _tf), stats in zip(days, results):
+            if stats is not None:
+                stats_by_day[day] = stats
+
+    items = _catalog_items(stats_by_day, tz_name)
+    # Sort: newest day first, then symbol
+    items.sort(key=lambda x: (x.day, x.symbol, x.start_ts_ns), reverse=True)
+    return items
+
+
+def _catalog_items(stats_by_day: Dict[str, Dict[str, SymbolStats]], tz_name: str) -> List[CatalogItem]:
+    items: List[CatalogItem] = []
+    for day in sorted(stats_by_day):
+        for sym, st in stats_by_day[day].items():
+            full, short = _format_et(st.start_ts_ns, tz_name)
             label = f"{sym} {day} {short}"
             items.append(
                 CatalogItem(
                     symbol=sym,
                     day=day,
-                    start_ts_ns=int(ts_ns),
+                    start_ts_ns=int(st.start_ts_ns),
                     start_et=full,
                     label=label,
+                    end_ts_ns=int(st.end_ts_ns),
+                    bars=int(st.bars),
+                    volume=st.volume,
+                    high=st.high,
+                    low=st.low,
                 )
             )
-
-    # Sort: newest day first, then symbol
-    items.sort(key=lambda x: (x.day, x.symbol, x.start_ts_ns), reverse=True)
     return items
 
+
+class _WakeHandler(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(self, wake: threading.Event) -> None:
+        super().__init__()
+        self._wake = wake
+
+    def on_any_event(self, event: Any) -> None:
+        self._wake.set()
+
+
+class CatalogWatcher:
+    """
+    Background watcher for one data directory.
+
+    Polls the directory listing (os.scandir + stat, no parquet reads) every `poll_s` seconds; with the
+    optional `watchdog` package installed, native filesystem events wake it immediately. A new or changed
+    input file is only acted on once its (mtime, size) is unchanged across two polls (finished writing;
+    the downloader's `.parquet.tmp` files never match and appear via atomic rename). Affected days are
+    re-indexed incrementally and every subscriber receives one delta:
+        {"type": "catalog_delta", "added": [...], "removed": [...], "updated": [...]}
+    with items shaped like CatalogItem. Subscribers are called on the watcher thread.
+    With `activity_bucket_s` set, settled days also get their activity buckets rebuilt (see `enrich_activity`).
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        index_path: Path,
+        tz_name: str = "America/New_York",
+        poll_s: float = 2.0,
+        max_workers: Optional[int] = None,
+        activity_bucket_s: Optional[int] = None,
+    ) -> None:
+        self.data_dir = Path(data_dir)
+        self.index_path = Path(index_path)
+        self.tz_name = tz_name
+        self.poll_s = float(poll_s)
+        self.max_workers = max_workers
+        self.activity_bucket_s = activity_bucket_s
+        self._sigs: Dict[str, Tuple[int, int]] = {}
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._items: Dict[Tuple[str, str], CatalogItem] = {}
+        self._subs: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer: Any = None
+
+    def start(self) -> "CatalogWatcher":
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name=f"catalog-watch:{self.data_dir.name}", daemon=True)
+        self._thread.start()
+        if Observer is not None and self.data_dir.exists():
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_WakeHandler(self._wake), str(self.data_dir), recursive=False)
+                self._observer.start()
+            except Exception:
+                self._observer = None
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+
+    def subscribe(self, fn: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        with self._lock:
+            self._subs.append(fn)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if fn in self._subs:
+                    self._subs.remove(fn)
+
+        return unsubscribe
+
+    def _listing(self) -> Dict[str, Tuple[int, int]]:
+        out: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.data_dir) as it:
+                for e in it:
+                    if _day_of_filename(e.name) is None:
+                        continue
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    out[e.name] = (int(st.st_mtime_ns), int(st.st_size))
+        except OSError:
+            pass
+        # Hive layout: one entry per schema=<schema>/day=<day> directory (signature over its parts).
+        for d in self.data_dir.glob("schema=*/day=*"):
+            try:
+                sig = source_sig(d)
+            except OSError:
+                continue
+            if sig != (0, 0):
+                out[f"{d.parent.name}/{d.name}"] = sig
+        return out
+
+    def _refresh_days(self, days: Set[str]) -> Dict[str, Any]:
+        conn = _open_index(self.index_path)
+        try:
+            picked = _loadable_days(self.data_dir, only_days=sorted(days))
+            stats = _indexed_stats(conn, self.data_dir, picked, max_workers=self.max_workers, prune_days=days)
+        finally:
+            conn.close()
+        if self.activity_bucket_s:
+            try:
+                enrich_activity(
+                    self.data_dir, self.index_path, self.activity_bucket_s, days=days, max_workers=self.max_workers
+                )
+            except Exception:
+                pass  # catalog deltas still go out; the next change (or a manual build) retries
+        now = {(it.symbol, it.day): it for it in _catalog_items(stats, self.tz_name)}
+        before = {k: v for k, v in self._items.items() if k[1] in days}
+        added = [asdict(v) for k, v in now.items() if k not in before]
+        removed = [asdict(v) for k, v in before.items() if k not in now]
+        updated = [asdict(v) for k, v in now.items() if k in before and before[k] != v]
+        for k in before:
+            self._items.pop(k, None)
+        self._items.update(now)
+        return {"type": "catalog_delta", "added": added, "removed": removed, "updated": updated}
+
+    def poll_once(self) -> Optional[Dict[str, Any]]:
+        """
+        One poll step; returns the published delta (None if nothing settled / changed).
+        """
+        cur = self._listing()
+        days: Set[str] = set()
+        for name, sig in cur.items():
+            if self._sigs.get(name) == sig:
+                self._pending.pop(name, None)
+                continue
+            if self._pending.get(name) == sig:
+                # unchanged since the previous poll -> finished writing
+                self._pending.pop(name, None)
+                self._sigs[name] = sig
+                days.add(_day_of_filename(name) or "")
+            else:
+                self._pending[name] = sig
+        for name in [n for n in self._sigs if n not in cur]:
+            self._sigs.pop(name, None)
+            days.add(_day_of_filename(name) or "")
+        for name in [n for n in self._pending if n not in cur]:
+            self._pending.pop(name, None)
+        days.discard("")
+        if not days:
+            return None
+        delta = self._refresh_days(days)
+        if not (delta["added"] or delta["removed"] or delta["updated"]):
+            return None
+        with self._lock:
+            subs = list(self._subs)
+        for fn in subs:
+            try:
+                fn(delta)
+            except Exception:
+                pass
+        return delta
+
+    def _run(self) -> None:
+        # Baseline: current files count as settled and the index is brought up to date once.
+        self._sigs = self._listing()
+        try:
+            items = scan_catalog(self.data_dir, self.tz_name, index_path=self.index_path, max_workers=self.max_workers)
+            self._items = {(it.symbol, it.day): it for it in items}
+        except Exception:
+            self._items = {}
+        if self.activity_bucket_s:
+            try:
+                enrich_activity(self.data_dir, self.index_path, self.activity_bucket_s, max_workers=self.max_workers)
+            except Exception:
+                pass
+        while not self._stop.is_set():
+            # Pending files need a second look soon to confirm they settled.
+            self._wake.wait(min(self.poll_s, 0.5) if self._pending else self.poll_s)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.poll_once()
+            except Exception:
+                # Keep watching; the next poll retries (e.g. index briefly locked).
+                pass
+
+
+# ---------------- Activity enrichment (drill selection) ----------------
+
+def _bucketed(tab: pa.Table, ts_col: str, bucket_ns: int) -> pa.Table:
+    """
+    Add a `bucket` column (bucket start, UTC epoch ns) and normalize `symbol` to string.
+    """
+    ts = _ts_array_to_ns(tab.column(ts_col).combine_chunks())
+    bucket = pc.multiply(pc.divide(ts, pa.scalar(bucket_ns, pa.int64())), pa.scalar(bucket_ns, pa.int64()))
+    out = tab.drop_columns([ts_col]).append_column("bucket", bucket)
+    return out.set_column(out.schema.get_field_index("symbol"), "symbol", out.column("symbol").cast(pa.string()))
+
+
+def _price_col(tab: pa.Table, name: str) -> pa.ChunkedArray:
+    col = tab.column(name)
+    # Databento can emit float prices (double) or legacy fixed-int prices.
+    if pa.types.is_integer(col.type):
+        return pc.divide(col.cast(pa.float64()), float(_FIXED_PRICE_SCALE))
+    return col.cast(pa.float64())
+
+
+def _need_source(data_dir: Path, schema: str, day: str) -> Path:
+    src = day_source(data_dir, schema, day)
+    if src is None:
+        raise FileNotFoundError(f"Missing parquet: {Path(data_dir) / flat_name(schema, day)}")
+    return src
+
+
+def _activity_for_day(data_dir: Path, day: str, ohl_path: Path, bucket_s: int) -> List[Tuple[Any, ...]]:
+    """
+    Per (symbol, bucket) metrics for one day, all via Arrow group_by (no per-row Python):
+    trades/volume from the trades parquet, high/low/range from OHLCV, mean top-of-book spread from MBP-10.
+    Rows: (symbol, start_ts_ns, trades, volume, high, low, range, range_pct, spread, spread_bps).
+    """
+    bucket_ns = int(bucket_s) * 1_000_000_000
+
+    trd = read_source(_need_source(data_dir, "trades", day), ["ts_event", "symbol", "size"])
+    trd = _bucketed(trd, "ts_event", bucket_ns)
+    tg = trd.group_by(["symbol", "bucket"]).aggregate([("size", "count"), ("size", "sum")]).to_pydict()
+
+    ohl_names = set(source_names(ohl_path))
+    ohl_ts = "ts_event" if "ts_event" in ohl_names else "ts"
+    ohl = read_source(ohl_path, [ohl_ts, "symbol", "high", "low"])
+    ohl = _bucketed(ohl, ohl_ts, bucket_ns)
+    ohl = ohl.set_column(ohl.schema.get_field_index("high"), "high", _price_col(ohl, "high"))
+    ohl = ohl.set_column(ohl.schema.get_field_index("low"), "low", _price_col(ohl, "low"))
+    og = ohl.group_by(["symbol", "bucket"]).aggregate([("high", "max"), ("low", "min")]).to_pydict()
+
+    mbp = read_source(_need_source(data_dir, "mbp-10", day), ["ts_event", "symbol", "bid_px_00", "ask_px_00"])
+    mbp = _bucketed(mbp, "ts_event", bucket_ns)
+    bid = _price_col(mbp, "bid_px_00")
+    ask = _price_col(mbp, "ask_px_00")
+    two_sided = pc.and_(pc.and_(pc.greater(bid, 0.0), pc.greater(ask, 0.0)), pc.greater_equal(ask, bid))
+    spread = pc.subtract(ask, bid)
+    mid = pc.divide(pc.add(ask, bid), 2.0)
+    sp = pa.table(
+        {
+            "symbol": mbp.column("symbol"),
+            "bucket": mbp.column("bucket"),
+            "spread": spread,
+            "spread_bps": pc.multiply(pc.divide(spread, mid), 10_000.0),
+        }
+    ).filter(two_sided)
+    sg = sp.group_by(["symbol", "bucket"]).aggregate([("spread", "mean"), ("spread_bps", "mean")]).to_pydict()
+
+    rows: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for i, (sym, b) in enumerate(zip(tg["symbol"], tg["bucket"])):
+        rows.setdefault((sym, int(b)), {}).update(trades=int(tg["size_count"][i]), volume=int(tg["size_sum"][i] or 0))
+    for i, (sym, b) in enumerate(zip(og["symbol"], og["bucket"])):
+        rows.setdefault((sym, int(b)), {}).update(high=og["high_max"][i], low=og["low_min"][i])
+    for i, (sym, b) in enumerate(zip(sg["symbol"], sg["bucket"])):
+        r = rows.get((sym, int(b)))
+        if r is not None:  # spread alone (quotes, no prints/bars) is not an activity window
+            r.update(spread=sg["spread_mean"][i], spread_bps=sg["spread_bps_mean"][i])
+
+    out: List[Tuple[Any, ...]] = []
+    for (sym, b), r in rows.items():
+        if sym is None:
+            continue
+        hi, lo = r.get("high"), r.get("low")
+        rng = (hi - lo) if (hi is not None and lo is not None) else None
+        rng_pct = (rng / lo * 100.0) if (rng is not None and lo) else None
+        out.append(
+            (sym, b, r.get("trades", 0), r.get("volume", 0), hi, lo, rng, rng_pct, r.get("spread"), r.get("spread_bps"))
+        )
+    return out
+
+
+def _activity_sig(data_dir: Path, day: str, ohl_path: Path) -> Optional[str]:
+    parts: List[str] = []
+    for p in (day_source(data_dir, "mbp-10", day), day_source(data_dir, "trades", day), ohl_path):
+        if p is None:
+            return None
+        try:
+            mtime, size = source_sig(p)
+        except OSError:
+            return None
+        parts.append(f"{p.name}:{mtime}:{size}")
+    return "|".join(parts)
+
+
+def enrich_activity(
+    data_dir: Path,
+    index_path: Path,
+    bucket_s: int = ACTIVITY_BUCKET_S_DEFAULT,
+    days: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Compute (or refresh) bucketed activity metrics for every loadable day (or just `days`) into the index.
+    Days whose inputs are unchanged since their last build are skipped. Returns the number of days built.
+    """
+    data_dir = Path(data_dir)
+    if not data_dir.exists():
+        return 0
+    bucket_s = int(bucket_s)
+    if bucket_s <= 0:
+        raise ValueError("bucket_s must be > 0")
+    picked = _loadable_days(data_dir, only_days=sorted(set(days)) if days is not None else None)
+
+    conn = _open_index(Path(index_path))
+    try:
+        done = {
+            str(r[0]): str(r[1])
+            for r in conn.execute(
+                "SELECT day, sig FROM activity_days WHERE data_dir = ? AND bucket_s = ?", (str(data_dir), bucket_s)
+            )
+        }
+        todo: List[Tuple[str, Path, str]] = []
+        for day, ohl_path, _tf in picked:
+            sig = _activity_sig(data_dir, day, ohl_path)
+            if sig is not None and done.get(day) != sig:
+                todo.append((day, ohl_path, sig))
+
+        def build(t: Tuple[str, Path, str]) -> Optional[List[Tuple[Any, ...]]]:
+            try:
+                return _activity_for_day(data_dir, t[0], t[1], bucket_s)
+            except Exception:
+                return None
+
+        workers = max(1, int(max_workers or SCAN_WORKERS_DEFAULT))
+        if workers == 1 or len(todo) <= 1:
+            results = [build(t) for t in todo]
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(todo)), thread_name_prefix="catalog-activity") as ex:
+                results = list(ex.map(build, todo))
+
+        built = 0
+        for (day, _p, sig), rows in zip(todo, results):
+            if rows is None:
+                continue
+            with conn:
+                conn.execute(
+                    "DELETE FROM activity WHERE data_dir = ? AND day = ? AND bucket_s = ?", (str(data_dir), day, bucket_s)
+                )
+                conn.executemany(
+                    "INSERT INTO activity(data_dir, day, symbol, bucket_s, start_ts_ns, trades, volume, high, low, range,"
+                    " range_pct, spread, spread_bps) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                    [(str(data_dir), day, r[0], bucket_s, *r[1:]) for r in rows],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO activity_days(data_dir, day, bucket_s, sig) VALUES (?,?,?,?)",
+                    (str(data_dir), day, bucket_s, sig),
+                )
+            built += 1
+
+        # Days (of those considered) that are no longer loadable.
+        live = {d for d, _, _ in picked}
+        gone = [d for d in (done if days is None else set(days)) if d not in live and d in done]
+        if gone:
+            with conn:
+                for d in gone:
+                    conn.execute("DELETE FROM activity WHERE data_dir = ? AND day = ?", (str(data_dir), d))
+                    conn.execute("DELETE FROM activity_days WHERE data_dir = ? AND day = ?", (str(data_dir), d))
+        return built
+    finally:
+        conn.close()
+
+
+def query_activity(
+    data_dir: Path,
+    index_path: Path,
+    metric: str = "range_pct",
+    bucket_s: int = ACTIVITY_BUCKET_S_DEFAULT,
+    limit: int = 50,
+    symbol: Optional[str] = None,
+    day_from: Optional[str] = None,
+    day_to: Optional[str] = None,
+    min_trades: int = 0,
+    min_volume: int = 0,
+    max_spread_bps: Optional[float] = None,
+    tz_name: str = "America/New_York",
+) -> List[Dict[str, Any]]:
+    """
+    Rank stored activity windows by `metric` (descending) with optional filters. Index-only: no parquet reads.
+    """
+    if metric not in ACTIVITY_METRICS:
+        raise ValueError(f"metric must be one of: {', '.join(ACTIVITY_METRICS)}")
+    where = ["data_dir = ?", "bucket_s = ?", f"{metric} IS NOT NULL", "trades >= ?", "volume >= ?"]
+    args: List[Any] = [str(Path(data_dir)), int(bucket_s), int(min_trades), int(min_volume)]
+    if symbol:
+        where.append("symbol = ?")
+        args.append(symbol.strip())
+    if day_from:
+        where.append("day >= ?")
+        args.append(day_from.strip())
+    if day_to:
+        where.append("day <= ?")
+        args.append(day_to.strip())
+    if max_spread_bps is not None:
+        where.append("spread_bps <= ?")
+        args.append(float(max_spread_bps))
+    conn = _open_index(Path(index_path))
+    try:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT day, symbol, bucket_s, start_ts_ns, trades, volume, high, low, range, range_pct, spread, spread_bps"
+            f" FROM activity WHERE {' AND '.join(where)} ORDER BY {metric} DESC LIMIT ?",
+            (*args, int(limit)),
+        ).fetchall()
+    finally:
+        conn.close()
+    out: List[Dict[str, Any]] = []
+    for r in rows:
+        d = dict(r)
+        full, short = _format_et(int(d["start_ts_ns"]), tz_name)
+        d["start_et"] = full
+        d["label"] = f"{d['symbol']} {d['day']} {short}"
+        out.append(d)
+    return out
+
+
+# ---------------- Prior-day reference levels ----------------
+
+_PREMARKET_OPEN = dtime(4, 0)
+_RTH_OPEN = dtime(9, 30)
+_RTH_CLOSE = dtime(16, 0)
+
+
+def session_bounds_ns(day: str, tz_name: str) -> Tuple[int, int, int]:
+    """
+    (premarket open, regular open, regular close) of `day` in tz_name, as UTC epoch ns.
+    """
+    tz = ZoneInfo(tz_name) if ZoneInfo is not None else None
+    d = datetime.strptime(day, "%Y-%m-%d").date()
+    return tuple(  # type: ignore[return-value]
+        int(datetime.combine(d, t, tzinfo=tz).timestamp()) * 1_000_000_000
+        for t in (_PREMARKET_OPEN, _RTH_OPEN, _RTH_CLOSE)
+    )
+
+
+def _read_day_summary(ohl_path: Path, symbol: str, day: str, tz_name: str) -> Dict[str, Any]:
+    """
+    Reference levels for one symbol/day from its OHLCV bars:
+    close = last bar close at or before the regular close (else the last bar), high/low = regular session
+    (whole file when it has no regular-session bars), pm_high/pm_low = premarket bars.
+    """
+    names = set(source_names(ohl_path))
+    ts_col = "ts_event" if "ts_event" in names else "ts"
+    tab = read_source(ohl_path, [ts_col, "symbol", "high", "low", "close"], [symbol])
+    ts = _ts_array_to_ns(tab.column(ts_col).combine_chunks())
+    out: Dict[str, Any] = {"close": None, "close_ts_ns": None, "high": None, "low": None, "pm_high": None, "pm_low": None}
+    if len(ts) == 0:
+        return out
+    hi, lo, cl = _price_col(tab, "high"), _price_col(tab, "low"), _price_col(tab, "close")
+    pm0, rth0, rth1 = session_bounds_ns(day, tz_name)
+
+    def in_range(a: int, b: int) -> Any:
+        return pc.and_(pc.greater_equal(ts, a), pc.less(ts, b))
+
+    def hilo(mask: Any) -> Tuple[Optional[float], Optional[float]]:
+        h = pc.max(pc.filter(hi, mask)).as_py()
+        l = pc.min(pc.filter(lo, mask)).as_py()
+        return h, l
+
+    out["pm_high"], out["pm_low"] = hilo(in_range(pm0, rth0))
+    rth = in_range(rth0, rth1)
+    out["high"], out["low"] = hilo(rth) if pc.any(rth).as_py() else hilo(pc.is_valid(ts))
+    upto = pc.less(ts, rth1)
+    if not pc.any(upto).as_py():
+        upto = pc.is_valid(ts)
+    # Bars are sorted per symbol in practice; don't rely on it.
+    last = pc.index(ts, pc.max(pc.filter(ts, upto))).as_py()
+    out["close"] = cl[last].as_py()
+    out["close_ts_ns"] = int(ts[last].as_py())
+    return out
+
+
+def day_summary(index_path: Path, ohl_path: Path, symbol: str, day: str, tz_name: str) -> Dict[str, Any]:
+    """
+    Cached `_read_day_summary` (keyed by OHLCV source, symbol and tz; rebuilt when it changes).
+    """
+    mtime, size = source_sig(Path(ohl_path))
+    sig = f"{mtime}:{size}"
+    conn = _open_index(Path(index_path))
+    try:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT sig, close, close_ts_ns, high, low, pm_high, pm_low FROM day_summary"
+            " WHERE path = ? AND symbol = ? AND tz_name = ?",
+            (str(ohl_path), symbol, tz_name),
+        ).fetchone()
+        if row is not None and row["sig"] == sig:
+            return {k: row[k] for k in ("close", "close_ts_ns", "high", "low", "pm_high", "pm_low")}
+        out = _read_day_summary(Path(ohl_path), symbol, day, tz_name)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO day_summary(path, symbol, tz_name, sig, close, close_ts_ns, high, low, pm_high, pm_low)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (str(ohl_path), symbol, tz_name, sig, out["close"], out["close_ts_ns"], out["high"], out["low"],
+                 out["pm_high"], out["pm_low"]),
+            )
+        return out
+    finally:
+        conn.close()
+
+
+def _prior_indexed_day(conn: sqlite3.Connection, data_dir: Path, symbol: str, day: str) -> Optional[Tuple[str, Path]]:
+    row = conn.execute(
+        "SELECT f.day, f.path FROM files f JOIN symbols s ON s.path = f.path"
+        " WHERE f.data_dir = ? AND s.symbol = ? AND f.day < ? ORDER BY f.day DESC LIMIT 1",
+        (str(data_dir), symbol, day),
+    ).fetchone()
+    return (str(row[0]), Path(row[1])) if row else None
+
+
+def prior_day_summary(
+    data_dir: Path, index_path: Path, symbol: str, day: str, tz_name: str = "America/New_York"
+) -> Optional[Dict[str, Any]]:
+    """
+    Reference levels of the symbol's previous trading day in `data_dir` (per the catalog index), or None.
+    A miss refreshes the index once (cheap when warm) in case the prior day was downloaded after the last scan.
+    """
+    data_dir = Path(data_dir)
+    conn = _open_index(Path(index_path))
+    try:
+        hit = _prior_indexed_day(conn, data_dir, symbol, day)
+        if hit is None:
+            _indexed_stats(conn, data_dir, _loadable_days(data_dir))
+            hit = _prior_indexed_day(conn, data_dir, symbol, day)
+    finally:
+        conn.close()
+    if hit is None:
+        return None
+    prior_day, ohl_path = hit
+    out = day_summary(Path(index_path), ohl_path, symbol, prior_day, tz_name)
+    out["day"] = prior_day
+    return out
+
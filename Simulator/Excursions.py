@@ -0,0 +1,199 @@
+"""
+Simulator/Excursions.py
+
+Server-side excursion analytics for journaled round trips (see TradeJournal.round_trips):
+- MAE / MFE (per share, vs average entry) from the tape between entry and exit
+- time-to-MFE / time-to-MAE
+- slippage vs the top of book (bid_px_00 / ask_px_00) at entry and exit
+
+Per day and symbol only three arrays are kept (trade ts/px and top-of-book ts/bid/ask), read straight from
+parquet into NumPy and kept in a small LRU (re-read when the files change). Entry/exit/book indices for every trip of a day come from one `searchsorted`
+call each, so a month of practice trades is a handful of array reads plus C-speed slice reductions.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+
+@dataclass(frozen=True)
+class TopOfBookDay:
+    trd_ts: np.ndarray  # int64 ns, ascending
+    trd_px: np.ndarray  # float64
+    bbo_ts: np.ndarray  # int64 ns, ascending
+    bid: np.ndarray  # float64 (NaN when the side is empty)
+    ask: np.ndarray  # float64
+
+
+# (symbol, day, files) -> (source signatures, arrays); least recently used first.
+_NP_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[Tuple[Any, ...], TopOfBookDay]]" = OrderedDict()
+_NP_CACHE_MAX = 8  # symbol-days; a month of journaled days streams through without staying resident
+_NP_LOCK = threading.Lock()
+
+
+def _col_np(tab: pa.Table, name: str, price_scale: Optional[int] = None) -> np.ndarray:
+    col = tab[name]
+    if pa.types.is_timestamp(col.type):
+        col = col.cast(pa.int64())
+    if price_scale is not None:
+        # Databento can emit float prices (double) or legacy fixed-int prices.
+        if pa.types.is_integer(col.type):
+            return col.to_numpy().astype(np.float64) / float(price_scale)
+        return col.cast(pa.float64()).to_numpy()
+    return col.to_numpy().astype(np.int64)
+
+
+def _read_symbol(path: Path, symbol: str, columns: List[str]) -> pa.Table:
+    from DataCatalog import read_source  # Simulator/DataCatalog.py (local module)
+
+    # Flat parquet or hive day directory (see DataCatalog.day_source).
+    return read_source(path, ["symbol"] + columns, [symbol])
+
+
+def _ascending(ts: np.ndarray, *cols: np.ndarray) -> Tuple[np.ndarray, ...]:
+    if ts.size > 1 and not bool(np.all(ts[1:] >= ts[:-1])):
+        order = np.argsort(ts, kind="stable")
+        return (ts[order],) + tuple(c[order] for c in cols)
+    return (ts,) + cols
+
+
+def load_top_of_book(symbol: str, day: str, mbp_path: Path, trd_path: Path, price_scale: int) -> TopOfBookDay:
+    """
+    Load trade prints and top-of-book for one symbol/day as NumPy arrays (LRU-cached per symbol/day/files while
+    the files' (mtime, size) signatures are unchanged).
+    """
+    from DataCatalog import source_sig  # Simulator/DataCatalog.py (local module)
+
+    if not mbp_path.exists():
+        raise FileNotFoundError(f"Missing parquet: {mbp_path}")
+    if not trd_path.exists():
+        raise FileNotFoundError(f"Missing parquet: {trd_path}")
+    key = (symbol, day, f"{mbp_path}|{trd_path}")
+    sig = (source_sig(mbp_path), source_sig(trd_path))
+    with _NP_LOCK:
+        hit = _NP_CACHE.get(key)
+        if hit is not None and hit[0] == sig:
+            _NP_CACHE.move_to_end(key)
+            return hit[1]
+
+    trd = _read_symbol(trd_path, symbol, ["ts_event", "price"])
+    trd_ts, trd_px = _ascending(_col_np(trd, "ts_event"), _col_np(trd, "price", price_scale))
+
+    mbp = _read_symbol(mbp_path, symbol, ["ts_event", "bid_px_00", "ask_px_00"])
+    bbo_ts, bid, ask = _ascending(
+        _col_np(mbp, "ts_event"),
+        _col_np(mbp, "bid_px_00", price_scale),
+        _col_np(mbp, "ask_px_00", price_scale),
+    )
+    # Empty levels come through as null/0; treat both as "no quote".
+    bid = np.where(bid > 0, bid, np.nan)
+    ask = np.where(ask > 0, ask, np.nan)
+
+    out = TopOfBookDay(trd_ts=trd_ts, trd_px=trd_px, bbo_ts=bbo_ts, bid=bid, ask=ask)
+    with _NP_LOCK:
+        _NP_CACHE[key] = (sig, out)
+        _NP_CACHE.move_to_end(key)
+        while len(_NP_CACHE) > _NP_CACHE_MAX:
+            _NP_CACHE.popitem(last=False)
+    return out
+
+
+def _f(x: Any) -> Optional[float]:
+    try:
+        v = float(x)
+    except Exception:
+        return None
+    return v if np.isfinite(v) else None
+
+
+def analyze_round_trips(tob: TopOfBookDay, trips: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Excursion + slippage metrics for round trips of one symbol/day (TradeJournal.round_trips shape).
+
+    - Window: prints with entry_ts < ts <= exit_ts (open trips: up to the last print of the day),
+      plus the exit price itself.
+    - mae / mfe: per share vs the average entry price, clamped at 0.
+    - time_to_mfe_s / time_to_mae_s: from entry to the first print at the extreme (0 when the extreme is 0).
+    - entry_slippage / exit_slippage: per share vs the book at-or-before the fill ts
+      (buys vs ask, sells vs bid; positive = worse than the touch).
+    """
+    n = len(trips)
+    if n == 0:
+        return []
+    entry_ts = np.array([int(t["entry_ts_ns"]) for t in trips], dtype=np.int64)
+    last_ts = int(tob.trd_ts[-1]) if tob.trd_ts.size else int(entry_ts.max())
+    exit_ts = np.array(
+        [int(t["exit_ts_ns"]) if t.get("exit_ts_ns") is not None else max(last_ts, int(t["entry_ts_ns"])) for t in trips],
+        dtype=np.int64,
+    )
+    long_ = np.array([t.get("side") == "LONG" for t in trips], dtype=bool)
+    entry_px = np.array([_f(t.get("entry_px")) or np.nan for t in trips], dtype=np.float64)
+    exit_px = np.array([_f(t.get("exit_px")) or np.nan for t in trips], dtype=np.float64)
+
+    i0 = np.searchsorted(tob.trd_ts, entry_ts, side="right")
+    i1 = np.searchsorted(tob.trd_ts, exit_ts, side="right")
+
+    # Top of book at-or-before entry / exit (-1 -> no book yet).
+    b_in = np.searchsorted(tob.bbo_ts, entry_ts, side="right") - 1
+    b_out = np.searchsorted(tob.bbo_ts, exit_ts, side="right") - 1
+
+    def touch(idx: np.ndarray, buy: np.ndarray) -> np.ndarray:
+        ok = idx >= 0
+        j = np.where(ok, idx, 0)
+        if tob.bbo_ts.size == 0:
+            return np.full(idx.shape, np.nan)
+        px = np.where(buy, tob.ask[j], tob.bid[j])
+        return np.where(ok, px, np.nan)
+
+    # Long entries buy at the ask and exit selling at the bid; shorts the other way around.
+    entry_touch = touch(b_in, long_)
+    exit_touch = touch(b_out, ~long_)
+    sign = np.where(long_, 1.0, -1.0)
+    entry_slip = (entry_px - entry_touch) * sign
+    exit_slip = (exit_touch - exit_px) * sign
+
+    out: List[Dict[str, Any]] = []
+    px = tob.trd_px
+    ts = tob.trd_ts
+    for k, t in enumerate(trips):
+        seg = px[i0[k] : i1[k]]
+        hi = lo = exit_px[k]
+        t_hi = t_lo = exit_ts[k]
+        if seg.size:
+            jh = int(np.nanargmax(seg)) if not np.all(np.isnan(seg)) else -1
+            jl = int(np.nanargmin(seg)) if jh >= 0 else -1
+            if jh >= 0:
+                if not (seg[jh] < hi):  # earliest print wins ties; also true when exit px is NaN (open trip)
+                    hi, t_hi = seg[jh], ts[i0[k] + jh]
+                if not (seg[jl] > lo):
+                    lo, t_lo = seg[jl], ts[i0[k] + jl]
+        e = entry_px[k]
+        if long_[k]:
+            mfe, mae, t_fav, t_adv = hi - e, e - lo, t_hi, t_lo
+        else:
+            mfe, mae, t_fav, t_adv = e - lo, hi - e, t_lo, t_hi
+        mfe = max(0.0, float(mfe)) if np.isfinite(mfe) else None
+        mae = max(0.0, float(mae)) if np.isfinite(mae) else None
+        r = dict(t)
+        r.update(
+            {
+                "mae": mae,
+                "mfe": mfe,
+                "time_to_mfe_s": ((int(t_fav) - int(entry_ts[k])) / 1e9) if mfe else (0.0 if mfe == 0.0 else None),
+                "time_to_mae_s": ((int(t_adv) - int(entry_ts[k])) / 1e9) if mae else (0.0 if mae == 0.0 else None),
+                "prints": int(seg.size),
+                "entry_touch": _f(entry_touch[k]),
+                "exit_touch": _f(exit_touch[k]) if t.get("exit_ts_ns") is not None else None,
+                "entry_slippage": _f(entry_slip[k]),
+                "exit_slippage": _f(exit_slip[k]) if t.get("exit_ts_ns") is not None else None,
+            }
+        )
+        out.append(r)
+    return out
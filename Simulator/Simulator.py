@@ -16,17 +16,22 @@ Then open:
 from __future__ import annotations
 
 import json
+import math
 import time
 import asyncio
+import bisect
+import heapq
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from itertools import accumulate
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
 
@@ -42,10 +47,15 @@ APP = FastAPI()
 DATA_DIR_DEFAULT = Path("/Users/zizizink/Documents/TradingProject/databento_out")
 LOCAL_TZ_NAME_DEFAULT = "America/New_York"
 FIXED_PRICE_SCALE = 1_000_000_000  # legacy: Databento "fixed" price_type uses 1e9 scaling
+MULTI_STREAM_MAX_SYMBOLS = 8  # /api/stream_multi: each symbol keeps a full LoadedDay in memory
 
 # Lightweight cache for the data catalog scan (prevents repeated heavy scans on page load / refresh).
 _CATALOG_CACHE: Dict[Tuple[str, str, int], Tuple[float, Dict[str, Any]]] = {}
 _CATALOG_CACHE_TTL_S = 5.0
+CATALOG_SCAN_WORKERS: Optional[int] = None  # None -> DataCatalog.SCAN_WORKERS_DEFAULT (min(8, cpu count))
+CATALOG_WATCH_POLL_S = 2.0  # /api/catalog/events: directory poll interval (watchdog, if installed, wakes it early)
+CATALOG_ACTIVITY_BUCKET_S = 300  # drill windows: activity buckets kept current by the catalog watcher
+_CATALOG_WATCHERS: Dict[Tuple[str, str], Any] = {}  # (data_dir, tz_name) -> DataCatalog.CatalogWatcher
 
 # Config persistence (saved to disk)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -57,6 +67,12 @@ CONFIGS_ALLOWED = {
     "settings": "settings.json",
 }
 
+# Trading session event logs (one append-only JSONL per browser session)
+SESSIONS_DIR = PROJECT_ROOT / "Sessions"
+
+# Persistent catalog index (per-file scan results keyed by path + mtime + size; see DataCatalog.py)
+CATALOG_INDEX_PATH = PROJECT_ROOT / "Cache" / "catalog.sqlite3"
+
 
 INDEX_HTML = r"""
 <!doctype html>
@@ -91,6 +107,9 @@ INDEX_HTML = r"""
     .topbar .spacer { flex: 1; }
     .error { color: #ff6b6b; font-size: 12px; }
     .hint { color: var(--muted); font-size: 12px; }
+    .scrub { width: 220px; }
+    .watchQuotes { display: flex; gap: 6px; flex-wrap: wrap; }
+    .watchQuotes button { font-size: 12px; padding: 3px 8px; font-variant-numeric: tabular-nums; }
 
     .layout { display: grid; grid-template-columns: 420px 1fr; gap: 12px; padding: 12px; }
     .panel { background: var(--panel); border: 1px solid var(--grid); border-radius: 12px; overflow: hidden; }
@@ -152,6 +171,7 @@ INDEX_HTML = r"""
 <body>
   <div class="topbar">
     <label>Symbol <input id="symbol" value="MNTS" size="6"/></label>
+    <label title="Extra symbols replayed on the same clock (comma-separated). Click a quote to trade it.">Watch <input id="watch" value="" size="14" placeholder="SYM1,SYM2"/></label>
     <label>Day <input id="day" value="2026-01-05" size="10"/></label>
     <label>Time (ET) <input id="ts" value="2026-01-05 09:30:00" size="24"/></label>
     <label>Session
@@ -159,6 +179,11 @@ INDEX_HTML = r"""
         <option value="">(scan sessions)</option>
       </select>
     </label>
+    <label title="Most volatile 5-minute windows across the catalog (from the activity index)">Drills
+      <select id="drills">
+        <option value="">(none)</option>
+      </select>
+    </label>
     <label>Speed
       <select id="speed">
         <option value="0.5">0.5x</option>
@@ -169,6 +194,8 @@ INDEX_HTML = r"""
     <button id="load" class="primary">Load</button>
     <button id="play" class="primary">Play</button>
     <button id="pause" class="danger">Pause</button>
+    <input id="scrub" class="scrub" type="range" min="0" max="0" step="1" value="0" disabled title="Drag to scrub the loaded day; release to load there"/>
+    <div id="watchQuotes" class="watchQuotes"></div>
     <div class="spacer"></div>
     <div id="now" class="hint"></div>
     <div id="status" class="hint"></div>
@@ -197,6 +224,124 @@ function $(id){ return document.getElementById(id); }
 
 // ---------------- Session catalog dropdown ----------------
 let catalogMap = new Map();
+let catalogEvents = null;
+
+function _catalogId(it){
+  return `${String(it.symbol || '').trim()}__${String(it.day || '').trim()}__${Number(it.start_ts_ns ?? 0)}`;
+}
+
+// Dropdown order: newest day first, then symbol (same as /api/catalog).
+function _catalogSortKey(it){
+  return `${String(it.day || '').trim()}\u0000${String(it.symbol || '').trim()}\u0000${String(Number(it.start_ts_ns ?? 0)).padStart(20, '0')}`;
+}
+
+function _catalogOption(it){
+  const sym = String(it.symbol || '').trim();
+  const day = String(it.day || '').trim();
+  const ts = String(it.start_et || '').trim();
+  const label = String(it.label || '').trim() || `${sym} ${day}`;
+  const id = _catalogId(it);
+  catalogMap.set(id, {symbol: sym, day, ts, label});
+  const opt = document.createElement('option');
+  opt.value = id;
+  opt.textContent = label;
+  opt.dataset.sortKey = _catalogSortKey(it);
+  const meta = [];
+  if (it.end_ts_ns != null) meta.push(`${ts} → ${nsToEt(Number(it.end_ts_ns))} ET`);
+  if (it.bars != null) meta.push(`${Number(it.bars).toLocaleString()} bars`);
+  if (it.volume != null) meta.push(`vol ${Number(it.volume).toLocaleString()}`);
+  if (it.low != null && it.high != null) meta.push(`range ${Number(it.low).toFixed(2)}–${Number(it.high).toFixed(2)}`);
+  if (meta.length) opt.title = meta.join(' · ');
+  return opt;
+}
+
+function _applyCatalogDelta(delta){
+  const sel = $('catalog');
+  if (!sel) return;
+  const drop = (it)=>{
+    const id = _catalogId(it);
+    catalogMap.delete(id);
+    for (const opt of Array.from(sel.options)){
+      if (opt.value === id) opt.remove();
+    }
+  };
+  for (const it of (delta.removed || [])) drop(it);
+  for (const it of (delta.updated || [])){
+    // start_ts_ns may have moved (it is part of the id), so drop by symbol/day.
+    for (const [id, v] of Array.from(catalogMap.entries())){
+      if (v.symbol === String(it.symbol || '').trim() && v.day === String(it.day || '').trim()) drop({symbol: v.symbol, day: v.day, start_ts_ns: id.split('__')[2]});
+    }
+  }
+  for (const it of [...(delta.added || []), ...(delta.updated || [])]){
+    const opt = _catalogOption(it);
+    const key = opt.dataset.sortKey;
+    const before = Array.from(sel.options).find(o=>o.dataset.sortKey && o.dataset.sortKey < key);
+    sel.insertBefore(opt, before || null);
+  }
+  const n = (delta.added || []).length;
+  if (n) setStatus(`Catalog: ${n} new session${n === 1 ? '' : 's'}`);
+  // The watcher re-buckets touched days before publishing, so the ranking may have moved.
+  loadDrills();
+}
+
+// ---------------- Drill windows (activity index) ----------------
+let drillMap = new Map();
+
+async function loadDrills(){
+  const sel = $('drills');
+  if (!sel || POPOUT) return;
+  try {
+    const resp = await fetch(`/api/catalog/activity?metric=range_pct&limit=50`);
+    const data = await resp.json();
+    if (!resp.ok) return;
+    const items = Array.isArray(data?.items) ? data.items : [];
+    drillMap = new Map();
+    sel.innerHTML = `<option value="">${items.length ? 'Top windows…' : '(none)'}</option>`;
+    items.forEach((it, i)=>{
+      const id = String(i);
+      drillMap.set(id, {symbol: String(it.symbol || ''), day: String(it.day || ''), ts: String(it.start_et || '')});
+      const opt = document.createElement('option');
+      opt.value = id;
+      const pct = it.range_pct != null ? ` · ${Number(it.range_pct).toFixed(1)}%` : '';
+      opt.textContent = `${String(it.label || '')}${pct}`;
+      const meta = [`${Number(it.trades || 0).toLocaleString()} trades`, `vol ${Number(it.volume || 0).toLocaleString()}`];
+      if (it.low != null && it.high != null) meta.push(`range ${Number(it.low).toFixed(2)}–${Number(it.high).toFixed(2)}`);
+      if (it.spread_bps != null) meta.push(`spread ${Number(it.spread_bps).toFixed(1)} bps`);
+      opt.title = meta.join(' · ');
+      sel.appendChild(opt);
+    });
+  } catch {}
+}
+
+function initDrills(){
+  const sel = $('drills');
+  if (!sel) return;
+  sel.addEventListener('change', async ()=>{
+    const it = drillMap.get(sel.value);
+    if (!it) return;
+    try {
+      $('symbol').value = it.symbol;
+      $('day').value = it.day;
+      $('ts').value = it.ts;
+      await doLoad(true);
+    } catch (e) {
+      setErr(`Failed to load drill: ${e?.message ?? e}`);
+    }
+  });
+  loadDrills();
+}
+
+function subscribeCatalogEvents(){
+  if (catalogEvents || POPOUT) return;
+  catalogEvents = new EventSource('/api/catalog/events');
+  catalogEvents.onmessage = (ev)=>{
+    let msg = null;
+    try { msg = JSON.parse(ev.data); } catch { return; }
+    if (msg?.type === 'catalog_delta') _applyCatalogDelta(msg);
+  };
+  // EventSource reconnects on its own (server sends retry:); nothing to do on error.
+}
+
 async function initCatalogDropdown(){
   const sel = $('catalog');
   if (!sel) return;
@@ -216,18 +361,10 @@ async function initCatalogDropdown(){
     const items = Array.isArray(data?.items) ? data.items : [];
     sel.innerHTML = `<option value="">Sessions…</option>`;
     for (const it of items){
-      const sym = String(it.symbol || '').trim();
-      const day = String(it.day || '').trim();
-      const ts = String(it.start_et || '').trim();
-      const label = String(it.label || '').trim() || `${sym} ${day}`;
-      const id = `${sym}__${day}__${Number(it.start_ts_ns ?? 0)}`;
-      catalogMap.set(id, {symbol: sym, day, ts, label});
-      const opt = document.createElement('option');
-      opt.value = id;
-      opt.textContent = label;
-      sel.appendChild(opt);
+      sel.appendChild(_catalogOption(it));
     }
     sel.disabled = false;
+    subscribeCatalogEvents();
   } catch (e) {
     sel.innerHTML = `<option value="">(catalog error)</option>`;
     sel.disabled = false;
@@ -575,7 +712,10 @@ let loadedStartNs = null;    // snapshot anchor (requested time)
 let isPaused = true;
 let lastTapeTsSeen = null;   // for monotonic tape rendering (prevents "time going backwards" on resume/reconnect)
 let lastTrade = null;        // last trade seen (for initializing live higher-TF candles)
-let sessionStats = { open: null, hi: null, lo: null, pcl: null }; // best-effort quote-like fields
+let sessionStats = { open: null, hi: null, lo: null, pcl: null, volume: null, vwapNum: null }; // best-effort quote-like fields
+const MULTI_STREAM_MAX_SYMBOLS = 8; // keep in sync with the backend limit for /api/stream_multi
+const watchQuotes = new Map(); // non-primary symbol -> { bid, ask, last, first } (multi-symbol replay)
+let _watchRenderTimer = null;
 
 // ---------------- Simulator settings (disk-backed via Configs/settings.json) ----------------
 const SIM_SETTINGS_STORAGE_KEY = 'sim-settings-v1';
@@ -584,9 +724,51 @@ const SIM_SETTINGS_DEFAULTS = {
   allowShorting: false,
   buyingPowerEnabled: true,
   buyingPower: 1800,
+  // Order routing latency (intent -> arrival at the book). Orders match against the book at arrival.
+  latency: {
+    mode: 'none',      // none | fixed | uniform | lognormal
+    fixedMs: 30,
+    minMs: 10,
+    maxMs: 60,
+    medianMs: 30,
+    sigma: 0.5,        // lognormal shape (jitter)
+    seed: 1,           // deterministic per-order draws (same seed + order sequence -> same latency)
+    routes: {},        // ROUTE -> fixed ms override (e.g. { SMRTL: 35, ARCA: 20 })
+  },
 };
 let simSettings = null;
 
+const LATENCY_MODES = ['none', 'fixed', 'uniform', 'lognormal'];
+const LATENCY_MAX_MS = 5000;
+
+function _normalizeLatency(obj){
+  const out = JSON.parse(JSON.stringify(SIM_SETTINGS_DEFAULTS.latency));
+  if (!obj || typeof obj !== 'object') return out;
+  const ms = (v, d)=>{
+    const n = Number(v);
+    return (Number.isFinite(n) && n >= 0) ? Math.min(LATENCY_MAX_MS, n) : d;
+  };
+  const mode = String(obj.mode || '').toLowerCase();
+  out.mode = LATENCY_MODES.includes(mode) ? mode : out.mode;
+  out.fixedMs = ms(obj.fixedMs, out.fixedMs);
+  out.minMs = ms(obj.minMs, out.minMs);
+  out.maxMs = Math.max(out.minMs, ms(obj.maxMs, out.maxMs));
+  out.medianMs = ms(obj.medianMs, out.medianMs);
+  const sg = Number(obj.sigma);
+  out.sigma = (Number.isFinite(sg) && sg >= 0) ? Math.min(3, sg) : out.sigma;
+  const seed = Math.floor(Number(obj.seed));
+  out.seed = Number.isFinite(seed) ? seed : out.seed;
+  out.routes = {};
+  if (obj.routes && typeof obj.routes === 'object') {
+    for (const [k, v] of Object.entries(obj.routes)){
+      const key = String(k || '').trim().toUpperCase();
+      const n = Number(v);
+      if (key && Number.isFinite(n) && n >= 0) out.routes[key] = Math.min(LATENCY_MAX_MS, n);
+    }
+  }
+  return out;
+}
+
 function _normalizeSimSettings(obj){
   const out = JSON.parse(JSON.stringify(SIM_SETTINGS_DEFAULTS));
   if (!obj || typeof obj !== 'object') return out;
@@ -595,6 +777,7 @@ function _normalizeSimSettings(obj){
   out.buyingPowerEnabled = (obj.buyingPowerEnabled == null) ? out.buyingPowerEnabled : !!obj.buyingPowerEnabled;
   const bp = Number(obj.buyingPower);
   out.buyingPower = (Number.isFinite(bp) && bp >= 0) ? bp : out.buyingPower;
+  out.latency = _normalizeLatency(obj.latency);
   return out;
 }
 
@@ -633,6 +816,11 @@ function _buyingPower(){
   return (Number.isFinite(bp) && bp >= 0) ? bp : 0;
 }
 
+function _latencySettings(){
+  if (!simSettings) simSettings = loadSimSettings();
+  return simSettings.latency || _normalizeLatency(null);
+}
+
 function _wouldGoShort(symbol, side, qty){
   const sym = String(symbol || '').toUpperCase();
   const s = String(side || '').toUpperCase();
@@ -685,7 +873,7 @@ function _openBuyNotional(sym){
   for (const o of orders.values()){
     if (!o) continue;
     if (String(o.symbol).toUpperCase() !== symbol) continue;
-    if (o.status !== 'open' && o.status !== 'partial') continue;
+    if (o.status !== 'open' && o.status !== 'partial' && o.status !== 'pending') continue;
     if (o.cancelledAtNs != null) continue;
     if (String(o.side).toUpperCase() !== 'BUY') continue;
     const rem = _orderRemaining(o);
@@ -776,8 +964,10 @@ function _scheduleReplayFlush(){
         if (lastTapeTsSeen != null && tr.ts_event < lastTapeTsSeen) continue;
         lastTapeTsSeen = tr.ts_event;
         lastTrade = tr;
+        try { _releaseArrivedOrders(Number(tr.ts_event)); } catch {}
         try { maybeTriggerStopsFromTrade(tr); } catch {}
         try { maybeFillFromTrade(tr); } catch {}
+        try { _trackExcursions(tr); } catch {}
         // drive higher-TF charts' in-progress bar close/high/low/volume in real-time
         try {
           for (const ch of charts.values()) {
@@ -792,6 +982,14 @@ function _scheduleReplayFlush(){
       appendTapeBatch(slice);
     }
 
+    // Orders in flight (routing latency) reach the book once replay time passes their arrival.
+    const releaseTs = (Array.isArray(remainder) && remainder.length)
+      ? (procTrades?.length ? procTrades[procTrades.length-1]?.ts_event : null)
+      : maxTs;
+    if (releaseTs != null) {
+      try { _releaseArrivedOrders(Number(releaseTs)); } catch {}
+    }
+
     // Trading UI refresh once per frame (positions / working orders / etc.)
     if (book || (Array.isArray(procTrades) && procTrades.length)) {
       try { renderPositions(); } catch {}
@@ -1208,8 +1406,26 @@ const TF_NS = {
   '5m': 300e9,
 };
 
+// Any "<N>s|m|h" timeframe (the server derives candles for ones without a prebuilt parquet).
 function tfNs(tf){
-  return TF_NS[tf] || 1e9;
+  if (TF_NS[tf]) return TF_NS[tf];
+  const m = /^(\d+)([smh])$/.exec(String(tf || '').trim());
+  if (!m || Number(m[1]) <= 0) return 1e9;
+  return Number(m[1]) * ({ s: 1e9, m: 60e9, h: 3600e9 })[m[2]];
+}
+
+// Trade-bar timeframes, built from the tape: "<N>t" (N prints), "<N>v" (N shares), "<N>r" (N cents of range).
+function barSpec(tf){
+  const m = /^(\d+)([tvr])$/.exec(String(tf || '').trim());
+  return (m && Number(m[1]) > 0) ? { kind: m[2], size: Number(m[1]) } : null;
+}
+
+// Same close rules as Simulator/BarEngines.py (the print that reaches the size / range belongs to the bar).
+function _tradeBarDone(spec, c){
+  if (!c) return true;
+  if (spec.kind === 't') return Number(c.n || 0) >= spec.size;
+  if (spec.kind === 'v') return Number(c.v || 0) >= spec.size;
+  return (Number(c.h) - Number(c.l)) >= spec.size / 100 - 1e-9;
 }
 
 // ---------------- TradingView Lightweight Charts ----------------
@@ -1260,7 +1476,7 @@ function tvInit(chart){
     const ms = Number(sec) * 1000;
     if (!Number.isFinite(ms)) return '';
     const d = new Date(ms);
-    const showSeconds = (tf === '1s' || tf === '10s');
+    const showSeconds = (tfNs(tf) < 60e9);
     const opts = showSeconds
       ? { timeZone: ET, hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false }
       : { timeZone: ET, hour: '2-digit', minute: '2-digit', hour12: false };
@@ -1328,7 +1544,7 @@ function tvInit(chart){
       timeScale: {
         borderColor: 'rgba(34,48,69,0.8)',
         timeVisible: true,
-        secondsVisible: (chart.tf === '1s' || chart.tf === '10s'),
+        secondsVisible: (tfNs(chart.tf) < 60e9),
         tickMarkFormatter: _tvTickMarkFormatter,
       },
       crosshair: (_tvCrosshairModeNormal() != null) ? { mode: _tvCrosshairModeNormal() } : undefined,
@@ -1337,7 +1553,7 @@ function tvInit(chart){
     // Some versions use applyOptions for localization; do both, safely.
     try { chart.tv.applyOptions({
       localization: { timeFormatter: _tvTimeFormatter },
-      timeScale: { tickMarkFormatter: _tvTickMarkFormatter, secondsVisible: (chart.tf === '1s' || chart.tf === '10s') },
+      timeScale: { tickMarkFormatter: _tvTickMarkFormatter, secondsVisible: (tfNs(chart.tf) < 60e9) },
       rightPriceScale: { scaleMargins: { top: 0.05, bottom: 0.22 } },
     }); } catch {}
   } catch (e) {
@@ -1629,7 +1845,7 @@ function tvEnsureIndicators(chart){
       try {
         const _macdTimeFmt = (t)=> {
           if (typeof t === 'number') {
-            const showSeconds = (chart.tf === '1s' || chart.tf === '10s');
+            const showSeconds = (tfNs(chart.tf) < 60e9);
             const opts = showSeconds
               ? { timeZone: ET, hour:'2-digit', minute:'2-digit', second:'2-digit', hour12:false }
               : { timeZone: ET, hour:'2-digit', minute:'2-digit', hour12:false };
@@ -1645,7 +1861,7 @@ function tvEnsureIndicators(chart){
           timeScale: {
             borderColor: 'rgba(34,48,69,0.8)',
             timeVisible: true,
-            secondsVisible: (chart.tf === '1s' || chart.tf === '10s'),
+            secondsVisible: (tfNs(chart.tf) < 60e9),
             tickMarkFormatter: _macdTickFmt,
           },
           handleScroll: false,
@@ -1720,11 +1936,13 @@ function flushPendingCandles(chart){
   if (!chart.pendingCandles || chart.pendingCandles.size === 0) return;
   if (playheadNs == null) return;
   const tfn = tfNs(chart.tf);
+  const spec = barSpec(chart.tf);
   // Only apply candles that are fully in the past relative to the playhead.
   const ready = [];
   for (const [t, c] of chart.pendingCandles.entries()){
     if (!Number.isFinite(t)) continue;
-    if (Number(t) + tfn <= Number(playheadNs)) ready.push(Number(t));
+    const doneNs = spec ? Number(c?.te) : Number(t) + tfn;
+    if (doneNs <= Number(playheadNs)) ready.push(Number(t));
   }
   if (!ready.length) return;
   ready.sort((a,b)=>a-b);
@@ -1764,9 +1982,32 @@ function _upsertCandleRaw(chart, c){
   }
 }
 
+function _updateTradeBar(chart, spec, tsNs, price, size){
+  const last = chart.candles.length ? chart.candles[chart.candles.length-1] : null;
+  const vAdd = Number(size || 0);
+  if (last && chart.liveBucket === last.t && !_tradeBarDone(spec, last)){
+    last.c = price;
+    last.h = Math.max(last.h, price);
+    last.l = Math.min(last.l, price);
+    last.v = Number(last.v || 0) + vAdd;
+    last.n = Number(last.n || 0) + 1;
+    last.te = tsNs;
+  } else {
+    // Chart slot as in BarEngines: the print's second, at least one second after the previous bar.
+    const sec = Math.floor(tsNs / 1e9) * 1e9;
+    const t = last ? Math.max(sec, last.t + 1e9) : sec;
+    chart.candles.push({t, t0: tsNs, te: tsNs, o: price, h: price, l: price, c: price, v: vAdd, n: 1});
+    chart.liveBucket = t;
+  }
+  _scheduleRedraw(chart);
+  flushPendingCandles(chart);
+}
+
 function updateChartFromTrade(chart, tsNs, price, size){
   if (!chart || chart.tf === '1s') return;
   if (!Number.isFinite(tsNs) || !Number.isFinite(price)) return;
+  const spec = barSpec(chart.tf);
+  if (spec) { _updateTradeBar(chart, spec, tsNs, price, size); return; }
   const tfn = tfNs(chart.tf);
   const bucket = Math.floor(tsNs / tfn) * tfn;
   chart.liveBucket = bucket;
@@ -2082,7 +2323,8 @@ const POS_COLS_ALL = [
 const POS_COLS_KEY = 'sim-pos-cols-v1';
 let posCols = null; // array of keys
 
-// positions: symbol -> { shares:number (signed; short negative), avgCost:number|null, realized:number }
+// positions: symbol -> { shares:number (signed; short negative), avgCost:number|null, realized:number,
+//                        exHi/exLo:number|null (print extremes since the position opened; MAE/MFE source) }
 const positions = new Map();
 
 // orders + fills (simple simulator)
@@ -2095,6 +2337,189 @@ let fills = []; // newest last; each: {id, orderId, ts_ns, symbol, side, qty, pr
 const TAKE_PARTICIPATION = 0.85;    // aggressive fills vs book liquidity
 const PASSIVE_PARTICIPATION = 0.40; // passive limit fills vs prints at our price (after queueAhead clears)
 
+// ---------------- Trading event log (event-sourced orders / fills / positions) ----------------
+// Every state change appends an event carrying the order snapshot after the change (plus the fill, if any).
+// A checkpoint of the full trading state is taken every TRADING_CHECKPOINT_EVERY events, keyed by playhead ns,
+// so a rewind restores the nearest checkpoint and replays only the tail instead of every fill.
+// The log is also posted (batched) to /api/trading/log so a session survives page reloads.
+const TRADING_CHECKPOINT_EVERY = 64;
+const TRADING_SESSION_KEY = 'sim-trading-session-v1';
+let tradingSessionId = null;
+let tradingLog = [];         // [{ts_ns, kind, order, fill}]; ts_ns is clamped to be non-decreasing
+let tradingCheckpoints = []; // [{idx, ts_ns, orders, positions, fillsLen}] ascending by idx
+let _tradingReplaying = false;
+let _tradingOutbox = [];
+let _tradingFlushTimer = null;
+
+function _logTrading(kind, order, fill, ts_ns){
+  if (_tradingReplaying) return;
+  const last = tradingLog.length ? tradingLog[tradingLog.length-1].ts_ns : null;
+  let ts = Number(ts_ns ?? playheadNs ?? loadedStartNs);
+  if (!Number.isFinite(ts)) ts = (last ?? 0);
+  if (last != null && ts < last) ts = last;
+  const ev = {
+    ts_ns: ts,
+    kind,
+    order: order ? _clone(order) : null,
+    fill: fill ? _clone(fill) : null,
+  };
+  tradingLog.push(ev);
+  if (tradingLog.length % TRADING_CHECKPOINT_EVERY === 0) _takeTradingCheckpoint();
+  _persistTrading(Object.assign({ type: 'event' }, ev));
+}
+
+function _takeTradingCheckpoint(){
+  tradingCheckpoints.push({
+    idx: tradingLog.length,
+    ts_ns: tradingLog.length ? tradingLog[tradingLog.length-1].ts_ns : null,
+    orders: Array.from(orders.values()).map(_clone),
+    positions: Array.from(positions.entries()).map(([k, v])=>[k, _clone(v)]),
+    fillsLen: fills.length,
+  });
+}
+
+function _applyTradingEvent(ev){
+  if (ev.order) orders.set(ev.order.id, _clone(ev.order));
+  if (ev.fill) {
+    const f = _clone(ev.fill);
+    const r = _applyFillToPositions(f);
+    if (r && r.realized != null && Number.isFinite(r.realized)) f.realized = r.realized;
+    fills.push(f);
+  }
+}
+
+// Restore trading state to the playhead `t`: nearest checkpoint at or before the cut + replay of the tail.
+// Returns false (and touches nothing) when no event happened after `t`.
+function _rewindTradingTo(t){
+  let lo = 0, hi = tradingLog.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (tradingLog[mid].ts_ns <= t) lo = mid + 1;
+    else hi = mid;
+  }
+  const cut = lo;
+  if (cut >= tradingLog.length) return false;
+
+  let c0 = 0, c1 = tradingCheckpoints.length;
+  while (c0 < c1) {
+    const mid = (c0 + c1) >> 1;
+    if (tradingCheckpoints[mid].idx <= cut) c0 = mid + 1;
+    else c1 = mid;
+  }
+  const cp = (c0 > 0) ? tradingCheckpoints[c0 - 1] : null;
+
+  orders.clear();
+  positions.clear();
+  fills.length = cp ? cp.fillsLen : 0;
+  if (cp) {
+    for (const o of cp.orders) orders.set(o.id, _clone(o));
+    for (const [k, v] of cp.positions) positions.set(k, _clone(v));
+  }
+  const wasReplaying = _tradingReplaying;
+  _tradingReplaying = true;
+  try {
+    for (let i = (cp ? cp.idx : 0); i < cut; i++) _applyTradingEvent(tradingLog[i]);
+  } finally {
+    _tradingReplaying = wasReplaying;
+  }
+  tradingLog.length = cut;
+  tradingCheckpoints.length = c0;
+  if (_histFromIdx > fills.length) _histFromIdx = fills.length;
+  _persistTrading({ type: 'rewind', ts_ns: t });
+  return true;
+}
+
+function _persistTrading(rec){
+  if (_tradingReplaying || POPOUT || !tradingSessionId) return;
+  _tradingOutbox.push(rec);
+  if (_tradingFlushTimer == null) _tradingFlushTimer = setTimeout(_flushTradingOutbox, 250);
+}
+
+function _tradingCtx(){
+  return {
+    symbol: $('symbol')?.value?.trim?.() ?? '',
+    day: $('day')?.value?.trim?.() ?? '',
+    playhead_ns: playheadNs,
+  };
+}
+
+async function _flushTradingOutbox(){
+  _tradingFlushTimer = null;
+  if (!_tradingOutbox.length || !tradingSessionId) return;
+  const records = _tradingOutbox;
+  _tradingOutbox = [];
+  try {
+    const res = await fetch('/api/trading/log', {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({ session: tradingSessionId, ctx: _tradingCtx(), records }),
+    });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  } catch {
+    // Keep order: failed batch goes back in front; retry later.
+    _tradingOutbox = records.concat(_tradingOutbox);
+    if (_tradingFlushTimer == null) _tradingFlushTimer = setTimeout(_flushTradingOutbox, 2000);
+  }
+}
+
+function _newTradingSessionId(){
+  return `s${Date.now().toString(36)}${Math.random().toString(36).slice(2, 8)}`;
+}
+
+// Rebuild trading state from the persisted session log. Returns the last saved replay context
+// ({symbol, day, playhead_ns}) so the UI can reopen where the session left off.
+async function restoreTradingSession(){
+  try { tradingSessionId = localStorage.getItem(TRADING_SESSION_KEY) || null; } catch {}
+  if (!tradingSessionId) {
+    tradingSessionId = _newTradingSessionId();
+    try { localStorage.setItem(TRADING_SESSION_KEY, tradingSessionId); } catch {}
+    return null;
+  }
+  const res = await fetch(`/api/trading/log?session=${encodeURIComponent(tradingSessionId)}`);
+  const data = await res.json().catch(()=>null);
+  if (!res.ok || !Array.isArray(data?.records)) return null;
+  let ctx = null;
+  _tradingReplaying = true;
+  try {
+    for (const rec of data.records){
+      if (!rec || typeof rec !== 'object') continue;
+      if (rec.type === 'ctx') { ctx = rec; continue; }
+      if (rec.type === 'rewind') { _rewindTradingTo(Number(rec.ts_ns)); continue; }
+      if (rec.type !== 'event') continue;
+      const ev = { ts_ns: Number(rec.ts_ns), kind: rec.kind, order: rec.order || null, fill: rec.fill || null };
+      tradingLog.push(ev);
+      _applyTradingEvent(ev);
+      if (tradingLog.length % TRADING_CHECKPOINT_EVERY === 0) _takeTradingCheckpoint();
+    }
+  } finally {
+    _tradingReplaying = false;
+  }
+  // Continue id sequences after the restored ones.
+  for (const o of orders.values()) _orderSeq = Math.max(_orderSeq, Number(String(o.id).slice(1)) || 0);
+  for (const f of fills) _fillSeq = Math.max(_fillSeq, Number(String(f.id).slice(1)) || 0);
+  _inFlight = [];
+  for (const o of orders.values()){
+    if (o.status === 'pending') _enqueueInFlight(o);
+  }
+  return ctx;
+}
+
+function startNewTradingSession(){
+  orders.clear();
+  positions.clear();
+  fills = [];
+  _inFlight = [];
+  tradingLog = [];
+  tradingCheckpoints = [];
+  _tradingOutbox = [];
+  _histFromIdx = 0;
+  tradingSessionId = _newTradingSessionId();
+  try { localStorage.setItem(TRADING_SESSION_KEY, tradingSessionId); } catch {}
+  renderPositions();
+  renderHistory();
+  renderOpenOrders();
+}
+
 // ---------------- Layout persistence ----------------
 const LAYOUT_STORAGE_KEY = 'sim-layout-v1';
 function _numPx(s, d=0){
@@ -2457,7 +2882,7 @@ function executeCommand(cmdId, args){
   if (id === 'risk.cancel_all_orders') {
     const nowNs = (playheadNs ?? loadedStartNs ?? null);
     for (const o of orders.values()){
-      if (o && (o.status === 'open' || o.status === 'partial')) cancelOrder(o.id, nowNs);
+      if (o && (o.status === 'open' || o.status === 'partial' || o.status === 'pending')) cancelOrder(o.id, nowNs);
     }
     renderOpenOrders();
     setStatus('Cancelled all open orders');
@@ -2668,6 +3093,10 @@ function _envSnapshot(){
       if (n === 'lo') return (sessionStats?.lo == null) ? null : Number(sessionStats.lo);
       if (n === 'open') return (sessionStats?.open == null) ? null : Number(sessionStats.open);
       if (n === 'pcl') return (sessionStats?.pcl == null) ? null : Number(sessionStats.pcl);
+      if (n === 'pdh') return (sessionStats?.pdh == null) ? null : Number(sessionStats.pdh);
+      if (n === 'pdl') return (sessionStats?.pdl == null) ? null : Number(sessionStats.pdl);
+      if (n === 'pmh') return (sessionStats?.pmh == null) ? null : Number(sessionStats.pmh);
+      if (n === 'pml') return (sessionStats?.pml == null) ? null : Number(sessionStats.pml);
       if (n === 'l2bid') return frozenBid;
       if (n === 'l2ask') return frozenAsk;
       if (n === 'buypower') return _buyingPower();
@@ -3051,6 +3480,48 @@ function makeSettingsHtml(){
             <div class="setHint">
               When enabled, BUY orders that would increase net long exposure above this limit are rejected (uses best-effort estimates).
             </div>
+            <div style="height:14px;"></div>
+            <div style="height:1px; background: rgba(34,48,69,0.65);"></div>
+            <div style="height:14px;"></div>
+            <div style="color:var(--muted); font-size:12px; font-weight:900;">Order Latency</div>
+            <div style="height:10px;"></div>
+            <label class="hint" style="display:flex; align-items:center; gap:10px;">
+              Model
+              <select id="set-lat-mode">
+                <option value="none">None (instant)</option>
+                <option value="fixed">Fixed</option>
+                <option value="uniform">Uniform (min..max)</option>
+                <option value="lognormal">Lognormal (median + jitter)</option>
+              </select>
+            </label>
+            <div style="height:8px;"></div>
+            <div class="setRow" style="gap:14px; flex-wrap:wrap;">
+              <label class="hint" data-lat="fixed" style="display:flex; align-items:center; gap:8px;">
+                Fixed (ms) <input id="set-lat-fixed" class="num" type="number" min="0" step="1" style="width:80px;"/>
+              </label>
+              <label class="hint" data-lat="uniform" style="display:flex; align-items:center; gap:8px;">
+                Min (ms) <input id="set-lat-min" class="num" type="number" min="0" step="1" style="width:80px;"/>
+              </label>
+              <label class="hint" data-lat="uniform" style="display:flex; align-items:center; gap:8px;">
+                Max (ms) <input id="set-lat-max" class="num" type="number" min="0" step="1" style="width:80px;"/>
+              </label>
+              <label class="hint" data-lat="lognormal" style="display:flex; align-items:center; gap:8px;">
+                Median (ms) <input id="set-lat-median" class="num" type="number" min="0" step="1" style="width:80px;"/>
+              </label>
+              <label class="hint" data-lat="lognormal" style="display:flex; align-items:center; gap:8px;">
+                Jitter (σ) <input id="set-lat-sigma" class="num" type="number" min="0" max="3" step="0.05" style="width:80px;"/>
+              </label>
+            </div>
+            <div style="height:8px;"></div>
+            <label class="hint" style="display:flex; align-items:center; gap:10px;">
+              Per-route (ms)
+              <input id="set-lat-routes" placeholder="SMRTL=35, ARCA=20" style="width:260px;"/>
+            </label>
+            <div style="height:8px;"></div>
+            <div class="setHint">
+              Orders are sent at the playhead and reach the book after the sampled delay; they match against the book at arrival.
+              A route listed here always uses its fixed delay. Draws are seeded per order, so replays are deterministic.
+            </div>
           </div>
         </div>
         <div class="setPane" id="set-pane-layout" style="display:none;">
@@ -3150,6 +3621,54 @@ function initSettingsWindow(){
       saveSimSettings();
       setStatus(`Buying power set to $${Number(simSettings.buyingPower).toFixed(0)}`);
     });
+
+    // Order latency controls
+    const latModeEl = document.getElementById('set-lat-mode');
+    const latFields = {
+      fixedMs: document.getElementById('set-lat-fixed'),
+      minMs: document.getElementById('set-lat-min'),
+      maxMs: document.getElementById('set-lat-max'),
+      medianMs: document.getElementById('set-lat-median'),
+      sigma: document.getElementById('set-lat-sigma'),
+    };
+    const latRoutesEl = document.getElementById('set-lat-routes');
+    const fmtRoutes = (routes)=> Object.entries(routes || {}).map(([k, v])=>`${k}=${v}`).join(', ');
+    const parseRoutes = (text)=>{
+      const out = {};
+      for (const part of String(text || '').split(/[,;]/)){
+        const m = part.match(/^\s*([A-Za-z0-9_.-]+)\s*[=:]\s*([0-9.]+)\s*$/);
+        if (m) out[m[1].toUpperCase()] = Number(m[2]);
+      }
+      return out;
+    };
+    const syncLatUi = ()=>{
+      const lat = _latencySettings();
+      if (latModeEl) latModeEl.value = lat.mode;
+      for (const [k, el] of Object.entries(latFields)){
+        if (el) el.value = String(lat[k]);
+      }
+      if (latRoutesEl) latRoutesEl.value = fmtRoutes(lat.routes);
+      document.querySelectorAll('[data-lat]').forEach(el=>{
+        el.style.display = (el.getAttribute('data-lat') === lat.mode) ? 'flex' : 'none';
+      });
+    };
+    const commitLat = ()=>{
+      if (!simSettings) simSettings = loadSimSettings();
+      const next = Object.assign({}, _latencySettings(), { mode: latModeEl?.value || 'none' });
+      for (const [k, el] of Object.entries(latFields)){
+        if (el && String(el.value).trim() !== '') next[k] = Number(el.value);
+      }
+      next.routes = parseRoutes(latRoutesEl?.value);
+      simSettings.latency = _normalizeLatency(next);
+      saveSimSettings();
+      syncLatUi();
+      const lat = simSettings.latency;
+      setStatus(lat.mode === 'none' ? 'Order latency disabled' : `Order latency: ${lat.mode}`);
+    };
+    syncLatUi();
+    latModeEl?.addEventListener('change', commitLat);
+    for (const el of Object.values(latFields)) el?.addEventListener('change', commitLat);
+    latRoutesEl?.addEventListener('change', commitLat);
   } catch {}
   document.getElementById('layoutSaveAs')?.addEventListener('click', async (e)=>{
     e.preventDefault();
@@ -3526,7 +4045,10 @@ function makeHistoryHtml(){
     <div style="display:flex; flex-direction:column; gap:10px; height:100%; min-height:0;">
       <div style="display:flex; align-items:center; justify-content:space-between; gap:10px;">
         <div style="color:var(--muted); font-size:12px; font-weight:800;">Trading History</div>
-        <button class="wbtn" id="hist-clear" title="Clear (local session)">Clear</button>
+        <div style="display:flex; gap:8px;">
+          <button class="wbtn" id="hist-new-session" title="Reset orders/fills/positions and start a new persisted session">New Session</button>
+          <button class="wbtn" id="hist-clear" title="Clear (local session)">Clear</button>
+        </div>
       </div>
       <div style="flex:1 1 auto; min-height:0; overflow:auto;">
         <table class="posTable">
@@ -3550,12 +4072,15 @@ function makeHistoryHtml(){
   `;
 }
 
+let _histFromIdx = 0; // "Clear" hides fills before this index (the trading log itself is kept)
+
 function renderHistory(){
   const body = $('hist-body');
   const empty = $('hist-empty');
   if (!body || !empty) return;
   const rows = [];
-  for (const f of fills){
+  for (let i = _histFromIdx; i < fills.length; i++){
+    const f = fills[i];
     const t = f.ts_ns ? nsToEt(f.ts_ns) : '';
     const cls = (f.realized != null && Number.isFinite(f.realized)) ? (f.realized >= 0 ? 'posUp' : 'posDn') : '';
     const rp = (f.realized != null && Number.isFinite(f.realized)) ? `<span class="${cls}">${Number(f.realized).toFixed(2)}</span>` : '';
@@ -3620,10 +4145,11 @@ function _orderRemaining(o){
 function cancelOrder(orderId, ts_ns){
   const o = orders.get(orderId);
   if (!o) return;
-  if (o.status !== 'open' && o.status !== 'partial') return;
+  if (o.status !== 'open' && o.status !== 'partial' && o.status !== 'pending') return;
   o.status = 'cancelled';
   o.cancelledAtNs = (ts_ns ?? playheadNs ?? loadedStartNs ?? null);
   orders.set(o.id, o);
+  _logTrading('cancel', o, null, o.cancelledAtNs);
   renderOpenOrders();
 }
 
@@ -3633,7 +4159,7 @@ function renderOpenOrders(){
   if (!body || !empty) return;
   const rows = [];
   const list = Array.from(orders.values())
-    .filter(o=> o && (o.status === 'open' || o.status === 'partial'))
+    .filter(o=> o && (o.status === 'open' || o.status === 'partial' || o.status === 'pending'))
     .sort((a,b)=> Number(a.ts_intent_ns ?? 0) - Number(b.ts_intent_ns ?? 0));
 
   for (const o of list){
@@ -3690,10 +4216,12 @@ function _applyFillToPositions(fill){
   const nextSh = prevSh + delta;
 
   let realized = 0;
+  let mae = null, mfe = null;
   if (prevSh === 0 || prevCost == null || !Number.isFinite(prevCost)) {
     // opening new position
     pos.shares = nextSh;
     pos.avgCost = (nextSh === 0) ? null : px;
+    pos.exHi = pos.exLo = (nextSh === 0) ? null : px;
   } else if ((prevSh > 0 && delta > 0) || (prevSh < 0 && delta < 0)) {
     // increasing same direction: weighted average cost
     const a0 = Math.abs(prevSh);
@@ -3708,9 +4236,18 @@ function _applyFillToPositions(fill){
     realized = closeQty * (px - prevCost) * signPrev;
     pos.realized = Number(pos.realized || 0) + realized;
     pos.shares = nextSh;
+    const flipped = (prevSh > 0 && nextSh < 0) || (prevSh < 0 && nextSh > 0);
+    if (nextSh === 0 || flipped) {
+      // round trip closed: per-share excursions vs average cost (exit print included)
+      const hi = Math.max(Number(pos.exHi ?? px), px);
+      const lo = Math.min(Number(pos.exLo ?? px), px);
+      mfe = Math.max(0, signPrev > 0 ? hi - prevCost : prevCost - lo);
+      mae = Math.max(0, signPrev > 0 ? prevCost - lo : hi - prevCost);
+      pos.exHi = pos.exLo = (nextSh === 0) ? null : px;
+    }
     if (nextSh === 0) {
       pos.avgCost = null;
-    } else if ((prevSh > 0 && nextSh < 0) || (prevSh < 0 && nextSh > 0)) {
+    } else if (flipped) {
       // flipped: leftover opened at fill price
       pos.avgCost = px;
     } else {
@@ -3718,7 +4255,17 @@ function _applyFillToPositions(fill){
       pos.avgCost = prevCost;
     }
   }
-  return { realized };
+  return { realized, mae, mfe };
+}
+
+// Widen open positions' print extremes (feeds MAE/MFE on the closing fill).
+function _trackExcursions(tr){
+  const px = Number(tr?.price);
+  if (!Number.isFinite(px) || px <= 0) return;
+  const pos = positions.get(String($('symbol')?.value || '').trim().toUpperCase());
+  if (!pos || !Number(pos.shares)) return;
+  if (pos.exHi == null || px > pos.exHi) pos.exHi = px;
+  if (pos.exLo == null || px < pos.exLo) pos.exLo = px;
 }
 
 function _bestPxForMarket(side){
@@ -3769,11 +4316,13 @@ function _recordFill(order, price, fillQty, ts_ns){
   };
   const r = _applyFillToPositions(fill);
   if (r && r.realized != null && Number.isFinite(r.realized)) fill.realized = r.realized;
+  if (r && r.mae != null) { fill.mae = r.mae; fill.mfe = r.mfe; }
   fills.push(fill);
   order.filledQty = Number(order.filledQty || 0) + qty;
   const rem = _orderRemaining(order);
   order.status = rem === 0 ? 'filled' : 'partial';
   orders.set(order.id, order);
+  _logTrading('fill', order, fill, ts_ns);
   renderPositions();
   renderHistory();
   renderOpenOrders();
@@ -3788,6 +4337,7 @@ function maybeTriggerStopsFromTrade(tr){
   const candidates = Array.from(orders.values())
     .filter(o=>{
       if (!o) return false;
+      if (!_isActiveSymbol(o)) return false;
       const t = String(o.type || '').toUpperCase();
       if (t !== 'STOP' && t !== 'STOPLMT') return false;
       if (o.status !== 'open' && o.status !== 'partial') return false;
@@ -3811,6 +4361,7 @@ function maybeTriggerStopsFromTrade(tr){
       if (!chk.ok) {
         o.status = 'rejected';
         orders.set(o.id, o);
+        _logTrading('reject', o, null, ts);
         renderOpenOrders();
         setStatus(`Rejected ${o.id}: ${chk.reason || 'buying power exceeded'}`);
         continue;
@@ -3823,6 +4374,7 @@ function maybeTriggerStopsFromTrade(tr){
       if (_wouldGoShort(o.symbol, 'SELL', rem)) {
         o.status = 'rejected';
         orders.set(o.id, o);
+        _logTrading('reject', o, null, ts);
         renderOpenOrders();
         setStatus(`Rejected ${o.id}: shorting disabled`);
         continue;
@@ -3835,6 +4387,7 @@ function maybeTriggerStopsFromTrade(tr){
     if (t === 'STOP') o.type = 'MKT';
     if (t === 'STOPLMT') o.type = 'LMT';
     orders.set(o.id, o);
+    _logTrading('trigger', o, null, ts);
 
     // Try to fill immediately if it became aggressive/marketable.
     if (String(o.type).toUpperCase() === 'MKT') {
@@ -3860,6 +4413,7 @@ function maybeTriggerStopsFromTrade(tr){
         }
         o.queueAhead = qa;
         orders.set(o.id, o);
+        _logTrading('rest', o, null, ts);
         renderOpenOrders();
       }
     }
@@ -3898,11 +4452,18 @@ function _sweepAgainstBook(order, ts_ns){
   return filled;
 }
 
+// Only the primary symbol's book and prints are live in the UI; orders for other (watched) symbols rest
+// until that symbol becomes primary again.
+function _isActiveSymbol(o){
+  return String(o?.symbol || '').toUpperCase() === _primarySymbol();
+}
+
 function maybeFillOrders(){
   const nowNs = (playheadNs ?? loadedStartNs ?? null);
   // aggressive fills (MKT + marketable LMT) vs book liquidity, partial fill supported
   for (const o of orders.values()){
     if (!o) continue;
+    if (!_isActiveSymbol(o)) continue;
     if (o.status !== 'open' && o.status !== 'partial') continue;
     if (o.cancelledAtNs != null) continue;
     if (String(o.type).toUpperCase() === 'MKT') {
@@ -3930,6 +4491,7 @@ function maybeFillFromTrade(tr){
   const candidates = Array.from(orders.values())
     .filter(o=>{
       if (!o) return false;
+      if (!_isActiveSymbol(o)) return false;
       if (o.status !== 'open' && o.status !== 'partial') return false;
       if (o.cancelledAtNs != null) return false;
       if (String(o.type).toUpperCase() !== 'LMT') return false;
@@ -3964,6 +4526,107 @@ function maybeFillFromTrade(tr){
   }
 }
 
+// ---------------- Order latency (intent -> arrival at the book) ----------------
+// Every streamed book update is kept for a short window so an order arriving N ms after it was sent
+// matches against the book as it was at arrival (not the coalesced book the UI happens to show).
+const BOOK_TIMELINE_KEEP_NS = 10e9; // must exceed LATENCY_MAX_MS so in-flight arrivals stay covered
+let _bookTimeline = []; // [{ts, book}] ascending by ts
+let _bookTimelineHead = 0;
+let _inFlight = []; // orders with status 'pending', ascending by ts_arrival_ns
+
+function _resetBookTimeline(book){
+  _bookTimeline = [];
+  _bookTimelineHead = 0;
+  if (book) _recordBookTimeline(book);
+}
+
+function _recordBookTimeline(book){
+  const ts = Number(book?.ts_event);
+  if (!Number.isFinite(ts)) return;
+  _bookTimeline.push({ ts, book });
+  // Keep the newest entry at-or-before the cutoff so lookups right at the window edge still resolve.
+  const cutoff = ts - BOOK_TIMELINE_KEEP_NS;
+  while (_bookTimelineHead < _bookTimeline.length - 1 && _bookTimeline[_bookTimelineHead + 1].ts <= cutoff) {
+    _bookTimelineHead += 1;
+  }
+  if (_bookTimelineHead > 4096) {
+    _bookTimeline = _bookTimeline.slice(_bookTimelineHead);
+    _bookTimelineHead = 0;
+  }
+}
+
+function _bookAtOrBefore(tsNs){
+  const t = Number(tsNs);
+  let lo = _bookTimelineHead, hi = _bookTimeline.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (_bookTimeline[mid].ts <= t) lo = mid + 1;
+    else hi = mid;
+  }
+  return (lo > _bookTimelineHead) ? _bookTimeline[lo - 1].book : null;
+}
+
+function _mulberry32(a){
+  return function(){
+    a |= 0; a = (a + 0x6D2B79F5) | 0;
+    let t = Math.imul(a ^ (a >>> 15), 1 | a);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function _sampleLatencyMs(route, seq){
+  const lat = _latencySettings();
+  const r = String(route || '').trim().toUpperCase();
+  if (r && lat.routes && Object.prototype.hasOwnProperty.call(lat.routes, r)) return Number(lat.routes[r]);
+  // Seeded per order sequence so a replayed session draws the same latencies.
+  const rnd = _mulberry32(Math.imul(Number(lat.seed) | 0, 0x9E3779B1) ^ (Number(seq) | 0));
+  let ms = 0;
+  if (lat.mode === 'fixed') {
+    ms = Number(lat.fixedMs);
+  } else if (lat.mode === 'uniform') {
+    ms = Number(lat.minMs) + rnd() * (Number(lat.maxMs) - Number(lat.minMs));
+  } else if (lat.mode === 'lognormal') {
+    const u1 = Math.max(1e-12, rnd());
+    const u2 = rnd();
+    const z = Math.sqrt(-2 * Math.log(u1)) * Math.cos(2 * Math.PI * u2);
+    ms = Number(lat.medianMs) * Math.exp(Number(lat.sigma) * z);
+  }
+  if (!Number.isFinite(ms) || ms <= 0) return 0;
+  return Math.min(LATENCY_MAX_MS, ms);
+}
+
+function _enqueueInFlight(order){
+  const t = Number(order.ts_arrival_ns);
+  let lo = 0, hi = _inFlight.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (Number(_inFlight[mid].ts_arrival_ns) <= t) lo = mid + 1;
+    else hi = mid;
+  }
+  _inFlight.splice(lo, 0, order);
+}
+
+function _releaseArrivedOrders(upToNs){
+  const t = Number(upToNs);
+  if (!Number.isFinite(t)) return;
+  while (_inFlight.length && Number(_inFlight[0].ts_arrival_ns) <= t){
+    const o = _inFlight.shift();
+    if (!o || o.status !== 'pending') continue; // cancelled while in flight
+    o.status = 'open';
+    orders.set(o.id, o);
+    const arrivalNs = Number(o.ts_arrival_ns);
+    _logTrading('arrive', o, null, arrivalNs);
+    const liveBook = currentBook;
+    currentBook = _bookAtOrBefore(arrivalNs) || liveBook;
+    try {
+      _onOrderArrival(o, arrivalNs);
+    } finally {
+      currentBook = liveBook;
+    }
+  }
+}
+
 function placeOrder({symbol, side, type, qty, limitPx, stopPx, route, tif, display}){
   const sym = String(symbol || '').trim().toUpperCase();
   const s = String(side || 'BUY').toUpperCase();
@@ -3988,10 +4651,17 @@ function placeOrder({symbol, side, type, qty, limitPx, stopPx, route, tif, displ
     if (_wouldGoShort(sym, 'SELL', q)) { setErr('Order: shorting disabled'); return null; }
   }
 
-  const id = `O${++_orderSeq}`;
+  const seq = ++_orderSeq;
+  const id = `O${seq}`;
+  const latencyMs = (ts_ns == null) ? 0 : _sampleLatencyMs(route, seq);
   const order = {
     id,
     ts_intent_ns: ts_ns,
+    ts_arrival_ns: (ts_ns == null) ? null : Number(ts_ns) + Math.round(latencyMs * 1e6),
+    latencyMs,
+    // NBBO the trader saw when sending; fills at arrival vs this quote is the latency slippage.
+    intentBid: currentBook?.bids?.[0]?.[0] ?? null,
+    intentAsk: currentBook?.asks?.[0]?.[0] ?? null,
     symbol: sym,
     side: s,
     type: t,
@@ -4002,31 +4672,65 @@ function placeOrder({symbol, side, type, qty, limitPx, stopPx, route, tif, displ
     route,
     tif,
     display,
-    status: 'open',
+    status: (latencyMs > 0) ? 'pending' : 'open',
     filledQty: 0,
     cancelledAtNs: null,
     queueAhead: 0,
   };
   orders.set(id, order);
+  _logTrading('new', order, null, ts_ns);
   renderOpenOrders();
 
-  if (t === 'STOP' || t === 'STOPLMT') {
-    setStatus(`Accepted ${s} ${q} ${sym} ${t} (stop ${Number(stp).toFixed(4)}${t==='STOPLMT' ? `, limit ${Number(lim).toFixed(4)}` : ''})`);
+  if (order.status === 'pending') {
+    _enqueueInFlight(order);
+    setStatus(`Routing ${s} ${q} ${sym} ${t} (${latencyMs.toFixed(0)} ms)…`);
     return id;
   }
+  return _onOrderArrival(order, ts_ns) ? id : null;
+}
+
+// Order reached the book at ts_ns: trigger bookkeeping for stops, match marketable orders against
+// `currentBook` (the caller points it at the arrival-time book) and rest the remainder.
+// Returns false if the order was rejected on arrival.
+function _onOrderArrival(order, ts_ns){
+  const id = order.id;
+  const sym = order.symbol;
+  const s = order.side;
+  const t = order.type;
+  const q = order.qty;
+  const lim = order.limitPx;
+  const stp = order.stopPx;
+  const lat = Number(order.latencyMs) > 0 ? ` after ${Number(order.latencyMs).toFixed(0)} ms` : '';
+
+  if (t === 'STOP' || t === 'STOPLMT') {
+    setStatus(`Accepted ${s} ${q} ${sym} ${t} (stop ${Number(stp).toFixed(4)}${t==='STOPLMT' ? `, limit ${Number(lim).toFixed(4)}` : ''})${lat}`);
+    return true;
+  }
+
+  if (!_isActiveSymbol(order)) {
+    setStatus(`Accepted ${s} ${q} ${sym} ${t} (works when ${sym} is the active symbol)${lat}`);
+    return true;
+  }
 
   if (t === 'MKT') {
     // fill as much as available from book now; remainder stays open and will continue to fill on subsequent book updates
     const filled = _sweepAgainstBook(order, ts_ns);
     if (filled === 0) {
       const px = _bestPxForMarket(s);
-      if (px == null) { setErr('Order: no market price available (need book or last trade)'); order.status='rejected'; orders.set(id, order); renderOpenOrders(); return null; }
+      if (px == null) {
+        setErr('Order: no market price available (need book or last trade)');
+        order.status = 'rejected';
+        orders.set(id, order);
+        _logTrading('reject', order, null, ts_ns);
+        renderOpenOrders();
+        return false;
+      }
       // if we only have last trade, fill entire order at that print price (best-effort)
       _recordFill(order, px, _orderRemaining(order), ts_ns);
     }
     const rem = _orderRemaining(order);
-    setStatus(rem === 0 ? `Filled ${s} ${q} ${sym} MKT` : `Partially filled ${s} ${sym} MKT (rem ${rem})`);
-    return id;
+    setStatus(rem === 0 ? `Filled ${s} ${q} ${sym} MKT${lat}` : `Partially filled ${s} ${sym} MKT (rem ${rem})${lat}`);
+    return true;
   }
 
   // LMT: if marketable now, fill against book up to liquidity; remainder rests.
@@ -4036,8 +4740,8 @@ function placeOrder({symbol, side, type, qty, limitPx, stopPx, route, tif, displ
     _sweepAgainstBook(order, ts_ns);
     const rem = _orderRemaining(order);
     setStatus(rem === 0
-      ? `Filled ${s} ${q} ${sym} LMT (limit ${Number(lim).toFixed(4)})`
-      : `Partially filled ${s} ${sym} LMT (rem ${rem}, limit ${Number(lim).toFixed(4)})`);
+      ? `Filled ${s} ${q} ${sym} LMT (limit ${Number(lim).toFixed(4)})${lat}`
+      : `Partially filled ${s} ${sym} LMT (rem ${rem}, limit ${Number(lim).toFixed(4)})${lat}`);
   } else {
     // queueAhead estimation: existing size on our side at the same price
     const bookSide = (s === 'BUY') ? (currentBook?.bids || []) : (currentBook?.asks || []);
@@ -4049,55 +4753,25 @@ function placeOrder({symbol, side, type, qty, limitPx, stopPx, route, tif, displ
     }
     order.queueAhead = qa;
     orders.set(id, order);
+    _logTrading('rest', order, null, ts_ns);
     renderOpenOrders();
-    setStatus(`Accepted ${s} ${q} ${sym} LMT @ ${Number(lim).toFixed(4)} (resting; queue≈${qa})`);
+    setStatus(`Accepted ${s} ${q} ${sym} LMT @ ${Number(lim).toFixed(4)} (resting; queue≈${qa})${lat}`);
   }
-  return id;
+  return true;
 }
 
 function resetTradingToTime(ts_ns){
   const t = (ts_ns == null) ? null : Number(ts_ns);
   if (t == null || !Number.isFinite(t)) return;
 
-  // prune fills after time
-  fills = fills.filter(f=> Number(f.ts_ns) <= t);
+  // Nearest checkpoint + tail replay (no-op when nothing happened after t).
+  _rewindTradingTo(t);
 
-  // reset positions
-  positions.clear();
-
-  // reset orders to open/filled based on remaining fills
-  const fillsByOrder = new Map();
-  for (const f of fills){
-    if (!fillsByOrder.has(f.orderId)) fillsByOrder.set(f.orderId, []);
-    fillsByOrder.get(f.orderId).push(f);
-  }
+  // orders still in flight at t re-enter the arrival queue
+  _inFlight = [];
   for (const o of orders.values()){
-    const oi = Number(o.ts_intent_ns);
-    if (Number.isFinite(oi) && oi > t) {
-      orders.delete(o.id);
-      continue;
-    }
-    const fs = fillsByOrder.get(o.id) || [];
-    const filledQty = fs.reduce((a,x)=>a + Number(x.qty || 0), 0);
-    o.filledQty = filledQty;
-    // respect cancels that occurred before/at t
-    if (o.cancelledAtNs != null && Number(o.cancelledAtNs) <= t) {
-      o.status = 'cancelled';
-    } else {
-      o.cancelledAtNs = null;
-      o.status = (filledQty >= Number(o.qty)) ? 'filled' : (filledQty > 0 ? 'partial' : 'open');
-    }
-    orders.set(o.id, o);
-  }
-
-  // rebuild positions by reapplying fills in chronological order
-  const sorted = fills.slice().sort((a,b)=>Number(a.ts_ns)-Number(b.ts_ns));
-  for (const f of sorted){
-    const r = _applyFillToPositions(f);
-    if (r && r.realized != null && Number.isFinite(r.realized)) f.realized = r.realized;
+    if (o.status === 'pending') _enqueueInFlight(o);
   }
-  // keep fills in original order (chronological display is nicer)
-  fills = sorted;
   renderPositions();
   renderHistory();
   renderOpenOrders();
@@ -4115,6 +4789,7 @@ function makeChartHtml(chartId){
         <button class="wbtn tfBtn" data-tf="10s" style="padding:4px 8px;">10s</button>
         <button class="wbtn tfBtn" data-tf="1m" style="padding:4px 8px;">1m</button>
         <button class="wbtn tfBtn" data-tf="5m" style="padding:4px 8px;">5m</button>
+        <input class="tfCustom" placeholder="2m" title="Custom timeframe (e.g. 15s, 2m, 1h) or trade bars (500t ticks, 10000v shares, 10r cents of range); Enter to apply" style="width:44px; padding:3px 6px;"/>
         <button class="wbtn indGear" title="Indicator settings" style="padding:4px 8px;">⚙</button>
       </div>
       <div class="indPanel" style="display:none; position:absolute; left:10px; top:52px; z-index:6; width:260px; padding:10px; border:1px solid var(--grid); border-radius:10px; background: rgba(15,23,35,0.95);">
@@ -4259,21 +4934,30 @@ function createChartWindow(tf){
       b.style.background = on ? '#14304f' : '#0f1723';
       b.style.borderColor = on ? '#2f5a8a' : 'var(--grid)';
     });
-    // Update seconds visibility for axis labels (1s/10s only)
-    try { chart.tv?.applyOptions?.({ timeScale: { secondsVisible: (tfNext === '1s' || tfNext === '10s') } }); } catch {}
-    try { chart.macdTv?.applyOptions?.({ timeScale: { secondsVisible: (tfNext === '1s' || tfNext === '10s') } }); } catch {}
+    const custom = win.querySelector('.tfCustom');
+    if (custom) custom.value = TF_NS[tfNext] ? '' : tfNext;
+    // Update seconds visibility for axis labels (sub-minute TFs only)
+    const secs = tfNs(tfNext) < 60e9;
+    try { chart.tv?.applyOptions?.({ timeScale: { secondsVisible: secs } }); } catch {}
+    try { chart.macdTv?.applyOptions?.({ timeScale: { secondsVisible: secs } }); } catch {}
   }
   setTf(tf);
 
+  async function switchTf(next){
+    // Stop old TF candle stream immediately to avoid mixing old/new TF updates while the snapshot loads.
+    try { if (chart.sse) { chart.sse.close(); chart.sse = null; } } catch {}
+    setTf(next);
+    await loadChartSnapshot(chart);
+    if (!isPaused && playheadNs != null) startChartStream(chart, playheadNs);
+  }
   win.querySelectorAll('.tfBtn').forEach(btn=>{
-    btn.addEventListener('click', async ()=>{
-      const next = btn.getAttribute('data-tf') || '1s';
-      // Stop old TF candle stream immediately to avoid mixing old/new TF updates while the snapshot loads.
-      try { if (chart.sse) { chart.sse.close(); chart.sse = null; } } catch {}
-      setTf(next);
-      await loadChartSnapshot(chart);
-      if (!isPaused && playheadNs != null) startChartStream(chart, playheadNs);
-    });
+    btn.addEventListener('click', ()=> switchTf(btn.getAttribute('data-tf') || '1s'));
+  });
+  win.querySelector('.tfCustom')?.addEventListener('keydown', (ev)=>{
+    if (ev.key !== 'Enter') return;
+    const next = String(ev.target.value || '').trim().toLowerCase();
+    if (!/^[1-9]\d*[smhtvr]$/.test(next)) { setErr('Timeframe must look like 15s, 2m, 1h, 500t, 10000v or 10r'); return; }
+    switchTf(next);
   });
 
   // indicator panel wiring
@@ -4426,12 +5110,14 @@ function xLabelEveryNs(tf){
   if (tf === '1s') return 10e9;    // every 10s
   if (tf === '1m') return 300e9;   // every 5m
   if (tf === '5m') return 900e9;   // every 15m
-  return 60e9;
+  // Custom TFs: roughly every 5 bars, on a whole minute once bars are >= 1m.
+  const n = tfNs(tf);
+  return n >= 60e9 ? Math.ceil(5 * n / 60e9) * 60e9 : 5 * n;
 }
 
 function xLabelText(tf, tNs){
   const et = nsToEt(tNs);
-  return (tf === '1m' || tf === '5m') ? et.slice(11,16) : et.slice(11,19);
+  return (tfNs(tf) >= 60e9) ? et.slice(11,16) : et.slice(11,19);
 }
 
 function _chartLayout(chart){
@@ -4553,8 +5239,9 @@ function upsertCandle(chart, c){
   // - never overwrite the current live bucket candle (built from tape trades)
   if (chart.tf !== '1s'){
     const tfn = tfNs(chart.tf);
+    const doneNs = barSpec(chart.tf) ? Number(c.te) : Number(c.t) + tfn;
     if (chart.liveBucket != null && c.t === chart.liveBucket) return;
-    if (playheadNs != null && (Number(c.t) + tfn) > Number(playheadNs)) {
+    if (playheadNs != null && doneNs > Number(playheadNs)) {
       chart.pendingCandles?.set?.(Number(c.t), c);
       return;
     }
@@ -4570,7 +5257,7 @@ function upsertCandle(chart, c){
 }
 
 // ---------------- Replay wiring ----------------
-async function loadSnapshot(){
+async function loadSnapshot(opts){
   setErr('');
   setStatus('Loading snapshot…');
   const symbol = $('symbol').value.trim();
@@ -4588,6 +5275,7 @@ async function loadSnapshot(){
     return null;
   }
   currentBook = data.book;
+  _resetBookTimeline(currentBook);
   renderL2(currentBook);
   const tl = $('tapeList');
   if (tl) tl.innerHTML = '';
@@ -4628,12 +5316,30 @@ async function loadSnapshot(){
         hi: Number.isFinite(hi) ? hi : null,
         lo: Number.isFinite(lo) ? lo : null,
         pcl: Number.isFinite(pcl) ? pcl : null,
+        volume: null,
+        vwapNum: null,
       };
     } else {
-      sessionStats = { open: null, hi: null, lo: null, pcl: null };
+      sessionStats = { open: null, hi: null, lo: null, pcl: null, volume: null, vwapNum: null };
+    }
+    // Server prefix stats give the exact day-so-far open/hi/lo/volume/VWAP (the candle window only covers ~20 bars).
+    const ss = data.session;
+    if (ss && ss.open != null) {
+      sessionStats.open = Number(ss.open);
+      sessionStats.hi = Number(ss.hi);
+      sessionStats.lo = Number(ss.lo);
+      sessionStats.volume = Number(ss.volume || 0);
+      sessionStats.vwapNum = Number(ss.vwap_num || 0);
     }
+    // Prior trading day's levels (pcl = its close) and today's premarket range once the open has passed.
+    const pr = data.prior;
+    if (pr && pr.close != null) sessionStats.pcl = Number(pr.close);
+    sessionStats.pdh = (pr?.high == null) ? null : Number(pr.high);
+    sessionStats.pdl = (pr?.low == null) ? null : Number(pr.low);
+    sessionStats.pmh = (data.premarket?.high == null) ? null : Number(data.premarket.high);
+    sessionStats.pml = (data.premarket?.low == null) ? null : Number(data.premarket.low);
   } catch {
-    sessionStats = { open: null, hi: null, lo: null, pcl: null };
+    sessionStats = { open: null, hi: null, lo: null, pcl: null, volume: null, vwapNum: null };
   }
   loadedStartNs = data.ts_effective;
   // Reset playhead + tape monotonic guard at snapshot time (prevents rewinds on resume).
@@ -4641,7 +5347,10 @@ async function loadSnapshot(){
   setNow(playheadNs ? `Now: ${nsToEt(playheadNs)} ET` : '');
   resetTapeMonotonic(playheadNs);
   // If user "rewound" by loading an earlier snapshot, prune trading state to match.
-  try { resetTradingToTime(playheadNs); } catch {}
+  // (Skipped when reopening a restored session: the snapshot second can land just before its last events.)
+  if (!opts?.keepTrading) {
+    try { resetTradingToTime(playheadNs); } catch {}
+  }
   // Ensure trading UI reflects the reset state (renderL2 no longer triggers these).
   try { renderPositions(); } catch {}
   try { renderOpenOrders(); } catch {}
@@ -4662,6 +5371,81 @@ async function loadSnapshot(){
   return data;
 }
 
+// ---------------- Multi-symbol replay (watch list) ----------------
+function _primarySymbol(){
+  return String($('symbol')?.value?.trim?.() ?? '').toUpperCase();
+}
+
+function _watchSymbols(){
+  const primary = _primarySymbol();
+  const out = [];
+  for (const raw of String($('watch')?.value || '').split(/[\s,]+/)){
+    const sym = raw.trim().toUpperCase();
+    if (!/^[A-Z0-9.\-]{1,12}$/.test(sym)) continue;
+    if (sym !== primary && !out.includes(sym)) out.push(sym);
+  }
+  return out.slice(0, MULTI_STREAM_MAX_SYMBOLS - 1);
+}
+
+function _onWatchMsg(m){
+  const sym = String(m.symbol).toUpperCase();
+  const q = watchQuotes.get(sym) || { bid: null, ask: null, last: null, first: null };
+  if (m.type === 'book'){
+    const b = Number(m.bids?.[0]?.[0]);
+    const a = Number(m.asks?.[0]?.[0]);
+    q.bid = (Number.isFinite(b) && b > 0) ? b : null;
+    q.ask = (Number.isFinite(a) && a > 0) ? a : null;
+  } else if (m.type === 'trade'){
+    const px = Number(m.price);
+    if (Number.isFinite(px) && px > 0){
+      q.last = px;
+      if (q.first == null) q.first = px;
+    }
+  }
+  watchQuotes.set(sym, q);
+  if (_watchRenderTimer == null) _watchRenderTimer = setTimeout(renderWatchQuotes, 200);
+}
+
+function renderWatchQuotes(){
+  _watchRenderTimer = null;
+  const el = $('watchQuotes');
+  if (!el) return;
+  const syms = _watchSymbols();
+  el.innerHTML = syms.map(sym=>{
+    const q = watchQuotes.get(sym) || {};
+    const chg = (q.last != null && q.first) ? ((q.last / q.first - 1) * 100) : null;
+    const cls = (chg == null) ? '' : (chg >= 0 ? 'posUp' : 'posDn');
+    const px = (q.last != null) ? Number(q.last).toFixed(2) : '—';
+    const ba = (q.bid != null || q.ask != null)
+      ? ` ${q.bid != null ? Number(q.bid).toFixed(2) : '—'}×${q.ask != null ? Number(q.ask).toFixed(2) : '—'}`
+      : '';
+    return `<button data-watch="${sym}" title="Switch to ${sym}">${sym} ${px}${chg != null ? ` <span class="${cls}">${chg >= 0 ? '+' : ''}${chg.toFixed(1)}%</span>` : ''}${ba}</button>`;
+  }).join('');
+  el.querySelectorAll('button[data-watch]').forEach(btn=>{
+    btn.addEventListener('click', (e)=>{
+      e.preventDefault();
+      switchPrimarySymbol(btn.getAttribute('data-watch'));
+    });
+  });
+}
+
+// Make a watched symbol primary at the current playhead (the old primary joins the watch list).
+// Trading state is kept: positions/orders are per symbol and the clock does not move.
+async function switchPrimarySymbol(sym){
+  const next = String(sym || '').trim().toUpperCase();
+  const prev = _primarySymbol();
+  if (!next || next === prev) return;
+  const wasPlaying = !isPaused;
+  stopStream();
+  $('watch').value = [prev, ..._watchSymbols().filter(s=>s !== next)].join(',');
+  $('symbol').value = next;
+  watchQuotes.delete(next);
+  if (playheadNs != null) $('ts').value = nsToEt(playheadNs);
+  const snap = await loadSnapshot({ keepTrading: true });
+  renderWatchQuotes();
+  if (snap && wasPlaying) await doPlay(true);
+}
+
 function stopStream(){
   if (sseBookTape){ sseBookTape.close(); sseBookTape = null; }
   for (const ch of charts.values()){
@@ -4676,13 +5460,26 @@ function startBookTapeStream(tsNs){
   const symbol = $('symbol').value.trim();
   const day = $('day').value.trim();
   const speed = $('speed').value;
+  const watch = _watchSymbols();
   setStatus(`Playing @ ${speed}x…`);
-  sseBookTape = new EventSource(`/api/stream?symbol=${encodeURIComponent(symbol)}&day=${encodeURIComponent(day)}&ts_ns=${encodeURIComponent(tsNs)}&speed=${encodeURIComponent(speed)}&tf=1s&what=booktrades`);
+  if (watch.length) {
+    // One merged stream on a single clock: the primary symbol drives book/tape/trading, the rest feed watch quotes.
+    const syms = [symbol, ...watch].join(',');
+    sseBookTape = new EventSource(`/api/stream_multi?symbols=${encodeURIComponent(syms)}&day=${encodeURIComponent(day)}&ts_ns=${encodeURIComponent(tsNs)}&speed=${encodeURIComponent(speed)}&tf=1s&what=booktrades`);
+  } else {
+    sseBookTape = new EventSource(`/api/stream?symbol=${encodeURIComponent(symbol)}&day=${encodeURIComponent(day)}&ts_ns=${encodeURIComponent(tsNs)}&speed=${encodeURIComponent(speed)}&tf=1s&what=booktrades`);
+  }
+  const primary = _primarySymbol();
   sseBookTape.onmessage = (ev)=>{
     const msg = JSON.parse(ev.data);
     const handleOne = (m)=>{
       if (!m || !m.type) return;
+      if (m.symbol && String(m.symbol).toUpperCase() !== primary){
+        _onWatchMsg(m);
+        return;
+      }
       if (m.type === 'book'){
+        _recordBookTimeline(m);
         _pendingBook = m;
         _pendingMaxTs = (_pendingMaxTs == null) ? m.ts_event : Math.max(Number(_pendingMaxTs), Number(m.ts_event));
         _scheduleReplayFlush();
@@ -4694,6 +5491,11 @@ function startBookTapeStream(tsNs){
             if (sessionStats.open == null) sessionStats.open = px;
             sessionStats.hi = (sessionStats.hi == null) ? px : Math.max(sessionStats.hi, px);
             sessionStats.lo = (sessionStats.lo == null) ? px : Math.min(sessionStats.lo, px);
+            const sz = Number(m.size);
+            if (sessionStats.volume != null && Number.isFinite(sz)) {
+              sessionStats.volume += sz;
+              sessionStats.vwapNum += px * sz;
+            }
           }
         } catch {}
         _pendingTrades.push(m);
@@ -4785,7 +5587,12 @@ async function loadChartSnapshot(chart){
 
   // For higher TF charts, replace the current in-progress bucket candle (which can contain "future" OHLC)
   // with a live candle that is updated from tape trades in real time.
-  if (chart.tf !== '1s' && playheadNs != null) {
+  const spec = barSpec(chart.tf);
+  if (spec) {
+    // Trade bars: the server already cut the last bar at the playhead; keep building it unless it is complete.
+    const last = chart.candles[chart.candles.length-1];
+    chart.liveBucket = (last && !_tradeBarDone(spec, last)) ? last.t : null;
+  } else if (chart.tf !== '1s' && playheadNs != null) {
     const tfn = tfNs(chart.tf);
     const liveBucket = Math.floor(Number(playheadNs) / tfn) * tfn;
     chart.liveBucket = liveBucket;
@@ -4816,10 +5623,95 @@ async function loadChartSnapshot(chart){
   // Do not touch playhead here.
 }
 
+// ---------------- Timeline scrub (WebSocket, latest request wins) ----------------
+let scrubWs = null;
+let scrubKey = '';
+let scrubSeq = 0;
+let scrubApplied = 0;
+let scrubFrame = { book: null, trades: [], candles: [] };
+
+function _syncScrubSlider(){
+  const el = $('scrub');
+  if (el && playheadNs != null) el.value = String(Math.floor(Number(playheadNs) / 1e9));
+}
+
+function openScrub(){
+  const el = $('scrub');
+  if (!el || POPOUT) return;
+  const symbol = $('symbol').value.trim();
+  const day = $('day').value.trim();
+  const key = `${symbol}|${day}`;
+  if (scrubWs && scrubKey === key && scrubWs.readyState <= 1) { _syncScrubSlider(); return; }
+  try { scrubWs?.close(); } catch {}
+  scrubKey = key;
+  scrubSeq = 0;
+  scrubApplied = 0;
+  scrubFrame = { book: null, trades: [], candles: [] };
+  el.disabled = true;
+  const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+  const ws = new WebSocket(`${proto}://${location.host}/api/scrub?symbol=${encodeURIComponent(symbol)}&day=${encodeURIComponent(day)}&tf=1s`);
+  scrubWs = ws;
+  ws.onmessage = (ev)=>{
+    let msg = null;
+    try { msg = JSON.parse(ev.data); } catch { return; }
+    if (ws !== scrubWs) return;
+    if (msg?.type === 'ready'){
+      el.min = String(Math.floor(Number(msg.start_ts_ns) / 1e9));
+      el.max = String(Math.floor(Number(msg.end_ts_ns) / 1e9));
+      el.disabled = false;
+      _syncScrubSlider();
+    } else if (msg?.type === 'frame'){
+      if (Number(msg.seq) < scrubApplied) return;
+      scrubApplied = Number(msg.seq);
+      _applyScrubFrame(msg);
+    } else if (msg?.type === 'error'){
+      setErr(String(msg.detail || 'Scrub error'));
+    }
+  };
+  ws.onclose = ()=>{ if (ws === scrubWs) { scrubWs = null; el.disabled = true; } };
+}
+
+// Preview only (book + tape + clock); releasing the slider does the real load.
+function _applyScrubFrame(msg){
+  // Unchanged parts are omitted by the server; keep the previous ones.
+  if (msg.book) scrubFrame.book = msg.book;
+  if (msg.trades) scrubFrame.trades = msg.trades;
+  if (msg.candles) scrubFrame.candles = msg.candles;
+  if (scrubFrame.book){
+    currentBook = scrubFrame.book;
+    renderL2(currentBook);
+  }
+  if (msg.trades){
+    const tl = $('tapeList');
+    if (tl) tl.innerHTML = '';
+    resetTapeMonotonic(msg.ts_effective);
+    appendTapeBatch(scrubFrame.trades.slice().reverse());
+  }
+  setNow(`Scrub: ${nsToEt(msg.ts_effective)} ET`);
+}
+
+function initScrub(){
+  const el = $('scrub');
+  if (!el || POPOUT) return;
+  el.addEventListener('input', ()=>{
+    if (!scrubWs || scrubWs.readyState !== 1) return;
+    if (!isPaused) doPause();
+    scrubSeq += 1;
+    scrubWs.send(JSON.stringify({ seq: scrubSeq, ts_ns: Number(el.value) * 1e9 }));
+  });
+  el.addEventListener('change', async ()=>{
+    $('ts').value = nsToEt(Number(el.value) * 1e9);
+    await doLoad(true);
+  });
+}
+
 async function doLoad(shouldBroadcast=true){
   stopStream();
+  watchQuotes.clear();
+  renderWatchQuotes();
   const snap = await loadSnapshot();
   if (!snap) return;
+  openScrub();
   if (shouldBroadcast) {
     _broadcast({cmd:'load', symbol:$('symbol').value.trim(), day:$('day').value.trim(), ts:$('ts').value.trim(), speed:$('speed').value, playheadNs});
   }
@@ -4855,6 +5747,7 @@ async function doPlay(shouldBroadcast=true){
 function doPause(shouldBroadcast=true){
   setStatus('Paused');
   stopStream();
+  _syncScrubSlider();
   isPaused = true;
   $('pause').textContent = 'Resume';
   if (shouldBroadcast) {
@@ -4885,6 +5778,8 @@ if (QS.get('speed')) $('speed').value = QS.get('speed');
 
 // Populate session catalog (non-blocking; user can still type manual symbol/day/time).
 initCatalogDropdown();
+initDrills();
+initScrub();
 
 // Create windows
 makeWindow({
@@ -4966,10 +5861,16 @@ makeWindow({
 // history wiring
 document.getElementById('hist-clear')?.addEventListener('click', (e)=>{
   e.preventDefault();
-  fills = [];
+  _histFromIdx = fills.length;
   // NOTE: leaving orders/positions untouched; user may want to keep state but clear prints.
   renderHistory();
 });
+document.getElementById('hist-new-session')?.addEventListener('click', (e)=>{
+  e.preventDefault();
+  if (!confirm('Start a new trading session? Orders, fills and positions are reset (the old session log stays on disk).')) return;
+  startNewTradingSession();
+  setStatus('Started a new trading session');
+});
 renderHistory();
 
 makeWindow({
@@ -4982,7 +5883,7 @@ document.getElementById('ord-clear')?.addEventListener('click', (e)=>{
   e.preventDefault();
   const nowNs = (playheadNs ?? loadedStartNs ?? null);
   for (const o of orders.values()){
-    if (o && (o.status === 'open' || o.status === 'partial')) {
+    if (o && (o.status === 'open' || o.status === 'partial' || o.status === 'pending')) {
       cancelOrder(o.id, nowNs);
     }
   }
@@ -5171,8 +6072,25 @@ if (POPOUT){
   }
 }
 
-// init snapshot
-loadSnapshot();
+// init: restore the persisted trading session, then snapshot where it left off
+restoreTradingSession()
+  .then((ctx)=>{
+    if (!ctx || QS.get('ts')) return false;
+    if (ctx.symbol) $('symbol').value = ctx.symbol;
+    if (ctx.day) $('day').value = ctx.day;
+    const ph = Number(ctx.playhead_ns);
+    if (Number.isFinite(ph) && ph > 0) $('ts').value = nsToEt(Math.ceil(ph / 1e9) * 1e9);
+    return true;
+  })
+  .catch(()=>false)
+  .then((restored)=>loadSnapshot({ keepTrading: !!restored }));
+window.addEventListener('pagehide', ()=>{
+  if (!_tradingOutbox.length || !tradingSessionId) return;
+  const body = JSON.stringify({ session: tradingSessionId, ctx: _tradingCtx(), records: _tradingOutbox });
+  try {
+    if (navigator.sendBeacon(new URL('/api/trading/log', location.href), new Blob([body], {type: 'application/json'}))) _tradingOutbox = [];
+  } catch {}
+});
 </script>
 </body>
 </html>
@@ -5257,13 +6175,89 @@ def _parse_ts_et_to_ns(ts_text: str, tz_name: str) -> int:
     return int(dt_utc.timestamp() * 1e9)
 
 
-@dataclass(frozen=True)
-class LoadedDay:
-    symbol: str
-    day: str
-    data_dir: Path
-    tz_name: str
-    tf: str  # "1s" | "10s" | "1m" | "5m"
+class TimeIndex:
+    """
+    Seek index over an ascending ns timestamp list, one slot per wall-clock second of the covered range:
+    `offsets[k]` is the first row at or after second `base_s + k`. A seek is one list lookup plus a C bisect
+    confined to that second's rows, instead of a bisect over the whole day.
+    """
+
+    __slots__ = ("ts", "base_s", "offsets")
+
+    def __init__(self, ts: List[int]) -> None:
+        self.ts = ts
+        self.base_s = int(ts[0]) // 1_000_000_000 if ts else 0
+        n_s = (int(ts[-1]) // 1_000_000_000 - self.base_s + 1) if ts else 0
+        offsets: List[int] = []
+        lo = 0
+        for k in range(n_s + 1):
+            lo = bisect.bisect_left(ts, (self.base_s + k) * 1_000_000_000, lo)
+            offsets.append(lo)
+        self.offsets = offsets
+
+    def _span(self, x: int) -> Tuple[int, int]:
+        k = int(x) // 1_000_000_000 - self.base_s
+        if k < 0:
+            return 0, 0
+        if k >= len(self.offsets) - 1:
+            return len(self.ts), len(self.ts)
+        return self.offsets[k], self.offsets[k + 1]
+
+    def left(self, x: int) -> int:
+        """Same as bisect_left(ts, x)."""
+        lo, hi = self._span(x)
+        return bisect.bisect_left(self.ts, x, lo, hi)
+
+    def right(self, x: int) -> int:
+        """Same as bisect_right(ts, x)."""
+        lo, hi = self._span(x)
+        return bisect.bisect_right(self.ts, x, lo, hi)
+
+
+class SessionPrefix:
+    """
+    Prefix arrays over the day's prints (running hi/lo/last, cumulative volume and price * size), built once
+    per loaded day. Session-to-date open / hi / lo / last / volume / VWAP at any playhead is a few list lookups.
+    Prices are floats (fixed-int prices are scaled once, here); prints without a price are skipped.
+    """
+
+    __slots__ = ("first", "hi", "lo", "last", "vol", "pv", "open")
+
+    def __init__(self, trd_px: List[Any], trd_sz: List[int]) -> None:
+        px = [_price_to_float(x) for x in trd_px]
+        self.first = next((i for i, p in enumerate(px) if p is not None), len(px))
+        self.open = px[self.first] if self.first < len(px) else None
+        self.hi = list(accumulate((p if p is not None else -math.inf for p in px), max))
+        self.lo = list(accumulate((p if p is not None else math.inf for p in px), min))
+        self.last = list(accumulate(px, lambda a, b: a if b is None else b))
+        self.vol = list(accumulate(int(q) if p is not None else 0 for p, q in zip(px, trd_sz)))
+        self.pv = list(accumulate(p * int(q) if p is not None else 0.0 for p, q in zip(px, trd_sz)))
+
+    def at(self, j: int) -> Dict[str, Any]:
+        """Session state after the first `j` prints (j = bisect_right(trd_ts, ts))."""
+        j = min(int(j), len(self.vol))
+        if j <= self.first:
+            return {"open": None, "hi": None, "lo": None, "last": None, "volume": 0, "vwap_num": 0.0, "vwap": None}
+        i = j - 1
+        vol = self.vol[i]
+        return {
+            "open": self.open,
+            "hi": self.hi[i],
+            "lo": self.lo[i],
+            "last": self.last[i],
+            "volume": int(vol),
+            "vwap_num": self.pv[i],
+            "vwap": (self.pv[i] / vol) if vol else None,
+        }
+
+
+@dataclass(frozen=True)
+class LoadedDay:
+    symbol: str
+    day: str
+    data_dir: Path
+    tz_name: str
+    tf: str  # "1s" | "10s" | "1m" | "5m" (prebuilt), any "<N>s|m|h" (derived, see _derive_ohlcv) or "<N>t|v|r" (trade bars)
 
     # MBP10
     mbp_ts: List[int]
@@ -5277,7 +6271,7 @@ class LoadedDay:
     trd_px: List[Any]
     trd_sz: List[int]
 
-    # ohlcv (1s or 10s)
+    # ohlcv (1s or 10s); for trade bars ohl_ts is each bar's first print
     ohl_ts: List[int]
     ohl_o: List[Any]
     ohl_h: List[Any]
@@ -5285,6 +6279,13 @@ class LoadedDay:
     ohl_c: List[Any]
     ohl_v: List[int]
 
+    # Per-second seek indexes keyed by timestamp field ("mbp_ts" | "trd_ts" | "ohl_ts"); built once at load.
+    tix: Dict[str, TimeIndex]
+    # Session-to-date stats over the trades (see SessionPrefix).
+    sess: SessionPrefix
+    # Tick / volume / range bars (BarEngines.TradeBars) when tf is "<N>t|v|r"; None for time bars.
+    bars: Optional[Any] = None
+
     def bounds(self) -> Tuple[int, int]:
         lo = min(
             self.mbp_ts[0] if self.mbp_ts else 2**63 - 1,
@@ -5300,11 +6301,15 @@ class LoadedDay:
 
 
 _CACHE: Dict[Tuple[str, str, str, str], LoadedDay] = {}
+_CONTEXT_CACHE: Dict[Tuple[str, str, str, str], Tuple[float, Dict[str, Any]]] = {}  # key -> (expires, context)
+_CONTEXT_MISS_TTL_S = 60.0  # incomplete day contexts (e.g. prior day not downloaded yet) are looked up again after this
+
 
+def _read_parquet_cols(path: Path, columns: List[str], symbol: Optional[str] = None) -> Dict[str, List[Any]]:
+    from DataCatalog import read_source  # Simulator/DataCatalog.py (local module)
 
-def _read_parquet_cols(path: Path, columns: List[str]) -> Dict[str, List[Any]]:
-    pf = pq.ParquetFile(path)
-    tab = pf.read(columns=columns)
+    # `path` is a flat parquet or a hive day directory (see DataCatalog.day_source); rows of `symbol` only if given.
+    tab = read_source(path, columns, [symbol] if symbol is not None else None)
     # Avoid pyarrow converting timestamp[ns] columns into python datetime (microsecond-only)
     # which can throw without pandas installed. We keep timestamps as raw int64 ns.
     out: Dict[str, List[Any]] = {}
@@ -5320,62 +6325,23 @@ def _read_parquet_cols(path: Path, columns: List[str]) -> Dict[str, List[Any]]:
     return out
 
 
-def _load_day(symbol: str, day: str, data_dir: Path, tz_name: str, tf: str) -> LoadedDay:
-    tf = tf.strip()
-    if tf not in ("1s", "10s", "1m", "5m"):
-        raise ValueError("tf must be one of: 1s, 10s, 1m, 5m")
-    key = (symbol, day, str(data_dir), tf)
-    if key in _CACHE:
-        return _CACHE[key]
-
-    # databento_out naming (multiple symbols inside parquet)
-    mbp_path = data_dir / f"XNAS.ITCH.{day}.mbp-10.parquet"
-    trd_path = data_dir / f"EQUS.MINI.{day}.trades.parquet"
-    ohl_path = data_dir / f"EQUS.MINI.{day}.ohlcv-{tf}.parquet"
-
-    if not mbp_path.exists():
-        raise FileNotFoundError(f"Missing parquet: {mbp_path}")
-    if not trd_path.exists():
-        raise FileNotFoundError(f"Missing parquet: {trd_path}")
-    if not ohl_path.exists():
-        raise FileNotFoundError(f"Missing parquet: {ohl_path} (requested tf={tf})")
-
-    bid_px_cols = [f"bid_px_{i:02d}" for i in range(10)]
-    bid_sz_cols = [f"bid_sz_{i:02d}" for i in range(10)]
-    ask_px_cols = [f"ask_px_{i:02d}" for i in range(10)]
-    ask_sz_cols = [f"ask_sz_{i:02d}" for i in range(10)]
-
-    mbp_cols = ["ts_event", "symbol"] + bid_px_cols + bid_sz_cols + ask_px_cols + ask_sz_cols
-    mbp = _read_parquet_cols(mbp_path, mbp_cols)
-
-    # Filter symbol (parquet does include symbol)
-    mbp_sym = mbp["symbol"]
-    keep = [i for i, s in enumerate(mbp_sym) if s == symbol]
-    mbp_ts = [_ts_to_ns(mbp["ts_event"][i]) for i in keep]
-    bid_px = [[mbp[c][i] for c in bid_px_cols] for i in keep]
-    bid_sz = [[int(mbp[c][i]) for c in bid_sz_cols] for i in keep]
-    ask_px = [[mbp[c][i] for c in ask_px_cols] for i in keep]
-    ask_sz = [[int(mbp[c][i]) for c in ask_sz_cols] for i in keep]
-
-    trd_cols = ["ts_event", "symbol", "price", "size"]
-    trd = _read_parquet_cols(trd_path, trd_cols)
-    trd_keep = [i for i, s in enumerate(trd["symbol"]) if s == symbol]
-    trd_ts = [_ts_to_ns(trd["ts_event"][i]) for i in trd_keep]
-    trd_px = [trd["price"][i] for i in trd_keep]
-    trd_sz = [int(trd["size"][i]) for i in trd_keep]
+def _read_ohlcv_symbol(
+    ohl_path: Path, symbol: str, tf: str
+) -> Tuple[List[int], List[Any], List[Any], List[Any], List[Any], List[int]]:
+    from DataCatalog import source_files, source_names  # Simulator/DataCatalog.py (local module)
 
     # OHLCV timestamp column name differs by dataset/timeframe:
     # - Some files use `ts_event` (common in Databento schemas)
     # - Others use `ts` (observed in generated/aggregated OHLCV parquet)
-    ohl_pf = pq.ParquetFile(ohl_path)
-    ohl_schema_names = ohl_pf.schema.names
+    ohl_schema_names = source_names(ohl_path)
     ohl_ts_col = "ts_event" if "ts_event" in ohl_schema_names else "ts"
     ohl_cols = [ohl_ts_col, "symbol", "open", "high", "low", "close", "volume"]
-    ohl = _read_parquet_cols(ohl_path, ohl_cols)
-    ohl_keep = [i for i, s in enumerate(ohl["symbol"]) if s == symbol]
+    ohl = _read_parquet_cols(ohl_path, ohl_cols, symbol)
+    ohl_keep = range(len(ohl["symbol"]))
     if not ohl_keep:
+        ohl_files = source_files(ohl_path)
         try:
-            nrows = int(getattr(getattr(ohl_pf, "metadata", None), "num_rows", 0) or 0)
+            nrows = sum(int(pq.ParquetFile(p).metadata.num_rows or 0) for p in ohl_files)
         except Exception:
             nrows = 0
         if nrows <= 0:
@@ -5388,7 +6354,7 @@ def _load_day(symbol: str, day: str, data_dir: Path, tz_name: str, tf: str) -> L
         sample_syms: List[str] = []
         try:
             # Sample from the first row group to keep this lightweight.
-            rg0 = ohl_pf.read_row_group(0, columns=["symbol"])
+            rg0 = pq.ParquetFile(ohl_files[0]).read_row_group(0, columns=["symbol"])
             sample_syms = sorted(set(rg0["symbol"].to_pylist()))[:20]
         except Exception:
             sample_syms = []
@@ -5402,6 +6368,152 @@ def _load_day(symbol: str, day: str, data_dir: Path, tz_name: str, tf: str) -> L
     ohl_l = [ohl["low"][i] for i in ohl_keep]
     ohl_c = [ohl["close"][i] for i in ohl_keep]
     ohl_v = [int(ohl["volume"][i]) for i in ohl_keep]
+    return ohl_ts, ohl_o, ohl_h, ohl_l, ohl_c, ohl_v
+
+
+_PREBUILT_TFS = ("1s", "10s", "1m", "5m")  # downloader outputs (EQUS.MINI.<day>.ohlcv-<tf>.parquet)
+_TF_RE = re.compile(r"(\d+)(s|m|h)")
+
+
+def _tf_seconds(tf: str) -> int:
+    """
+    Bar size in seconds for "<N>s" | "<N>m" | "<N>h" (e.g. 15s, 2m, 1h); at most one day.
+    """
+    m = _TF_RE.fullmatch(str(tf).strip())
+    if not m or int(m.group(1)) <= 0:
+        raise ValueError(
+            "tf must look like 15s, 2m or 1h (N seconds / minutes / hours) or 500t, 10000v, 10r (tick / volume / range bars)"
+        )
+    sec = int(m.group(1)) * {"s": 1, "m": 60, "h": 3600}[m.group(2)]
+    if sec > 86400:
+        raise ValueError("tf must be at most 24h")
+    return sec
+
+
+def _segment_ohlcv(
+    ts: np.ndarray, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray, v: np.ndarray, tf_s: int
+) -> Tuple[List[int], List[Any], List[Any], List[Any], List[Any], List[int]]:
+    """
+    Aggregate time-sorted rows (1s bars, or trades with o=h=l=c=price) into epoch-aligned `tf_s` buckets
+    (same alignment as the downloader) with NumPy segment reductions. Prices keep their dtype, so fixed-int
+    prices stay fixed-int for _price_to_float.
+    """
+    if ts.size == 0:
+        return [], [], [], [], [], []
+    tf_ns = int(tf_s) * 1_000_000_000
+    bucket = (ts // tf_ns) * tf_ns
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], ts.size] - 1
+    return (
+        bucket[starts].tolist(),
+        o[starts].tolist(),
+        np.maximum.reduceat(h, starts).tolist(),
+        np.minimum.reduceat(l, starts).tolist(),
+        c[ends].tolist(),
+        np.add.reduceat(v, starts).astype(np.int64).tolist(),
+    )
+
+
+def _derive_ohlcv(
+    symbol: str, day: str, data_dir: Path, tf_s: int, trd_ts: List[int], trd_px: List[Any], trd_sz: List[int]
+) -> Tuple[List[int], List[Any], List[Any], List[Any], List[Any], List[int]]:
+    """
+    Candles for any timeframe without a prebuilt parquet: from ohlcv-1s when present, else from the trades.
+    """
+    from DataCatalog import day_source, read_source, source_names  # Simulator/DataCatalog.py (local module)
+
+    one_s = day_source(data_dir, "ohlcv-1s", day)
+    if one_s is not None:
+        names = source_names(one_s)
+        ts_col = "ts_event" if "ts_event" in names else "ts"
+        tab = read_source(one_s, [ts_col, "symbol", "open", "high", "low", "close", "volume"], [symbol])
+        ts_arr = tab[ts_col]
+        if pa.types.is_timestamp(ts_arr.type):
+            ts_arr = ts_arr.cast(pa.int64())
+        ts = ts_arr.to_numpy().astype(np.int64)
+        order = np.argsort(ts, kind="stable")
+        cols = [tab[n].to_numpy()[order] for n in ("open", "high", "low", "close", "volume")]
+        return _segment_ohlcv(ts[order], *cols, tf_s)
+    if not trd_ts:
+        raise FileNotFoundError(
+            f"Missing parquet: {data_dir / f'EQUS.MINI.{day}.ohlcv-1s.parquet'} (and no trades to build {tf_s}s bars from)"
+        )
+    px = np.asarray(trd_px)
+    return _segment_ohlcv(np.asarray(trd_ts, dtype=np.int64), px, px, px, px, np.asarray(trd_sz, dtype=np.int64), tf_s)
+
+
+def _load_day(symbol: str, day: str, data_dir: Path, tz_name: str, tf: str) -> LoadedDay:
+    from BarEngines import build_trade_bars, parse_bar_spec  # Simulator/BarEngines.py (local module)
+    from DataCatalog import day_source  # Simulator/DataCatalog.py (local module)
+
+    tf = tf.strip()
+    spec = parse_bar_spec(tf)
+    tf_s = None if spec else _tf_seconds(tf)
+    key = (symbol, day, str(data_dir), tf)
+    if key in _CACHE:
+        return _CACHE[key]
+
+    # databento_out naming (multiple symbols inside parquet), or the hive layout (one directory per symbol)
+    mbp_path = data_dir / f"XNAS.ITCH.{day}.mbp-10.parquet"
+    trd_path = data_dir / f"EQUS.MINI.{day}.trades.parquet"
+    ohl_src = day_source(data_dir, f"ohlcv-{tf}", day) if tf in _PREBUILT_TFS else None
+
+    def candles(trd_ts: List[int], trd_px: List[Any], trd_sz: List[int]) -> Tuple[Tuple[List[Any], ...], Any]:
+        if spec:
+            bars = build_trade_bars(spec[0], spec[1], trd_ts, trd_px, trd_sz, FIXED_PRICE_SCALE)
+            return (bars.t0, bars.o, bars.h, bars.l, bars.c, bars.v), bars
+        if ohl_src is not None:
+            return _read_ohlcv_symbol(ohl_src, symbol, tf), None
+        return _derive_ohlcv(symbol, day, data_dir, tf_s, trd_ts, trd_px, trd_sz), None
+
+    # Another timeframe of the same symbol/day is already loaded: share its book/trades, only add candles.
+    sibling = next((d for k, d in _CACHE.items() if k[:3] == key[:3]), None)
+    if sibling is not None:
+        ohl, bars = candles(sibling.trd_ts, sibling.trd_px, sibling.trd_sz)
+        loaded = replace(
+            sibling,
+            tf=tf,
+            ohl_ts=ohl[0],
+            ohl_o=ohl[1],
+            ohl_h=ohl[2],
+            ohl_l=ohl[3],
+            ohl_c=ohl[4],
+            ohl_v=ohl[5],
+            tix={**sibling.tix, "ohl_ts": TimeIndex(ohl[0])},
+            bars=bars,
+        )
+        _CACHE[key] = loaded
+        return loaded
+
+    mbp_src = day_source(data_dir, "mbp-10", day)
+    trd_src = day_source(data_dir, "trades", day)
+    if mbp_src is None:
+        raise FileNotFoundError(f"Missing parquet: {mbp_path}")
+    if trd_src is None:
+        raise FileNotFoundError(f"Missing parquet: {trd_path}")
+
+    bid_px_cols = [f"bid_px_{i:02d}" for i in range(10)]
+    bid_sz_cols = [f"bid_sz_{i:02d}" for i in range(10)]
+    ask_px_cols = [f"ask_px_{i:02d}" for i in range(10)]
+    ask_sz_cols = [f"ask_sz_{i:02d}" for i in range(10)]
+
+    mbp_cols = ["ts_event", "symbol"] + bid_px_cols + bid_sz_cols + ask_px_cols + ask_sz_cols
+    mbp = _read_parquet_cols(mbp_src, mbp_cols, symbol)
+    keep = range(len(mbp["symbol"]))
+    mbp_ts = [_ts_to_ns(mbp["ts_event"][i]) for i in keep]
+    bid_px = [[mbp[c][i] for c in bid_px_cols] for i in keep]
+    bid_sz = [[int(mbp[c][i]) for c in bid_sz_cols] for i in keep]
+    ask_px = [[mbp[c][i] for c in ask_px_cols] for i in keep]
+    ask_sz = [[int(mbp[c][i]) for c in ask_sz_cols] for i in keep]
+
+    trd_cols = ["ts_event", "symbol", "price", "size"]
+    trd = _read_parquet_cols(trd_src, trd_cols, symbol)
+    trd_keep = range(len(trd["symbol"]))
+    trd_ts = [_ts_to_ns(trd["ts_event"][i]) for i in trd_keep]
+    trd_px = [trd["price"][i] for i in trd_keep]
+    trd_sz = [int(trd["size"][i]) for i in trd_keep]
+
+    (ohl_ts, ohl_o, ohl_h, ohl_l, ohl_c, ohl_v), bars = candles(trd_ts, trd_px, trd_sz)
 
     loaded = LoadedDay(
         symbol=symbol,
@@ -5423,37 +6535,18 @@ def _load_day(symbol: str, day: str, data_dir: Path, tz_name: str, tf: str) -> L
         ohl_l=ohl_l,
         ohl_c=ohl_c,
         ohl_v=ohl_v,
+        tix={"mbp_ts": TimeIndex(mbp_ts), "trd_ts": TimeIndex(trd_ts), "ohl_ts": TimeIndex(ohl_ts)},
+        sess=SessionPrefix(trd_px, trd_sz),
+        bars=bars,
     )
     _CACHE[key] = loaded
     return loaded
 
 
-def _bisect_right(a: List[int], x: int) -> int:
-    lo, hi = 0, len(a)
-    while lo < hi:
-        mid = (lo + hi) // 2
-        if x < a[mid]:
-            hi = mid
-        else:
-            lo = mid + 1
-    return lo
-
-
-def _bisect_left(a: List[int], x: int) -> int:
-    lo, hi = 0, len(a)
-    while lo < hi:
-        mid = (lo + hi) // 2
-        if a[mid] < x:
-            lo = mid + 1
-        else:
-            hi = mid
-    return lo
-
-
 def _book_at_or_before(day: LoadedDay, ts_ns: int) -> Tuple[int, Dict[str, Any]]:
     if not day.mbp_ts:
         raise ValueError("No MBP10 data")
-    i = _bisect_right(day.mbp_ts, ts_ns) - 1
+    i = day.tix["mbp_ts"].right(ts_ns) - 1
     if i < 0:
         i = 0
     bids = [[_price_to_float(day.bid_px[i][j]), int(day.bid_sz[i][j])] for j in range(10)]
@@ -5464,7 +6557,7 @@ def _book_at_or_before(day: LoadedDay, ts_ns: int) -> Tuple[int, Dict[str, Any]]
 def _trades_before(day: LoadedDay, ts_ns: int, limit: int = 60) -> List[Dict[str, Any]]:
     if not day.trd_ts:
         return []
-    j = _bisect_right(day.trd_ts, ts_ns)
+    j = day.tix["trd_ts"].right(ts_ns)
     i0 = max(0, j - limit)
     out: List[Dict[str, Any]] = []
     for i in range(i0, j):
@@ -5479,13 +6572,68 @@ def _trades_before(day: LoadedDay, ts_ns: int, limit: int = 60) -> List[Dict[str
     return out
 
 
+def _trade_bars_window(day: LoadedDay, start_ns: int, end_ns: int) -> List[Dict[str, Any]]:
+    """
+    Trade bars whose first print is in [start_ns, end_ns), the last one cut at the prints before end_ns
+    (a replay restarted at end_ns streams the rest). `t` is the bar's display slot, see BarEngines.
+    """
+    from BarEngines import partial_bar  # Simulator/BarEngines.py (local module)
+
+    bars = day.bars
+    i0 = day.tix["ohl_ts"].left(start_ns)
+    j = day.tix["ohl_ts"].left(end_ns)
+    out: List[Dict[str, Any]] = []
+    for k in range(i0, j):
+        if bars.te[k] < end_ns:
+            out.append(_candle_msg(day, k))
+            continue
+        c = partial_bar(bars, k, day.tix["trd_ts"].left(end_ns), day.trd_ts, day.trd_px, day.trd_sz)
+        c.update({"type": "candle", "o": _price_to_float(c["o"]), "h": _price_to_float(c["h"]),
+                  "l": _price_to_float(c["l"]), "c": _price_to_float(c["c"])})
+        out.append(c)
+    return out
+
+
+def _partial_bucket(day: LoadedDay, t: int, end_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    The time bucket starting at `t` as of the prints before end_ns (for a playhead inside the bucket), built from
+    the trades like BarEngines.partial_bar; None if the bucket has no print yet.
+    """
+    i0 = day.tix["trd_ts"].left(t)
+    j = day.tix["trd_ts"].left(end_ns)
+    seg = [p for p in day.trd_px[i0:j] if p is not None]
+    if not seg:
+        return None
+    return {
+        "type": "candle",
+        "t": int(t),
+        "o": _price_to_float(seg[0]),
+        "h": _price_to_float(max(seg)),
+        "l": _price_to_float(min(seg)),
+        "c": _price_to_float(seg[-1]),
+        "v": int(sum(day.trd_sz[i0:j])),
+    }
+
+
 def _candles_window(day: LoadedDay, start_ns: int, end_ns: int) -> List[Dict[str, Any]]:
+    """
+    Candles from the bucket containing start_ns up to end_ns. The bucket containing end_ns (the live one) is cut
+    at end_ns, so a playhead inside a bucket never sees the rest of its prices.
+    """
     if not day.ohl_ts:
         return []
-    i0 = max(0, _bisect_left(day.ohl_ts, start_ns))
-    j = _bisect_right(day.ohl_ts, end_ns)
+    if day.bars is not None:
+        return _trade_bars_window(day, start_ns, end_ns)
+    tf_ns = _tf_seconds(day.tf) * 1_000_000_000
+    i0 = day.tix["ohl_ts"].left(start_ns)
+    j = day.tix["ohl_ts"].right(end_ns)
     out: List[Dict[str, Any]] = []
     for i in range(i0, j):
+        if day.ohl_ts[i] + tf_ns > end_ns:
+            c = _partial_bucket(day, day.ohl_ts[i], end_ns)
+            if c is not None:
+                out.append(c)
+            continue
         out.append(
             {
                 "type": "candle",
@@ -5504,22 +6652,19 @@ def _resolve_effective_ts(day: LoadedDay, ts_ns: int) -> Tuple[int, Optional[str
     """
     Resolve a requested timestamp to an effective chart timestamp.
 
-    Databento OHLCV can have gaps. We:
-    - Error if the requested time is outside the available OHLCV range.
-    - Otherwise snap to the latest OHLCV bucket at or before the requested time.
-    - Return a warning string if snapping occurred.
+    Errors if the requested time is outside the available chart range: the first bucket start to the last bucket
+    end for time bars, the first to the last print for trade bars (<N>t|v|r). Otherwise the requested time is kept
+    as is and the live bar is cut there (see _candles_window / _trade_bars_window), so the warning is always None.
     """
     if not day.ohl_ts:
         raise ValueError("No OHLCV data available")
-    if ts_ns < day.ohl_ts[0] or ts_ns > day.ohl_ts[-1]:
-        raise ValueError("Selected time does not exist in data range.")
-    i = _bisect_right(day.ohl_ts, ts_ns) - 1
-    if i < 0:
+    if day.bars is not None:
+        last = day.bars.te[-1]  # trade bars: up to the last print
+    else:
+        last = day.ohl_ts[-1] + _tf_seconds(day.tf) * 1_000_000_000 - 1  # through the last bucket
+    if ts_ns < day.ohl_ts[0] or ts_ns > last:
         raise ValueError("Selected time does not exist in data range.")
-    eff = int(day.ohl_ts[i])
-    if eff != int(ts_ns):
-        return eff, f"Exact chart bucket missing; snapped to {eff}."
-    return eff, None
+    return int(ts_ns), None
 
 
 @APP.get("/")
@@ -5633,6 +6778,171 @@ async def commands_validate(request: Request):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@APP.get("/api/trading/log")
+def trading_log_load(session: str = Query(...)):
+    """
+    Return every record of a trading session log (events, rewinds, ctx) in append order.
+    The browser replays them to rebuild orders/fills/positions after a reload.
+    """
+    try:
+        from TradingLog import load_records  # Simulator/TradingLog.py (local module)
+
+        return JSONResponse({"session": session, "records": load_records(SESSIONS_DIR, session)})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@APP.post("/api/trading/log")
+async def trading_log_append(request: Request):
+    """
+    Append a batch of trading records to the session log (append-only; rewinds are records too).
+    """
+    try:
+        payload = await request.json()
+        session = str(payload.get("session") or "")
+        records = payload.get("records") or []
+        ctx = payload.get("ctx")
+        if not isinstance(records, list):
+            raise ValueError("records must be a list")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}") from e
+    if isinstance(ctx, dict):
+        records = list(records) + [dict(ctx, type="ctx")]
+    try:
+        from TradingLog import append_records  # Simulator/TradingLog.py (local module)
+
+        n = append_records(SESSIONS_DIR, session, records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    out: Dict[str, Any] = {"ok": True, "session": session, "written": n}
+    try:
+        # The JSONL log is the source of truth; the journal is a query index rebuilt from it on demand,
+        # so a journal failure must not make the client retry (and duplicate) the batch.
+        from TradeJournal import ingest  # Simulator/TradeJournal.py (local module)
+
+        day = str(ctx.get("day") or "") if isinstance(ctx, dict) else ""
+        out["journaled"] = ingest(SESSIONS_DIR, session, records, day=day)
+    except Exception as e:
+        out["journal_error"] = str(e)
+    return JSONResponse(out)
+
+
+@APP.get("/api/journal/summary")
+def journal_summary(
+    session: Optional[str] = Query(None),
+    symbol: Optional[str] = Query(None),
+    day: Optional[str] = Query(None),
+):
+    """
+    Per-session P&L, win rate, hold times and average MAE/MFE over journaled round trips.
+    """
+    try:
+        from TradeJournal import summary  # Simulator/TradeJournal.py (local module)
+
+        return JSONResponse({"sessions": summary(SESSIONS_DIR, session=session, symbol=symbol, day=day)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@APP.get("/api/journal/trades")
+def journal_trades(
+    session: Optional[str] = Query(None),
+    symbol: Optional[str] = Query(None),
+    day: Optional[str] = Query(None),
+    limit: int = Query(5000, ge=1, le=100000),
+):
+    """
+    Round trips (entry/exit ts + px, side, size, P&L, hold time, MAE/MFE) from the journal, newest first.
+    """
+    try:
+        from TradeJournal import round_trips  # Simulator/TradeJournal.py (local module)
+
+        trips = round_trips(SESSIONS_DIR, session=session, symbol=symbol, day=day)
+        trips.sort(key=lambda t: t["entry_ts_ns"], reverse=True)
+        return JSONResponse({"trades": trips[:limit], "total": len(trips)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@APP.get("/api/journal/orders")
+def journal_orders(
+    session: str = Query(...),
+    order_id: Optional[str] = Query(None),
+    limit: int = Query(1000, ge=1, le=100000),
+):
+    """
+    Raw order events of a session (new/arrive/rest/trigger/fill/cancel/reject), newest first.
+    """
+    try:
+        from TradeJournal import order_events  # Simulator/TradeJournal.py (local module)
+
+        return JSONResponse({"orders": order_events(SESSIONS_DIR, session, order_id=order_id, limit=limit)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@APP.get("/api/journal/excursions")
+def journal_excursions(
+    session: Optional[str] = Query(None),
+    symbol: Optional[str] = Query(None),
+    day: Optional[str] = Query(None),
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+):
+    """
+    Batch excursion analytics for journaled round trips: MAE/MFE + time-to-MFE/MAE from the tape and
+    slippage vs top of book at entry/exit. Trips are grouped per symbol/day so each day's arrays load once.
+    """
+    try:
+        from Excursions import analyze_round_trips, load_top_of_book  # Simulator/Excursions.py (local module)
+        from TradeJournal import round_trips  # Simulator/TradeJournal.py (local module)
+
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for t in round_trips(SESSIONS_DIR, session=session, symbol=symbol, day=day):
+            groups.setdefault((t["symbol"], t["day"] or ""), []).append(t)
+
+        from DataCatalog import day_source  # Simulator/DataCatalog.py (local module)
+
+        ddir = Path(data_dir)
+        trades: List[Dict[str, Any]] = []
+        errors: List[Dict[str, str]] = []
+        for (sym, d), trips in sorted(groups.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+            try:
+                if not d:
+                    raise ValueError("trip has no replay day (logged without ctx)")
+                tob = load_top_of_book(
+                    sym,
+                    d,
+                    day_source(ddir, "mbp-10", d) or ddir / f"XNAS.ITCH.{d}.mbp-10.parquet",
+                    day_source(ddir, "trades", d) or ddir / f"EQUS.MINI.{d}.trades.parquet",
+                    FIXED_PRICE_SCALE,
+                )
+                trades.extend(analyze_round_trips(tob, trips))
+            except Exception as e:
+                errors.append({"symbol": sym, "day": d, "error": str(e)})
+                trades.extend(trips)
+        trades.sort(key=lambda t: t["entry_ts_ns"], reverse=True)
+        return JSONResponse({"trades": trades, "errors": errors})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@APP.post("/api/journal/rebuild")
+def journal_rebuild():
+    """
+    Rebuild the journal from every session log under Sessions/.
+    """
+    try:
+        from TradeJournal import rebuild_from_logs  # Simulator/TradeJournal.py (local module)
+
+        return JSONResponse({"ok": True, "written": rebuild_from_logs(SESSIONS_DIR)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @APP.get("/api/metadata")
 def metadata(
     symbol: str = Query(...),
@@ -5679,7 +6989,12 @@ def catalog(
     try:
         from DataCatalog import scan_catalog  # Simulator/DataCatalog.py (local module)
 
-        items = scan_catalog(Path(data_dir), tz_name=tz_name)
+        items = scan_catalog(
+            Path(data_dir),
+            tz_name=tz_name,
+            index_path=CATALOG_INDEX_PATH,
+            max_workers=CATALOG_SCAN_WORKERS,
+        )
         if limit:
             items = items[: int(limit)]
         payload: Dict[str, Any] = {
@@ -5692,6 +7007,11 @@ def catalog(
                     "start_ts_ns": int(it.start_ts_ns),
                     "start_et": it.start_et,
                     "label": it.label,
+                    "end_ts_ns": it.end_ts_ns,
+                    "bars": it.bars,
+                    "volume": it.volume,
+                    "high": it.high,
+                    "low": it.low,
                 }
                 for it in items
             ],
@@ -5703,6 +7023,305 @@ def catalog(
     return JSONResponse(payload)
 
 
+def _catalog_watcher(data_dir: Path, tz_name: str) -> Any:
+    """
+    One background CatalogWatcher per (data_dir, tz_name), started on first use and kept for the process.
+    Deltas also drop the TTL cache for that directory so /api/catalog reflects them immediately.
+    """
+    from DataCatalog import CatalogWatcher  # Simulator/DataCatalog.py (local module)
+
+    key = (str(data_dir), str(tz_name))
+    w = _CATALOG_WATCHERS.get(key)
+    if w is None:
+        w = CatalogWatcher(
+            data_dir,
+            CATALOG_INDEX_PATH,
+            tz_name=tz_name,
+            poll_s=CATALOG_WATCH_POLL_S,
+            max_workers=CATALOG_SCAN_WORKERS,
+            activity_bucket_s=CATALOG_ACTIVITY_BUCKET_S,
+        )
+
+        def _invalidate(_delta: Dict[str, Any]) -> None:
+            for k in [k for k in _CATALOG_CACHE if k[0] == str(data_dir) and k[1] == str(tz_name)]:
+                _CATALOG_CACHE.pop(k, None)
+
+        w.subscribe(_invalidate)
+        _CATALOG_WATCHERS[key] = w.start()
+    return w
+
+
+@APP.get("/api/catalog/activity")
+def catalog_activity(
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+    tz_name: str = Query(LOCAL_TZ_NAME_DEFAULT),
+    metric: str = Query("range_pct", description="range_pct | range | volume | trades | spread | spread_bps"),
+    bucket_s: int = Query(CATALOG_ACTIVITY_BUCKET_S, ge=1, le=86400),
+    limit: int = Query(50, ge=1, le=2000),
+    symbol: Optional[str] = Query(None),
+    day_from: Optional[str] = Query(None, description="YYYY-MM-DD (inclusive)"),
+    day_to: Optional[str] = Query(None, description="YYYY-MM-DD (inclusive)"),
+    min_trades: int = Query(0, ge=0),
+    min_volume: int = Query(0, ge=0),
+    max_spread_bps: Optional[float] = Query(None, ge=0),
+):
+    """
+    Rank precomputed activity windows (e.g. the 50 most volatile 5-minute stretches) for drill selection.
+    Reads only the catalog index; buckets are built by the catalog watcher or POST /api/catalog/activity/build.
+    """
+    try:
+        from DataCatalog import query_activity  # Simulator/DataCatalog.py (local module)
+
+        items = query_activity(
+            Path(data_dir),
+            CATALOG_INDEX_PATH,
+            metric=metric,
+            bucket_s=bucket_s,
+            limit=limit,
+            symbol=symbol,
+            day_from=day_from,
+            day_to=day_to,
+            min_trades=min_trades,
+            min_volume=min_volume,
+            max_spread_bps=max_spread_bps,
+            tz_name=tz_name,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return JSONResponse({"data_dir": str(Path(data_dir)), "metric": metric, "bucket_s": int(bucket_s), "items": items})
+
+
+@APP.post("/api/catalog/activity/build")
+def catalog_activity_build(
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+    bucket_s: int = Query(CATALOG_ACTIVITY_BUCKET_S, ge=1, le=86400),
+):
+    """
+    Build (incrementally) the activity buckets for every loadable day; unchanged days are skipped.
+    """
+    try:
+        from DataCatalog import enrich_activity  # Simulator/DataCatalog.py (local module)
+
+        t0 = time.perf_counter()
+        built = enrich_activity(Path(data_dir), CATALOG_INDEX_PATH, bucket_s=bucket_s, max_workers=CATALOG_SCAN_WORKERS)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    return JSONResponse({"ok": True, "days_built": built, "elapsed_s": round(time.perf_counter() - t0, 3)})
+
+
+@APP.get("/api/catalog/events")
+async def catalog_events(
+    request: Request,
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+    tz_name: str = Query(LOCAL_TZ_NAME_DEFAULT),
+):
+    """
+    SSE feed of catalog deltas for a data directory ({"type":"catalog_delta","added","removed","updated"}),
+    pushed as the downloader adds/replaces parquet files. No rescans: only the touched days are re-indexed.
+    """
+    try:
+        watcher = _catalog_watcher(Path(data_dir), tz_name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    unsubscribe = watcher.subscribe(lambda delta: loop.call_soon_threadsafe(queue.put_nowait, delta))
+
+    async def gen() -> Iterable[bytes]:
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                if await request.is_disconnected():
+                    return
+                try:
+                    delta = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield _emit_sse(delta)
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _day_context(loaded: LoadedDay) -> Dict[str, Any]:
+    """
+    Reference levels around a loaded day: the symbol's prior trading day (close / RTH high-low / premarket range,
+    located via the catalog index) and this day's premarket range (from the day's best downloaded OHLCV, whatever
+    the chart tf). Tiny cached summaries, never a second full load.
+    Best-effort: missing data yields None entries. Complete results are cached for the process; incomplete ones for
+    _CONTEXT_MISS_TTL_S, so snapshots don't rescan the catalog index on every seek but still pick up a prior day
+    downloaded later.
+    """
+    key = (loaded.symbol, loaded.day, str(loaded.data_dir), loaded.tz_name)
+    now = time.time()
+    hit = _CONTEXT_CACHE.get(key)
+    if hit is not None and now < hit[0]:
+        return hit[1]
+    from DataCatalog import best_ohlcv_source, day_summary, prior_day_summary, session_bounds_ns  # Simulator/DataCatalog.py (local module)
+
+    out: Dict[str, Any] = {"prior": None, "premarket": None, "rth_open_ns": None}
+    try:
+        out["prior"] = prior_day_summary(loaded.data_dir, CATALOG_INDEX_PATH, loaded.symbol, loaded.day, loaded.tz_name)
+    except Exception:
+        pass
+    try:
+        out["rth_open_ns"] = session_bounds_ns(loaded.day, loaded.tz_name)[1]
+        picked = best_ohlcv_source(loaded.data_dir, loaded.day)
+        if picked is not None:
+            today = day_summary(CATALOG_INDEX_PATH, picked[0], loaded.symbol, loaded.day, loaded.tz_name)
+            out["premarket"] = {"high": today["pm_high"], "low": today["pm_low"]}
+    except Exception:
+        pass
+    complete = all(v is not None for v in out.values())
+    _CONTEXT_CACHE[key] = (float("inf") if complete else now + _CONTEXT_MISS_TTL_S, out)
+    return out
+
+
+def _snapshot_window_start(loaded: LoadedDay, ts_eff: int) -> int:
+    # Chart context: show at least 20 bars prior (when available), regardless of TF.
+    if loaded.bars is not None:
+        return _bars_back_start(loaded, ts_eff, 20)
+    tf_ns = _tf_seconds(loaded.tf) * 1_000_000_000
+    return max(
+        loaded.ohl_ts[0] if loaded.ohl_ts else ts_eff,
+        ts_eff - int(20 * tf_ns),
+    )
+
+
+def _bars_back_start(loaded: LoadedDay, end_ns: int, bars: int) -> int:
+    # Trade bars have no fixed duration: count bars back by index instead.
+    if not loaded.ohl_ts:
+        return end_ns
+    k = max(0, loaded.tix["ohl_ts"].left(end_ns) - int(bars))
+    return int(loaded.ohl_ts[k])
+
+
+class _ScrubCursor:
+    """
+    Snapshot frames for one scrub connection. Book / trades / candles are keyed by their row offsets, so a
+    frame only rebuilds (and only sends) the parts that changed since the previous frame.
+    """
+
+    def __init__(self, loaded: LoadedDay) -> None:
+        self.day = loaded
+        self._book_i: Optional[int] = None
+        self._trd_j: Optional[int] = None
+        self._ohl_span: Optional[Tuple[int, int, int]] = None
+
+    def frame(self, ts_ns: int) -> Dict[str, Any]:
+        day = self.day
+        ts_eff, warn = _resolve_effective_ts(day, ts_ns)
+        out: Dict[str, Any] = {"type": "frame", "ts_requested": int(ts_ns), "ts_effective": int(ts_eff), "warning": warn}
+
+        i = max(0, day.tix["mbp_ts"].right(ts_eff) - 1)
+        if day.mbp_ts and i != self._book_i:
+            ts_book, out["book"] = _book_at_or_before(day, ts_eff)
+            out["book_ts"] = int(ts_book)
+            self._book_i = i
+
+        j = day.tix["trd_ts"].right(ts_eff)
+        if j != self._trd_j:
+            out["trades"] = _trades_before(day, ts_eff, limit=60)
+            out["session"] = day.sess.at(j)
+            self._trd_j = j
+
+        start = _snapshot_window_start(day, ts_eff)
+        # The live bar is cut at the playhead, so it changes with the prints as well as with the bar span.
+        span = (day.tix["ohl_ts"].left(start), day.tix["ohl_ts"].right(ts_eff), day.tix["trd_ts"].left(ts_eff))
+        if span != self._ohl_span:
+            out["candles"] = _candles_window(day, start, ts_eff)
+            self._ohl_span = span
+        return out
+
+
+@APP.websocket("/api/scrub")
+async def scrub(
+    ws: WebSocket,
+    symbol: str = Query(...),
+    day: str = Query(...),
+    tf: str = Query("1s"),
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+    tz_name: str = Query(LOCAL_TZ_NAME_DEFAULT),
+):
+    """
+    Timeline scrubbing. The client sends {"seq", "ts_ns"} (or "ts" in tz_name) as fast as it likes; the server
+    answers only the newest pending request with {"type":"frame", "seq", ...snapshot fields}, dropping superseded
+    ones. Frames omit book / trades / candles when they are unchanged from the previous frame.
+    On connect: {"type":"ready","start_ts_ns","end_ts_ns"} (OHLCV range, i.e. the scrubbable range).
+    """
+    await ws.accept()
+    try:
+        loaded = await asyncio.to_thread(_load_day, symbol, day, Path(data_dir), tz_name, tf)
+    except Exception as e:
+        await ws.send_json({"type": "error", "detail": str(e)})
+        await ws.close()
+        return
+    if not loaded.ohl_ts:
+        await ws.send_json({"type": "error", "detail": "No OHLCV data available"})
+        await ws.close()
+        return
+    await ws.send_json({"type": "ready", "start_ts_ns": int(loaded.ohl_ts[0]), "end_ts_ns": int(loaded.ohl_ts[-1])})
+
+    cursor = _ScrubCursor(loaded)
+    latest: Dict[str, Any] = {}
+    wake = asyncio.Event()
+    closed = asyncio.Event()
+
+    async def receive() -> None:
+        try:
+            while True:
+                msg = await ws.receive_json()
+                if isinstance(msg, dict):
+                    latest["msg"] = msg  # overwrite: anything not yet answered is superseded
+                    wake.set()
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        except Exception:
+            pass
+        finally:
+            closed.set()
+            wake.set()
+
+    reader = asyncio.create_task(receive())
+    try:
+        while True:
+            await wake.wait()
+            wake.clear()
+            if closed.is_set():
+                return
+            msg = latest.pop("msg", None)
+            if msg is None:
+                continue
+            seq = msg.get("seq")
+            try:
+                if msg.get("ts_ns") is not None:
+                    ts_ns = int(msg["ts_ns"])
+                else:
+                    ts_ns = _parse_ts_et_to_ns(str(msg.get("ts") or ""), tz_name)
+                frame = cursor.frame(ts_ns)
+            except Exception as e:
+                frame = {"type": "error", "detail": str(e)}
+            frame["seq"] = seq
+            await ws.send_text(json.dumps(frame, separators=(",", ":")))
+            # Let the reader drain whatever arrived while this frame was built/sent.
+            await asyncio.sleep(0)
+    except WebSocketDisconnect:
+        return
+    finally:
+        reader.cancel()
+
+
 @APP.get("/api/snapshot")
 def snapshot(
     symbol: str = Query(...),
@@ -5731,19 +7350,10 @@ def snapshot(
 
     ts_book, book = _book_at_or_before(loaded, ts_eff)
     trades = _trades_before(loaded, ts_eff, limit=60)
-
-    # Chart context: show at least 20 bars prior (when available), regardless of TF.
-    tf_ns = {
-        "1s": int(1e9),
-        "10s": int(10e9),
-        "1m": int(60e9),
-        "5m": int(300e9),
-    }.get(loaded.tf, int(1e9))
-    window_start = max(
-        loaded.ohl_ts[0] if loaded.ohl_ts else ts_eff,
-        ts_eff - int(20 * tf_ns),
-    )
-    candles = _candles_window(loaded, window_start, ts_eff)
+    candles = _candles_window(loaded, _snapshot_window_start(loaded, ts_eff), ts_eff)
+    ctx = _day_context(loaded)
+    # Today's premarket range is only complete (and not a look-ahead) once the regular session has opened.
+    premarket = ctx["premarket"] if ctx["rth_open_ns"] is not None and ts_eff >= ctx["rth_open_ns"] else None
 
     # effective = requested timestamp; book might be slightly before if no update at exact second
     return JSONResponse(
@@ -5753,6 +7363,9 @@ def snapshot(
             "book": book,
             "trades": trades,
             "candles": candles,
+            "session": loaded.sess.at(loaded.tix["trd_ts"].right(ts_eff)),
+            "prior": ctx["prior"],
+            "premarket": premarket,
             "book_ts": int(ts_book),
             "tf": loaded.tf,
             "warning": warn,
@@ -5764,14 +7377,14 @@ def snapshot(
 def candles_window(
     symbol: str = Query(...),
     day: str = Query(...),
-    end_ts_ns: int = Query(..., description="UTC epoch ns. Window ends at the latest OHLCV bucket at or before this time."),
+    end_ts_ns: int = Query(..., description="UTC epoch ns. Window ends at this time; the live bar is cut there."),
     tf: str = Query("1s"),
     bars: int = Query(500, ge=1, le=5000, description="Number of bars to include (lookback)."),
     data_dir: str = Query(str(DATA_DIR_DEFAULT)),
     tz_name: str = Query(LOCAL_TZ_NAME_DEFAULT),
 ):
     """
-    Return a candles-only window ending at end_ts_ns (snapped to the latest OHLCV bucket at or before).
+    Return a candles-only window ending at end_ts_ns (the bar containing it is cut at end_ts_ns).
     Useful for zooming/panning back without loading book/trades.
     """
     try:
@@ -5785,14 +7398,12 @@ def candles_window(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    tf_ns = {
-        "1s": int(1e9),
-        "10s": int(10e9),
-        "1m": int(60e9),
-        "5m": int(300e9),
-    }.get(loaded.tf, int(1e9))
-
-    start_ns = max(loaded.ohl_ts[0] if loaded.ohl_ts else end_eff, int(end_eff) - int(bars) * tf_ns)
+    if loaded.bars is not None:
+        # Trade bars have no fixed duration: count bars back by index. Either way the live bar is cut at end_eff.
+        start_ns = _bars_back_start(loaded, end_eff, bars)
+    else:
+        tf_ns = _tf_seconds(loaded.tf) * 1_000_000_000
+        start_ns = max(loaded.ohl_ts[0] if loaded.ohl_ts else end_eff, int(end_eff) - int(bars) * tf_ns)
     candles = _candles_window(loaded, start_ns, int(end_eff))
     return JSONResponse(
         {
@@ -5804,6 +7415,59 @@ def candles_window(
     )
 
 
+def _emit_sse(obj: Dict[str, Any]) -> bytes:
+    return f"data: {json.dumps(obj, separators=(',',':'))}\n\n".encode("utf-8")
+
+
+def _book_msg(day: LoadedDay, i: int) -> Dict[str, Any]:
+    bids = [[_price_to_float(day.bid_px[i][j]), int(day.bid_sz[i][j])] for j in range(10)]
+    asks = [[_price_to_float(day.ask_px[i][j]), int(day.ask_sz[i][j])] for j in range(10)]
+    return {"type": "book", "ts_event": int(day.mbp_ts[i]), "bids": bids, "asks": asks}
+
+
+def _trade_msg(day: LoadedDay, i: int) -> Dict[str, Any]:
+    return {
+        "type": "trade",
+        "ts_event": int(day.trd_ts[i]),
+        "price": _price_to_float(day.trd_px[i]),
+        "size": int(day.trd_sz[i]),
+    }
+
+
+def _candle_msg(day: LoadedDay, i: int) -> Dict[str, Any]:
+    msg = {
+        "type": "candle",
+        "t": int(day.ohl_ts[i]),
+        "o": _price_to_float(day.ohl_o[i]),
+        "h": _price_to_float(day.ohl_h[i]),
+        "l": _price_to_float(day.ohl_l[i]),
+        "c": _price_to_float(day.ohl_c[i]),
+        "v": int(day.ohl_v[i]),
+    }
+    if day.bars is not None:
+        # Trade bars go out at their first print; t is the chart slot, te / n say when the bar completes.
+        b = day.bars
+        msg.update({"t": b.slot[i], "t0": b.t0[i], "te": b.te[i], "n": int(b.i1[i] - b.i0[i])})
+    return msg
+
+
+async def _paced_sleep(dt_ns: int, speed: float, request: Request) -> bool:
+    """
+    Sleep `dt_ns` of replay time scaled by speed. Returns False if the client disconnected.
+    """
+    sleep_s = (max(0, int(dt_ns)) / 1e9) / max(0.0001, float(speed))
+    # IMPORTANT: keep stream "real-time" relative to speed.
+    # We chunk long sleeps to stay responsive, but we must pay back the full sleep.
+    remaining = float(sleep_s)
+    while remaining > 0:
+        if await request.is_disconnected():
+            return False
+        chunk = 0.25 if remaining > 0.25 else remaining
+        await asyncio.sleep(chunk)
+        remaining -= chunk
+    return True
+
+
 async def _aiter_stream(
     day: LoadedDay,
     start_ts_ns: int,
@@ -5822,39 +7486,12 @@ async def _aiter_stream(
     if what not in ("all", "booktrades", "candles"):
         what = "all"
     # Start indices
-    i_b = _bisect_left(day.mbp_ts, start_ts_ns) if what in ("all", "booktrades") else len(day.mbp_ts)
-    i_t = _bisect_left(day.trd_ts, start_ts_ns) if (day.trd_ts and what in ("all", "booktrades")) else len(day.trd_ts)
-    i_c = _bisect_left(day.ohl_ts, start_ts_ns) if (day.ohl_ts and what in ("all", "candles")) else len(day.ohl_ts)
+    i_b = day.tix["mbp_ts"].left(start_ts_ns) if what in ("all", "booktrades") else len(day.mbp_ts)
+    i_t = day.tix["trd_ts"].left(start_ts_ns) if (day.trd_ts and what in ("all", "booktrades")) else len(day.trd_ts)
+    i_c = day.tix["ohl_ts"].left(start_ts_ns) if (day.ohl_ts and what in ("all", "candles")) else len(day.ohl_ts)
 
     prev_ts = start_ts_ns
 
-    def emit(obj: Dict[str, Any]) -> bytes:
-        return f"data: {json.dumps(obj, separators=(',',':'))}\n\n".encode("utf-8")
-
-    def _book_msg(i: int) -> Dict[str, Any]:
-        bids = [[_price_to_float(day.bid_px[i][j]), int(day.bid_sz[i][j])] for j in range(10)]
-        asks = [[_price_to_float(day.ask_px[i][j]), int(day.ask_sz[i][j])] for j in range(10)]
-        return {"type": "book", "ts_event": int(day.mbp_ts[i]), "bids": bids, "asks": asks}
-
-    def _trade_msg(i: int) -> Dict[str, Any]:
-        return {
-            "type": "trade",
-            "ts_event": int(day.trd_ts[i]),
-            "price": _price_to_float(day.trd_px[i]),
-            "size": int(day.trd_sz[i]),
-        }
-
-    def _candle_msg(i: int) -> Dict[str, Any]:
-        return {
-            "type": "candle",
-            "t": int(day.ohl_ts[i]),
-            "o": _price_to_float(day.ohl_o[i]),
-            "h": _price_to_float(day.ohl_h[i]),
-            "l": _price_to_float(day.ohl_l[i]),
-            "c": _price_to_float(day.ohl_c[i]),
-            "v": int(day.ohl_v[i]),
-        }
-
     while True:
         if await request.is_disconnected():
             return
@@ -5875,22 +7512,14 @@ async def _aiter_stream(
                 src = "c"
 
         if next_ts is None or src is None:
-            yield emit({"type": "eos"})
+            yield _emit_sse({"type": "eos"})
             return
 
         # Sleep scaled by speed, clamped to keep UI responsive
         dt_ns = max(0, int(next_ts) - int(prev_ts))
         prev_ts = int(next_ts)
-        sleep_s = (dt_ns / 1e9) / max(0.0001, float(speed))
-        # IMPORTANT: keep stream "real-time" relative to speed.
-        # We chunk long sleeps to stay responsive, but we must pay back the full sleep.
-        remaining = float(sleep_s)
-        while remaining > 0:
-            if await request.is_disconnected():
-                return
-            chunk = 0.25 if remaining > 0.25 else remaining
-            await asyncio.sleep(chunk)
-            remaining -= chunk
+        if not await _paced_sleep(dt_ns, speed, request):
+            return
 
         # Performance: batch all events that share the same timestamp into a single SSE message.
         # Bursty moments often have many events with dt=0; emitting them one-by-one overwhelms the browser
@@ -5900,23 +7529,93 @@ async def _aiter_stream(
         # Preserve the same deterministic tie ordering as the single-event stream: book, then trade, then candle.
         if what in ("all", "booktrades"):
             while i_b < len(day.mbp_ts) and int(day.mbp_ts[i_b]) == ts0:
-                items.append(_book_msg(i_b))
+                items.append(_book_msg(day, i_b))
                 i_b += 1
             while i_t < len(day.trd_ts) and int(day.trd_ts[i_t]) == ts0:
-                items.append(_trade_msg(i_t))
+                items.append(_trade_msg(day, i_t))
                 i_t += 1
         if what in ("all", "candles"):
             while i_c < len(day.ohl_ts) and int(day.ohl_ts[i_c]) == ts0:
-                items.append(_candle_msg(i_c))
+                items.append(_candle_msg(day, i_c))
                 i_c += 1
 
         if not items:
             # Shouldn't happen, but keep the stream moving.
             continue
         if len(items) == 1:
-            yield emit(items[0])
+            yield _emit_sse(items[0])
+        else:
+            yield _emit_sse({"type": "batch", "ts_event": ts0, "items": items})
+
+
+# Same-timestamp tie order across sources (matches the single-symbol stream): book, trade, candle.
+_STREAM_SOURCES: Tuple[Tuple[str, str, Any], ...] = (
+    ("b", "mbp_ts", _book_msg),
+    ("t", "trd_ts", _trade_msg),
+    ("c", "ohl_ts", _candle_msg),
+)
+
+
+async def _aiter_stream_multi(
+    days: List[LoadedDay],
+    start_ts_ns: int,
+    speed: float,
+    request: Request,
+    what: str,
+) -> Iterable[bytes]:
+    """
+    Server-sent event stream for several symbols on one clock (k-way merge over every symbol's
+    book/trade/candle cursors with a heap). Every message carries `symbol`; events sharing a
+    timestamp are batched across symbols, ordered by (source, symbol order in the request).
+    """
+    what = (what or "all").strip().lower()
+    if what not in ("all", "booktrades", "candles"):
+        what = "all"
+    srcs = {"all": "btc", "booktrades": "bt", "candles": "c"}[what]
+
+    heap: List[Tuple[int, int, int, int]] = []  # (ts, source rank, symbol idx, row idx)
+    for k, day in enumerate(days):
+        for rank, (src, attr, _) in enumerate(_STREAM_SOURCES):
+            if src not in srcs:
+                continue
+            arr = getattr(day, attr)
+            i = day.tix[attr].left(start_ts_ns)
+            if i < len(arr):
+                heap.append((int(arr[i]), rank, k, i))
+    heapq.heapify(heap)
+
+    prev_ts = start_ts_ns
+    while True:
+        if await request.is_disconnected():
+            return
+        if not heap:
+            yield _emit_sse({"type": "eos"})
+            return
+
+        ts0 = heap[0][0]
+        if not await _paced_sleep(ts0 - int(prev_ts), speed, request):
+            return
+        prev_ts = ts0
+
+        items: List[Dict[str, Any]] = []
+        while heap and heap[0][0] == ts0:
+            _, rank, k, i = heapq.heappop(heap)
+            day = days[k]
+            _, attr, build = _STREAM_SOURCES[rank]
+            arr = getattr(day, attr)
+            # Drain this cursor's run at ts0 before re-entering the heap (keeps per-symbol order intact).
+            while i < len(arr) and int(arr[i]) == ts0:
+                msg = build(day, i)
+                msg["symbol"] = day.symbol
+                items.append(msg)
+                i += 1
+            if i < len(arr):
+                heapq.heappush(heap, (int(arr[i]), rank, k, i))
+
+        if len(items) == 1:
+            yield _emit_sse(items[0])
         else:
-            yield emit({"type": "batch", "ts_event": ts0, "items": items})
+            yield _emit_sse({"type": "batch", "ts_event": ts0, "items": items})
 
 
 @APP.get("/api/stream")
@@ -5965,6 +7664,60 @@ async def stream(
     )
 
 
+@APP.get("/api/stream_multi")
+async def stream_multi(
+    request: Request,
+    symbols: str = Query(..., description="Comma-separated symbols; the first one anchors the start time."),
+    day: str = Query(...),
+    ts: Optional[str] = Query(None, description="Datetime string interpreted in tz_name unless explicit offset/Z is provided."),
+    ts_ns: Optional[int] = Query(None, description="UTC epoch ns. If provided, overrides ts."),
+    speed: float = Query(1.0),
+    tf: str = Query("1s"),
+    what: str = Query("all", description="all | booktrades | candles"),
+    data_dir: str = Query(str(DATA_DIR_DEFAULT)),
+    tz_name: str = Query(LOCAL_TZ_NAME_DEFAULT),
+):
+    """
+    Synchronized replay of several symbols of one day: a single merged SSE feed (same message shapes as
+    /api/stream, plus `symbol` on every event) so K tickers cannot drift apart the way K streams would.
+    """
+    try:
+        syms: List[str] = []
+        for s in symbols.split(","):
+            s = s.strip()
+            if s and s not in syms:
+                syms.append(s)
+        if not syms:
+            raise ValueError("symbols must list at least one symbol")
+        if len(syms) > MULTI_STREAM_MAX_SYMBOLS:
+            raise ValueError(f"at most {MULTI_STREAM_MAX_SYMBOLS} symbols per stream")
+        loaded = [_load_day(s, day, Path(data_dir), tz_name, tf=tf) for s in syms]
+        if ts_ns is None:
+            if ts is None:
+                raise ValueError("Provide either ts or ts_ns")
+            ts_ns = _parse_ts_et_to_ns(ts, tz_name)
+        else:
+            ts_ns = int(ts_ns)
+        ts_eff, _ = _resolve_effective_ts(loaded[0], ts_ns)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    async def gen() -> Iterable[bytes]:
+        yield b"retry: 1000\n\n"
+        async for chunk in _aiter_stream_multi(loaded, ts_eff, speed, request, what=what):
+            yield chunk
+
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
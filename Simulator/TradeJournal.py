@@ -0,0 +1,426 @@
+"""
+Simulator/TradeJournal.py
+
+Queryable trade journal (SQLite, WAL) fed from the trading session log.
+
+Every batch posted to /api/trading/log is also ingested here in one transaction:
+- orders: one row per order event (new/arrive/rest/trigger/cancel/reject/fill) with the order snapshot
+- fills: one row per execution (symbol/day/side/qty/price + client-side MAE/MFE on closing fills)
+- rewinds: replay rewinds; rows are never updated or deleted, a fill is "voided" when a later rewind
+  went back before its timestamp (same rule the browser applies to its in-memory log)
+
+Round trips (flat -> position -> flat) are derived at query time from the indexed fills of a session,
+which is cheap even for thousands of trades and never requires re-running a replay.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+JOURNAL_FILENAME = "journal.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    ts_ns INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    order_id TEXT,
+    symbol TEXT,
+    day TEXT,
+    side TEXT,
+    type TEXT,
+    status TEXT,
+    qty INTEGER,
+    filled_qty INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_session_ts ON orders(session, ts_ns);
+CREATE INDEX IF NOT EXISTS orders_session_order ON orders(session, order_id);
+
+CREATE TABLE IF NOT EXISTS fills (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    ts_ns INTEGER NOT NULL,
+    fill_id TEXT,
+    order_id TEXT,
+    symbol TEXT NOT NULL,
+    day TEXT,
+    side TEXT NOT NULL,
+    qty INTEGER NOT NULL,
+    price REAL NOT NULL,
+    order_type TEXT,
+    mae REAL,
+    mfe REAL,
+    rseq INTEGER NOT NULL DEFAULT 0  -- last rewinds.seq at insert time
+);
+CREATE INDEX IF NOT EXISTS fills_session_symbol_ts ON fills(session, symbol, ts_ns);
+CREATE INDEX IF NOT EXISTS fills_day ON fills(day);
+
+CREATE TABLE IF NOT EXISTS rewinds (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    ts_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rewinds_session_seq ON rewinds(session, seq);
+"""
+
+# A fill survives unless a rewind logged after it went back before its timestamp.
+_LIVE_FILL = """
+NOT EXISTS (
+    SELECT 1 FROM rewinds r
+    WHERE r.session = f.session AND r.seq > f.rseq AND r.ts_ns < f.ts_ns
+)
+"""
+
+_LOCAL = threading.local()
+_WRITE_LOCK = threading.Lock()
+
+
+def journal_path(sessions_dir: Path) -> Path:
+    return Path(sessions_dir) / JOURNAL_FILENAME
+
+
+def _connect(sessions_dir: Path) -> sqlite3.Connection:
+    """
+    One connection per thread (FastAPI runs sync endpoints in a threadpool); WAL lets readers
+    run while a batch is being written.
+    """
+    p = journal_path(sessions_dir)
+    conns: Dict[str, sqlite3.Connection] = getattr(_LOCAL, "conns", None) or {}
+    _LOCAL.conns = conns
+    conn = conns.get(str(p))
+    if conn is not None and p.exists():
+        return conn
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    conns[str(p)] = conn
+    return conn
+
+
+def _int_or_none(x: Any) -> Optional[int]:
+    try:
+        return int(x)
+    except Exception:
+        return None
+
+
+def _float_or_none(x: Any) -> Optional[float]:
+    try:
+        v = float(x)
+    except Exception:
+        return None
+    return v if v == v else None
+
+
+def _ingest_batch(conn: sqlite3.Connection, session_id: str, records: Sequence[Dict[str, Any]], day: str) -> int:
+    """
+    Insert one batch of trading-log records on `conn`; the caller owns the transaction and _WRITE_LOCK.
+    """
+    order_rows: List[tuple] = []
+    written = 0
+    rseq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM rewinds").fetchone()[0]
+
+    def flush_orders() -> None:
+        if order_rows:
+            conn.executemany(
+                "INSERT INTO orders(session, ts_ns, kind, order_id, symbol, day, side, type, status, qty, filled_qty, data)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                order_rows,
+            )
+            order_rows.clear()
+
+    for rec in records:
+        if not isinstance(rec, dict):
+            continue
+        typ = rec.get("type")
+        ts = _int_or_none(rec.get("ts_ns"))
+        if ts is None:
+            continue
+        if typ == "rewind":
+            # Keep order relative to fills: a rewind only voids fills logged before it.
+            flush_orders()
+            rseq = conn.execute("INSERT INTO rewinds(session, ts_ns) VALUES (?,?)", (session_id, ts)).lastrowid
+            written += 1
+            continue
+        if typ != "event":
+            continue
+        o = rec.get("order") if isinstance(rec.get("order"), dict) else {}
+        order_rows.append(
+            (
+                session_id,
+                ts,
+                str(rec.get("kind") or ""),
+                o.get("id"),
+                str(o.get("symbol") or "").upper() or None,
+                day or None,
+                o.get("side"),
+                o.get("type"),
+                o.get("status"),
+                _int_or_none(o.get("qty")),
+                _int_or_none(o.get("filledQty")),
+                json.dumps(o, separators=(",", ":"), sort_keys=True),
+            )
+        )
+        written += 1
+        f = rec.get("fill")
+        if isinstance(f, dict):
+            qty = _int_or_none(f.get("qty"))
+            px = _float_or_none(f.get("price"))
+            if not qty or qty <= 0 or px is None or px <= 0:
+                continue
+            conn.execute(
+                "INSERT INTO fills(session, ts_ns, fill_id, order_id, symbol, day, side, qty, price, order_type, mae, mfe, rseq)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    session_id,
+                    ts,  # event ts (clamped non-decreasing), which is what rewinds compare against
+                    f.get("id"),
+                    f.get("orderId"),
+                    str(f.get("symbol") or "").upper(),
+                    day or None,
+                    str(f.get("side") or "BUY").upper(),
+                    qty,
+                    px,
+                    f.get("type"),
+                    _float_or_none(f.get("mae")),
+                    _float_or_none(f.get("mfe")),
+                    rseq,
+                ),
+            )
+            written += 1
+    flush_orders()
+    return written
+
+
+def ingest(sessions_dir: Path, session_id: str, records: Sequence[Dict[str, Any]], day: str = "") -> int:
+    """
+    Ingest a batch of trading-log records (same shapes as TradingLog) in a single transaction.
+    `day` is the replay day of the batch (from the client ctx). Returns rows written.
+    """
+    with _WRITE_LOCK:
+        conn = _connect(sessions_dir)
+        with conn:
+            return _ingest_batch(conn, session_id, records, day)
+
+
+def rebuild_from_logs(sessions_dir: Path) -> int:
+    """
+    (Re)build the journal from every Sessions/*.jsonl log (e.g. logs recorded before the journal existed).
+    Existing journal rows are dropped first, in the same transaction, so a failed rebuild leaves the old journal
+    in place and readers never see it half empty. Returns rows written.
+    """
+    from TradingLog import load_records  # Simulator/TradingLog.py (local module)
+
+    sessions_dir = Path(sessions_dir)
+    n = 0
+    with _WRITE_LOCK:
+        conn = _connect(sessions_dir)
+        with conn:
+            for t in ("orders", "fills", "rewinds"):
+                conn.execute(f"DELETE FROM {t}")
+            for p in sorted(sessions_dir.glob("*.jsonl")):
+                day = ""
+                batch: List[Dict[str, Any]] = []
+                for rec in load_records(sessions_dir, p.stem):
+                    if rec.get("type") == "ctx":
+                        # ctx trails the batch it describes
+                        n += _ingest_batch(conn, p.stem, batch, str(rec.get("day") or ""))
+                        batch = []
+                        day = str(rec.get("day") or "")
+                    else:
+                        batch.append(rec)
+                n += _ingest_batch(conn, p.stem, batch, day)
+    return n
+
+
+def _live_fills(conn: sqlite3.Connection, where: str, args: Iterable[Any]) -> List[sqlite3.Row]:
+    return conn.execute(
+        f"SELECT * FROM fills f WHERE {where} AND {_LIVE_FILL} ORDER BY f.session, f.symbol, f.day, f.ts_ns, f.seq",
+        tuple(args),
+    ).fetchall()
+
+
+def _filters(session: Optional[str], symbol: Optional[str], day: Optional[str]) -> tuple:
+    where = ["1=1"]
+    args: List[Any] = []
+    if session:
+        where.append("f.session = ?")
+        args.append(session)
+    if symbol:
+        where.append("f.symbol = ?")
+        args.append(symbol.strip().upper())
+    if day:
+        where.append("f.day = ?")
+        args.append(day.strip())
+    return " AND ".join(where), args
+
+
+def round_trips(
+    sessions_dir: Path,
+    session: Optional[str] = None,
+    symbol: Optional[str] = None,
+    day: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Group live fills into round trips per (session, symbol, replay day): a trip opens when the position leaves
+    flat and closes when it returns to flat (a flip closes one trip and opens the next). A position left open
+    on one replay day is never closed by fills of another.
+    Open trips are returned with exit fields = None.
+    """
+    where, args = _filters(session, symbol, day)
+    rows = _live_fills(_connect(sessions_dir), where, args)
+
+    out: List[Dict[str, Any]] = []
+    key = None
+    sh = 0
+    cost = 0.0
+    trip: Optional[Dict[str, Any]] = None
+
+    def new_trip(r: sqlite3.Row, ts: int, shares: int, px: float) -> Dict[str, Any]:
+        return {
+            "session": r["session"],
+            "symbol": r["symbol"],
+            "day": r["day"],
+            "side": "LONG" if shares > 0 else "SHORT",
+            "entry_ts_ns": ts,
+            "exit_ts_ns": None,
+            "hold_s": None,
+            "max_shares": abs(shares),
+            "fills": 0,
+            "pnl": 0.0,
+            "mae": None,
+            "mfe": None,
+            "_entry_notional": 0.0,
+            "_entry_qty": 0,
+            "_exit_notional": 0.0,
+            "_exit_qty": 0,
+        }
+
+    for r in rows:
+        k = (r["session"], r["symbol"], r["day"])
+        if k != key:
+            if trip is not None:
+                out.append(trip)
+            key, sh, cost, trip = k, 0, 0.0, None
+        qty = int(r["qty"])
+        px = float(r["price"])
+        d = qty if r["side"] == "BUY" else -qty
+        ts = int(r["ts_ns"])
+        if sh == 0:
+            trip = new_trip(r, ts, d, px)
+        trip["fills"] += 1
+        if sh == 0 or (sh > 0) == (d > 0):
+            a0, a1 = abs(sh), abs(d)
+            cost = (a0 * cost + a1 * px) / (a0 + a1)
+            sh += d
+            trip["_entry_notional"] += a1 * px
+            trip["_entry_qty"] += a1
+            trip["max_shares"] = max(trip["max_shares"], abs(sh))
+            continue
+        close_qty = min(abs(d), abs(sh))
+        trip["pnl"] += close_qty * (px - cost) * (1 if sh > 0 else -1)
+        nxt = sh + d
+        if nxt != 0 and (nxt > 0) == (sh > 0):
+            trip["_exit_notional"] += close_qty * px
+            trip["_exit_qty"] += close_qty
+            sh = nxt
+            continue
+        trip["exit_ts_ns"] = ts
+        trip["hold_s"] = (ts - trip["entry_ts_ns"]) / 1e9
+        trip["_exit_notional"] += close_qty * px
+        trip["_exit_qty"] += close_qty
+        trip["mae"] = _float_or_none(r["mae"])
+        trip["mfe"] = _float_or_none(r["mfe"])
+        out.append(trip)
+        trip = None
+        sh = nxt
+        if sh != 0:
+            # flipped: leftover opens the next trip at the fill price
+            cost = px
+            trip = new_trip(r, ts, sh, px)
+            trip["fills"] = 1
+            trip["_entry_notional"] = abs(sh) * px
+            trip["_entry_qty"] = abs(sh)
+    if trip is not None:
+        out.append(trip)
+
+    for t in out:
+        eq, xq = t.pop("_entry_qty"), t.pop("_exit_qty")
+        en, xn = t.pop("_entry_notional"), t.pop("_exit_notional")
+        t["entry_px"] = (en / eq) if eq else None
+        t["exit_px"] = (xn / xq) if xq else None
+        t["pnl"] = round(t["pnl"], 6)
+    return out
+
+
+def summary(
+    sessions_dir: Path,
+    session: Optional[str] = None,
+    symbol: Optional[str] = None,
+    day: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Per-session P&L / win rate / hold-time / excursion aggregates over closed round trips.
+    """
+    by_session: Dict[str, List[Dict[str, Any]]] = {}
+    for t in round_trips(sessions_dir, session=session, symbol=symbol, day=day):
+        by_session.setdefault(t["session"], []).append(t)
+
+    def avg(xs: List[float]) -> Optional[float]:
+        return (sum(xs) / len(xs)) if xs else None
+
+    out: List[Dict[str, Any]] = []
+    for sid, trips in by_session.items():
+        closed = [t for t in trips if t["exit_ts_ns"] is not None]
+        wins = [t["pnl"] for t in closed if t["pnl"] > 0]
+        losses = [t["pnl"] for t in closed if t["pnl"] < 0]
+        out.append(
+            {
+                "session": sid,
+                "symbols": sorted({t["symbol"] for t in trips}),
+                "days": sorted({t["day"] for t in trips if t["day"]}),
+                "trades": len(closed),
+                "open_trades": len(trips) - len(closed),
+                "realized_pnl": round(sum(t["pnl"] for t in trips), 6),
+                "win_rate": (len(wins) / len(closed)) if closed else None,
+                "avg_win": avg(wins),
+                "avg_loss": avg(losses),
+                "profit_factor": (sum(wins) / -sum(losses)) if losses else None,
+                "avg_hold_s": avg([t["hold_s"] for t in closed]),
+                "max_hold_s": max([t["hold_s"] for t in closed], default=None),
+                "avg_mae": avg([t["mae"] for t in closed if t["mae"] is not None]),
+                "avg_mfe": avg([t["mfe"] for t in closed if t["mfe"] is not None]),
+                "first_ts_ns": min(t["entry_ts_ns"] for t in trips),
+                "last_ts_ns": max((t["exit_ts_ns"] or t["entry_ts_ns"]) for t in trips),
+            }
+        )
+    out.sort(key=lambda x: x["last_ts_ns"], reverse=True)
+    return out
+
+
+def order_events(sessions_dir: Path, session: str, order_id: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+    """
+    Raw order events of a session (newest first), optionally for one order id.
+    """
+    conn = _connect(sessions_dir)
+    where = "session = ?"
+    args: List[Any] = [session]
+    if order_id:
+        where += " AND order_id = ?"
+        args.append(order_id)
+    rows = conn.execute(
+        f"SELECT seq, ts_ns, kind, order_id, symbol, day, side, type, status, qty, filled_qty FROM orders"
+        f" WHERE {where} ORDER BY seq DESC LIMIT ?",
+        (*args, int(limit)),
+    ).fetchall()
+    return [dict(r) for r in rows]
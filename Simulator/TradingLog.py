@@ -0,0 +1,91 @@
+"""
+Simulator/TradingLog.py
+
+Append-only trading event log (orders / fills / cancels / rewinds), persisted per session.
+
+The browser is the trading engine: every state change becomes an event carrying the order snapshot
+(and the fill, if any). Events are batched and posted here so a practice session survives page reloads.
+
+Storage is one JSONL file per session under Sessions/ (one record per line). Records are never
+rewritten: a rewind is itself a record, and replaying the file top to bottom rebuilds the exact state.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_\-]{0,63}")
+_RECORD_TYPES = ("event", "rewind", "ctx")
+
+# One lock per process is enough: appends are tiny and batched by the client.
+_LOCK = threading.Lock()
+
+
+def sanitize_session_id(session_id: str) -> str:
+    """
+    Session ids become filenames; keep them simple (letters/numbers/_/-, <= 64 chars).
+    """
+    sid = str(session_id or "").strip()
+    if not _SESSION_ID_RE.fullmatch(sid):
+        raise ValueError("session must be 1-64 chars of letters/numbers/_/- (starting with a letter or number)")
+    return sid
+
+
+def session_path(sessions_dir: Path, session_id: str) -> Path:
+    return Path(sessions_dir) / f"{sanitize_session_id(session_id)}.jsonl"
+
+
+def append_records(sessions_dir: Path, session_id: str, records: Sequence[Dict[str, Any]]) -> int:
+    """
+    Append a batch of records to the session log. Returns the number of records written.
+
+    The whole batch is written with a single write + fsync, so a crash leaves at most one partial
+    trailing line (which `load_records` skips).
+    """
+    p = session_path(sessions_dir, session_id)
+    lines: List[str] = []
+    for rec in records:
+        if not isinstance(rec, dict):
+            raise ValueError("records must be JSON objects")
+        if rec.get("type") not in _RECORD_TYPES:
+            raise ValueError(f"record type must be one of: {', '.join(_RECORD_TYPES)}")
+        lines.append(json.dumps(rec, separators=(",", ":"), sort_keys=True))
+    if not lines:
+        return 0
+    blob = ("\n".join(lines) + "\n").encode("utf-8")
+    with _LOCK:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with p.open("ab") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+    return len(lines)
+
+
+def load_records(sessions_dir: Path, session_id: str) -> List[Dict[str, Any]]:
+    """
+    Read every record of a session log in append order. Missing sessions return [].
+    """
+    p = session_path(sessions_dir, session_id)
+    if not p.exists():
+        return []
+    out: List[Dict[str, Any]] = []
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                # Torn trailing write (crash mid-append); everything before it is intact.
+                continue
+            if isinstance(rec, dict):
+                out.append(rec)
+    return out